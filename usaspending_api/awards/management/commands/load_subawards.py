@@ -1,10 +1,18 @@
 import logging
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from pathlib import Path
-from usaspending_api.common.etl import ETLDBLinkTable, ETLTable, ETLTemporaryTable, operations, mixins
+from usaspending_api.common.cache import bump_data_version
+from usaspending_api.common.etl import (
+    ETLCheckpoint,
+    ETLDBLinkTable,
+    ETLTable,
+    ETLTemporaryTable,
+    operations,
+    mixins,
+)
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.etl.operations.subaward.update_city_county import update_subaward_city_county
 
@@ -17,6 +25,8 @@ class Command(mixins.ETLMixin, BaseCommand):
     help = "Load subawards from Broker into USAspending."
 
     full_reload = False
+    chunk_size = None
+    checkpoint = None
 
     etl_logger_function = logger.info
     etl_dml_sql_directory = Path(__file__).resolve().parent / "load_subawards_sql"
@@ -28,16 +38,44 @@ class Command(mixins.ETLMixin, BaseCommand):
             default=self.full_reload,
             help="Empties the USAspending subaward and broker_subaward tables before loading.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help=(
+                "Sync broker_subaward and subaward this many ids at a time rather than with one statement per "
+                "operation.  The load still runs in a single transaction unless --checkpoint-file is provided."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            help=(
+                "Requires --chunk-size.  Commit each chunk as it finishes and record progress in this file so that "
+                "an interrupted load resumes where it left off.  The load no longer runs in a single transaction, "
+                "so subaward is partially updated until it completes."
+            ),
+        )
 
     def handle(self, *args, **options):
 
         self.full_reload = options["full_reload"]
+        self.chunk_size = options["chunk_size"]
+        if options["checkpoint_file"]:
+            if not self.chunk_size:
+                raise CommandError("--checkpoint-file requires --chunk-size")
+            self.checkpoint = ETLCheckpoint(options["checkpoint_file"])
         logger.info("FULL RELOAD SWITCH: {}".format(self.full_reload))
 
+        if self.checkpoint:
+            with Timer("Load subawards in committed chunks"):
+                self._perform_load()
+            bump_data_version("awards")
+            return
+
         with Timer("Load subawards"):
             try:
                 with transaction.atomic():
                     self._perform_load()
+                    transaction.on_commit(lambda: bump_data_version("awards"))
                     t = Timer("Commit subaward transaction")
                     t.log_starting_message()
                 t.log_success_message()
@@ -86,7 +124,9 @@ class Command(mixins.ETLMixin, BaseCommand):
             staging=temp_new_or_updated,
         )
 
-        self._delete_update_insert_rows("broker_subawards", temp_broker_subaward, broker_subaward)
+        self._delete_update_insert_rows(
+            "broker_subawards", temp_broker_subaward, broker_subaward, self.chunk_size, self.checkpoint
+        )
 
         # The Broker subaward table takes up a good bit of space so let's explicitly free
         # it up before continuing.
@@ -108,15 +148,30 @@ class Command(mixins.ETLMixin, BaseCommand):
 
         # Delete from broker_subaward because temp_subaward only has new/updated rows.
         self._execute_function_and_log(
-            operations.delete_obsolete_rows, "Delete obsolete subawards", broker_subaward, subaward
+            operations.delete_obsolete_rows,
+            "Delete obsolete subawards",
+            broker_subaward,
+            subaward,
+            self.chunk_size,
+            self.checkpoint,
         )
 
         # But update and insert from temp_subaward.
         self._execute_function_and_log(
-            operations.update_changed_rows, "Update changed subawards", temp_subaward, subaward
+            operations.update_changed_rows,
+            "Update changed subawards",
+            temp_subaward,
+            subaward,
+            self.chunk_size,
+            self.checkpoint,
         )
         self._execute_function_and_log(
-            operations.insert_missing_rows, "Insert missing subawards", temp_subaward, subaward
+            operations.insert_missing_rows,
+            "Insert missing subawards",
+            temp_subaward,
+            subaward,
+            self.chunk_size,
+            self.checkpoint,
         )
 
         self._execute_etl_dml_sql_directory_file("140_link_awards")
@@ -3,6 +3,7 @@ import pytest
 
 from datetime import date
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from model_mommy import mommy
 from pathlib import Path
 from psycopg2.extensions import AsIs
@@ -149,6 +150,19 @@ def test_full(cursor_fixture):
     assert Subaward.objects.count() == 4
 
 
+def test_chunk_size(cursor_fixture):
+    call_command("load_subawards", "--chunk-size", "2")
+    assert BrokerSubaward.objects.count() == 4
+    assert Subaward.objects.count() == 4
+
+    _check_data()
+
+
+def test_checkpoint_file_requires_chunk_size(cursor_fixture, tmp_path):
+    with pytest.raises(CommandError):
+        call_command("load_subawards", "--checkpoint-file", str(tmp_path / "checkpoint.json"))
+
+
 def test_some_data_correction_conditions(cursor_fixture):
     call_command("load_subawards")
     assert BrokerSubaward.objects.count() == 4
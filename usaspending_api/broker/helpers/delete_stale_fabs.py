@@ -3,7 +3,7 @@ import logging
 from django.db import connections, transaction, DEFAULT_DB_ALIAS
 
 from usaspending_api.awards.models import TransactionNormalized
-from usaspending_api.etl.award_helpers import update_awards
+from usaspending_api.etl.award_helpers import queue_award_search_refresh, update_awards
 from usaspending_api.broker.helpers.find_related_awards import find_related_awards
 
 
@@ -50,6 +50,7 @@ def delete_stale_fabs(ids_to_delete):
         # Delete Awards
         delete_awards_query = 'DELETE FROM "awards" a WHERE a."id" IN ({});'.format(delete_award_str_ids)
         queries.extend([faba.format(delete_award_str_ids), sub, delete_awards_query])
+        queue_award_search_refresh(tuple(delete_award_ids))
 
     if queries:
         db_query = "".join(queries)
@@ -1,5 +1,249 @@
+import numpy as np
+
+from distutils.util import strtobool
+from typing import Dict, List, Sequence
+
 from usaspending_api.broker.helpers.build_business_categories_boolean_dict import build_business_categories_boolean_dict
 
+# The FPDS business category rules, evaluated a row at a time by get_business_categories() and a chunk at a time by
+# get_business_categories_bulk(). Each rule is (category, boolean columns, (column, values) equality conditions,
+# previously derived categories), and a row gets the category if ANY of them hold. Rules are evaluated in order, so
+# a rule may only depend on categories derived by an earlier rule.
+FPDS_BUSINESS_CATEGORY_RULES = [
+    # BUSINESS (FOR-PROFIT)
+    (
+        "small_business",
+        [
+            "women_owned_small_business",
+            "economically_disadvantaged",
+            "joint_venture_women_owned",
+            "emerging_small_business",
+            "self_certified_small_disad",
+            "small_agricultural_coopera",
+            "small_disadvantaged_busine",
+        ],
+        [("contracting_officers_deter", ("S",))],
+        [],
+    ),
+    ("other_than_small_business", [], [("contracting_officers_deter", ("O",))], []),
+    ("corporate_entity_tax_exempt", ["corporate_entity_tax_exemp"], [], []),
+    ("corporate_entity_not_tax_exempt", ["corporate_entity_not_tax_e"], [], []),
+    ("partnership_or_limited_liability_partnership", ["partnership_or_limited_lia"], [], []),
+    ("sole_proprietorship", ["sole_proprietorship"], [], []),
+    ("manufacturer_of_goods", ["manufacturer_of_goods"], [], []),
+    ("subchapter_s_corporation", ["subchapter_s_corporation"], [], []),
+    ("limited_liability_corporation", ["limited_liability_corporat"], [], []),
+    (
+        "category_business",
+        ["for_profit_organization"],
+        [],
+        [
+            "small_business",
+            "other_than_small_business",
+            "corporate_entity_tax_exempt",
+            "corporate_entity_not_tax_exempt",
+            "partnership_or_limited_liability_partnership",
+            "sole_proprietorship",
+            "manufacturer_of_goods",
+            "subchapter_s_corporation",
+            "limited_liability_corporation",
+        ],
+    ),
+    # MINORITY BUSINESS
+    ("alaskan_native_corporation_owned_firm", ["alaskan_native_owned_corpo"], [], []),
+    ("american_indian_owned_business", ["american_indian_owned_busi"], [], []),
+    ("asian_pacific_american_owned_business", ["asian_pacific_american_own"], [], []),
+    ("black_american_owned_business", ["black_american_owned_busin"], [], []),
+    ("hispanic_american_owned_business", ["hispanic_american_owned_bu"], [], []),
+    ("native_american_owned_business", ["native_american_owned_busi"], [], []),
+    ("native_hawaiian_organization_owned_firm", ["native_hawaiian_owned_busi"], [], []),
+    ("subcontinent_asian_indian_american_owned_business", ["subcontinent_asian_asian_i"], [], []),
+    ("tribally_owned_firm", ["tribally_owned_business"], [], []),
+    ("other_minority_owned_business", ["other_minority_owned_busin"], [], []),
+    (
+        "minority_owned_business",
+        ["minority_owned_business"],
+        [],
+        [
+            "alaskan_native_corporation_owned_firm",
+            "american_indian_owned_business",
+            "asian_pacific_american_owned_business",
+            "black_american_owned_business",
+            "hispanic_american_owned_business",
+            "native_american_owned_business",
+            "native_hawaiian_organization_owned_firm",
+            "subcontinent_asian_indian_american_owned_business",
+            "tribally_owned_firm",
+            "other_minority_owned_business",
+        ],
+    ),
+    # WOMEN OWNED BUSINESS
+    ("women_owned_small_business", ["women_owned_small_business"], [], []),
+    ("economically_disadvantaged_women_owned_small_business", ["economically_disadvantaged"], [], []),
+    ("joint_venture_women_owned_small_business", ["joint_venture_women_owned"], [], []),
+    ("joint_venture_economically_disadvantaged_women_owned_small_business", ["joint_venture_economically"], [], []),
+    (
+        "woman_owned_business",
+        ["woman_owned_business"],
+        [],
+        [
+            "women_owned_small_business",
+            "economically_disadvantaged_women_owned_small_business",
+            "joint_venture_women_owned_small_business",
+            "joint_venture_economically_disadvantaged_women_owned_small_business",
+        ],
+    ),
+    # VETERAN OWNED BUSINESS
+    ("service_disabled_veteran_owned_business", ["service_disabled_veteran_o"], [], []),
+    ("veteran_owned_business", ["veteran_owned_business"], [], ["service_disabled_veteran_owned_business"]),
+    # SPECIAL DESIGNATIONS
+    ("8a_program_participant", ["c8a_program_participant"], [], []),
+    ("ability_one_program", ["the_ability_one_program"], [], []),
+    ("dot_certified_disadvantaged_business_enterprise", ["dot_certified_disadvantage"], [], []),
+    ("emerging_small_business", ["emerging_small_business"], [], []),
+    ("federally_funded_research_and_development_corp", ["federally_funded_research"], [], []),
+    ("historically_underutilized_business_firm", ["historically_underutilized"], [], []),
+    ("labor_surplus_area_firm", ["labor_surplus_area_firm"], [], []),
+    ("sba_certified_8a_joint_venture", ["sba_certified_8_a_joint_ve"], [], []),
+    ("self_certified_small_disadvanted_business", ["self_certified_small_disad"], [], []),
+    ("small_agricultural_cooperative", ["small_agricultural_coopera"], [], []),
+    ("small_disadvantaged_business", ["small_disadvantaged_busine"], [], []),
+    ("community_developed_corporation_owned_firm", ["community_developed_corpor"], [], []),
+    ("us_owned_business", [], [("domestic_or_foreign_entity", ("A",))], []),
+    ("foreign_owned_and_us_located_business", [], [("domestic_or_foreign_entity", ("C",))], []),
+    ("foreign_owned", ["foreign_owned_and_located"], [("domestic_or_foreign_entity", ("D",))], []),
+    ("foreign_government", ["foreign_government"], [], []),
+    ("international_organization", ["international_organization"], [], []),
+    ("domestic_shelter", ["domestic_shelter"], [], []),
+    ("hospital", ["hospital_flag"], [], []),
+    ("veterinary_hospital", ["veterinary_hospital"], [], []),
+    (
+        "special_designations",
+        [],
+        [],
+        [
+            "8a_program_participant",
+            "ability_one_program",
+            "dot_certified_disadvantaged_business_enterprise",
+            "emerging_small_business",
+            "federally_funded_research_and_development_corp",
+            "historically_underutilized_business_firm",
+            "labor_surplus_area_firm",
+            "sba_certified_8a_joint_venture",
+            "self_certified_small_disadvanted_business",
+            "small_agricultural_cooperative",
+            "small_disadvantaged_business",
+            "community_developed_corporation_owned_firm",
+            "us_owned_business",
+            "foreign_owned_and_us_located_business",
+            "foreign_owned",
+            "foreign_government",
+            "international_organization",
+            "domestic_shelter",
+            "hospital",
+            "veterinary_hospital",
+        ],
+    ),
+    # NON-PROFIT
+    ("foundation", ["foundation"], [], []),
+    ("community_development_corporations", ["community_development_corp"], [], []),
+    (
+        "nonprofit",
+        ["nonprofit_organization", "other_not_for_profit_organ"],
+        [],
+        ["foundation", "community_development_corporations"],
+    ),
+    # HIGHER EDUCATION
+    ("educational_institution", ["educational_institution"], [], []),
+    (
+        "public_institution_of_higher_education",
+        [
+            "state_controlled_instituti",
+            "c1862_land_grant_college",
+            "c1890_land_grant_college",
+            "c1994_land_grant_college",
+        ],
+        [],
+        [],
+    ),
+    ("private_institution_of_higher_education", ["private_university_or_coll"], [], []),
+    (
+        "minority_serving_institution_of_higher_education",
+        [
+            "minority_institution",
+            "historically_black_college",
+            "tribal_college",
+            "alaskan_native_servicing_i",
+            "native_hawaiian_servicing",
+            "hispanic_servicing_institu",
+        ],
+        [],
+        [],
+    ),
+    ("school_of_forestry", ["school_of_forestry"], [], []),
+    ("veterinary_college", ["veterinary_college"], [], []),
+    (
+        "higher_education",
+        [],
+        [],
+        [
+            "educational_institution",
+            "public_institution_of_higher_education",
+            "private_institution_of_higher_education",
+            "school_of_forestry",
+            "minority_serving_institution_of_higher_education",
+            "veterinary_college",
+        ],
+    ),
+    # GOVERNMENT
+    ("national_government", ["us_federal_government", "federal_agency", "us_government_entity"], [], []),
+    ("interstate_entity", ["interstate_entity"], [], []),
+    ("regional_and_state_government", ["us_state_government"], [], []),
+    ("council_of_governments", ["council_of_governments"], [], []),
+    (
+        "local_government",
+        [
+            "city_local_government",
+            "county_local_government",
+            "inter_municipal_local_gove",
+            "municipality_local_governm",
+            "township_local_government",
+            "us_local_government",
+            "local_government_owned",
+            "school_district_local_gove",
+        ],
+        [],
+        [],
+    ),
+    ("indian_native_american_tribal_government", ["us_tribal_government", "indian_tribe_federally_rec"], [], []),
+    (
+        "authorities_and_commissions",
+        [
+            "housing_authorities_public",
+            "airport_authority",
+            "port_authority",
+            "transit_authority",
+            "planning_commission",
+        ],
+        [],
+        [],
+    ),
+    (
+        "government",
+        [],
+        [],
+        [
+            "national_government",
+            "regional_and_state_government",
+            "local_government",
+            "indian_native_american_tribal_government",
+            "authorities_and_commissions",
+            "interstate_entity",
+            "council_of_governments",
+        ],
+    ),
+]
+
 
 def get_business_categories(row, data_type):
     business_category_set = set()
@@ -74,345 +318,105 @@ def get_business_categories(row, data_type):
 
     elif data_type == "fpds":
         business_categories_boolean_dict = build_business_categories_boolean_dict(row)
+        for category, boolean_columns, conditions, dependencies in FPDS_BUSINESS_CATEGORY_RULES:
+            if (
+                any(business_categories_boolean_dict[column] is True for column in boolean_columns)
+                or any(row.get(column) in values for column, values in conditions)
+                or business_category_set.intersection(dependencies)
+            ):
+                business_category_set.add(category)
 
-        # BUSINESS (FOR-PROFIT)
-        if (
-            row.get("contracting_officers_deter") == "S"
-            or business_categories_boolean_dict["women_owned_small_business"] is True
-            or business_categories_boolean_dict["economically_disadvantaged"] is True
-            or business_categories_boolean_dict["joint_venture_women_owned"] is True
-            or business_categories_boolean_dict["emerging_small_business"] is True
-            or business_categories_boolean_dict["self_certified_small_disad"] is True
-            or business_categories_boolean_dict["small_agricultural_coopera"] is True
-            or business_categories_boolean_dict["small_disadvantaged_busine"] is True
-        ):
-            business_category_set.add("small_business")
-
-        if row.get("contracting_officers_deter") == "O":
-            business_category_set.add("other_than_small_business")
-
-        if business_categories_boolean_dict["corporate_entity_tax_exemp"] is True:
-            business_category_set.add("corporate_entity_tax_exempt")
-
-        if business_categories_boolean_dict["corporate_entity_not_tax_e"] is True:
-            business_category_set.add("corporate_entity_not_tax_exempt")
-
-        if business_categories_boolean_dict["partnership_or_limited_lia"] is True:
-            business_category_set.add("partnership_or_limited_liability_partnership")
-
-        if business_categories_boolean_dict["sole_proprietorship"] is True:
-            business_category_set.add("sole_proprietorship")
-
-        if business_categories_boolean_dict["manufacturer_of_goods"] is True:
-            business_category_set.add("manufacturer_of_goods")
-
-        if business_categories_boolean_dict["subchapter_s_corporation"] is True:
-            business_category_set.add("subchapter_s_corporation")
-
-        if business_categories_boolean_dict["limited_liability_corporat"] is True:
-            business_category_set.add("limited_liability_corporation")
-
-        if business_categories_boolean_dict["for_profit_organization"] is True or (
-            business_category_set
-            & {
-                "small_business",
-                "other_than_small_business",
-                "corporate_entity_tax_exempt",
-                "corporate_entity_not_tax_exempt",
-                "partnership_or_limited_liability_partnership",
-                "sole_proprietorship",
-                "manufacturer_of_goods",
-                "subchapter_s_corporation",
-                "limited_liability_corporation",
-            }
-        ):
-            business_category_set.add("category_business")
-
-        # MINORITY BUSINESS
-        if business_categories_boolean_dict["alaskan_native_owned_corpo"] is True:
-            business_category_set.add("alaskan_native_corporation_owned_firm")
-
-        if business_categories_boolean_dict["american_indian_owned_busi"] is True:
-            business_category_set.add("american_indian_owned_business")
-
-        if business_categories_boolean_dict["asian_pacific_american_own"] is True:
-            business_category_set.add("asian_pacific_american_owned_business")
-
-        if business_categories_boolean_dict["black_american_owned_busin"] is True:
-            business_category_set.add("black_american_owned_business")
-
-        if business_categories_boolean_dict["hispanic_american_owned_bu"] is True:
-            business_category_set.add("hispanic_american_owned_business")
-
-        if business_categories_boolean_dict["native_american_owned_busi"] is True:
-            business_category_set.add("native_american_owned_business")
-
-        if business_categories_boolean_dict["native_hawaiian_owned_busi"] is True:
-            business_category_set.add("native_hawaiian_organization_owned_firm")
-
-        if business_categories_boolean_dict["subcontinent_asian_asian_i"] is True:
-            business_category_set.add("subcontinent_asian_indian_american_owned_business")
-
-        if business_categories_boolean_dict["tribally_owned_business"] is True:
-            business_category_set.add("tribally_owned_firm")
-
-        if business_categories_boolean_dict["other_minority_owned_busin"] is True:
-            business_category_set.add("other_minority_owned_business")
-
-        if business_categories_boolean_dict["minority_owned_business"] is True or (
-            business_category_set
-            & {
-                "alaskan_native_corporation_owned_firm",
-                "american_indian_owned_business",
-                "asian_pacific_american_owned_business",
-                "black_american_owned_business",
-                "hispanic_american_owned_business",
-                "native_american_owned_business",
-                "native_hawaiian_organization_owned_firm",
-                "subcontinent_asian_indian_american_owned_business",
-                "tribally_owned_firm",
-                "other_minority_owned_business",
-            }
-        ):
-            business_category_set.add("minority_owned_business")
-
-        # WOMEN OWNED BUSINESS
-        if business_categories_boolean_dict["women_owned_small_business"] is True:
-            business_category_set.add("women_owned_small_business")
-
-        if business_categories_boolean_dict["economically_disadvantaged"] is True:
-            business_category_set.add("economically_disadvantaged_women_owned_small_business")
-
-        if business_categories_boolean_dict["joint_venture_women_owned"] is True:
-            business_category_set.add("joint_venture_women_owned_small_business")
-
-        if business_categories_boolean_dict["joint_venture_economically"] is True:
-            business_category_set.add("joint_venture_economically_disadvantaged_women_owned_small_business")
-
-        if business_categories_boolean_dict["woman_owned_business"] is True or (
-            business_category_set
-            & {
-                "women_owned_small_business",
-                "economically_disadvantaged_women_owned_small_business",
-                "joint_venture_women_owned_small_business",
-                "joint_venture_economically_disadvantaged_women_owned_small_business",
-            }
-        ):
-            business_category_set.add("woman_owned_business")
-
-        # VETERAN OWNED BUSINESS
-        if business_categories_boolean_dict["service_disabled_veteran_o"] is True:
-            business_category_set.add("service_disabled_veteran_owned_business")
-
-        if business_categories_boolean_dict["veteran_owned_business"] is True or (
-            business_category_set & {"service_disabled_veteran_owned_business"}
-        ):
-            business_category_set.add("veteran_owned_business")
-
-        # SPECIAL DESIGNATIONS
-        if business_categories_boolean_dict["c8a_program_participant"] is True:
-            business_category_set.add("8a_program_participant")
-
-        if business_categories_boolean_dict["the_ability_one_program"] is True:
-            business_category_set.add("ability_one_program")
-
-        if business_categories_boolean_dict["dot_certified_disadvantage"] is True:
-            business_category_set.add("dot_certified_disadvantaged_business_enterprise")
-
-        if business_categories_boolean_dict["emerging_small_business"] is True:
-            business_category_set.add("emerging_small_business")
-
-        if business_categories_boolean_dict["federally_funded_research"] is True:
-            business_category_set.add("federally_funded_research_and_development_corp")
-
-        if business_categories_boolean_dict["historically_underutilized"] is True:
-            business_category_set.add("historically_underutilized_business_firm")
-
-        if business_categories_boolean_dict["labor_surplus_area_firm"] is True:
-            business_category_set.add("labor_surplus_area_firm")
-
-        if business_categories_boolean_dict["sba_certified_8_a_joint_ve"] is True:
-            business_category_set.add("sba_certified_8a_joint_venture")
-
-        if business_categories_boolean_dict["self_certified_small_disad"] is True:
-            business_category_set.add("self_certified_small_disadvanted_business")
-
-        if business_categories_boolean_dict["small_agricultural_coopera"] is True:
-            business_category_set.add("small_agricultural_cooperative")
-
-        if business_categories_boolean_dict["small_disadvantaged_busine"] is True:
-            business_category_set.add("small_disadvantaged_business")
-
-        if business_categories_boolean_dict["community_developed_corpor"] is True:
-            business_category_set.add("community_developed_corporation_owned_firm")
-
-        # U.S. Owned Business
-        if row.get("domestic_or_foreign_entity") == "A":
-            business_category_set.add("us_owned_business")
-
-        # Foreign-Owned Business Incorporated in the U.S.
-        if row.get("domestic_or_foreign_entity") == "C":
-            business_category_set.add("foreign_owned_and_us_located_business")
-
-        # Foreign-Owned Business Not Incorporated in the U.S.
-        if (
-            row.get("domestic_or_foreign_entity") == "D"
-            or business_categories_boolean_dict["foreign_owned_and_located"] is True
-        ):
-            business_category_set.add("foreign_owned")
-
-        if business_categories_boolean_dict["foreign_government"] is True:
-            business_category_set.add("foreign_government")
-
-        if business_categories_boolean_dict["international_organization"] is True:
-            business_category_set.add("international_organization")
-
-        if business_categories_boolean_dict["domestic_shelter"] is True:
-            business_category_set.add("domestic_shelter")
-
-        if business_categories_boolean_dict["hospital_flag"] is True:
-            business_category_set.add("hospital")
-
-        if business_categories_boolean_dict["veterinary_hospital"] is True:
-            business_category_set.add("veterinary_hospital")
-
-        if business_category_set & {
-            "8a_program_participant",
-            "ability_one_program",
-            "dot_certified_disadvantaged_business_enterprise",
-            "emerging_small_business",
-            "federally_funded_research_and_development_corp",
-            "historically_underutilized_business_firm",
-            "labor_surplus_area_firm",
-            "sba_certified_8a_joint_venture",
-            "self_certified_small_disadvanted_business",
-            "small_agricultural_cooperative",
-            "small_disadvantaged_business",
-            "community_developed_corporation_owned_firm",
-            "us_owned_business",
-            "foreign_owned_and_us_located_business",
-            "foreign_owned",
-            "foreign_government",
-            "international_organization",
-            "domestic_shelter",
-            "hospital",
-            "veterinary_hospital",
-        }:
-            business_category_set.add("special_designations")
-
-        # NON-PROFIT
-        if business_categories_boolean_dict["foundation"] is True:
-            business_category_set.add("foundation")
-
-        if business_categories_boolean_dict["community_development_corp"] is True:
-            business_category_set.add("community_development_corporations")
-
-        if (
-            business_categories_boolean_dict["nonprofit_organization"] is True
-            or business_categories_boolean_dict["other_not_for_profit_organ"] is True
-            or (business_category_set & {"foundation", "community_development_corporations"})
-        ):
-            business_category_set.add("nonprofit")
-
-        # HIGHER EDUCATION
-        if business_categories_boolean_dict["educational_institution"] is True:
-            business_category_set.add("educational_institution")
-
-        if (
-            business_categories_boolean_dict["state_controlled_instituti"] is True
-            or business_categories_boolean_dict["c1862_land_grant_college"] is True
-            or business_categories_boolean_dict["c1890_land_grant_college"] is True
-            or business_categories_boolean_dict["c1994_land_grant_college"] is True
-        ):
-            business_category_set.add("public_institution_of_higher_education")
-
-        if business_categories_boolean_dict["private_university_or_coll"] is True:
-            business_category_set.add("private_institution_of_higher_education")
-
-        if (
-            business_categories_boolean_dict["minority_institution"] is True
-            or business_categories_boolean_dict["historically_black_college"] is True
-            or business_categories_boolean_dict["tribal_college"] is True
-            or business_categories_boolean_dict["alaskan_native_servicing_i"] is True
-            or business_categories_boolean_dict["native_hawaiian_servicing"] is True
-            or business_categories_boolean_dict["hispanic_servicing_institu"] is True
-        ):
-            business_category_set.add("minority_serving_institution_of_higher_education")
-
-        if business_categories_boolean_dict["school_of_forestry"] is True:
-            business_category_set.add("school_of_forestry")
-
-        if business_categories_boolean_dict["veterinary_college"] is True:
-            business_category_set.add("veterinary_college")
-
-        if business_category_set & {
-            "educational_institution",
-            "public_institution_of_higher_education",
-            "private_institution_of_higher_education",
-            "school_of_forestry",
-            "minority_serving_institution_of_higher_education",
-            "veterinary_college",
-        }:
-            business_category_set.add("higher_education")
+        return sorted(business_category_set)
+    else:
+        raise ValueError(
+            "Invalid object type provided to update_business_categories. "
+            "Must be one of the following types: TransactionFPDS, TransactionFABS"
+        )
 
-        # GOVERNMENT
-        if (
-            business_categories_boolean_dict["us_federal_government"] is True
-            or business_categories_boolean_dict["federal_agency"] is True
-            or business_categories_boolean_dict["us_government_entity"] is True
-        ):
-            business_category_set.add("national_government")
 
-        if business_categories_boolean_dict["interstate_entity"] is True:
-            business_category_set.add("interstate_entity")
+def business_category_source_columns(data_type: str) -> List[str]:
+    """The row columns read when deriving business categories for the given data type"""
+    if data_type == "fabs":
+        return ["business_types"]
+    elif data_type == "fpds":
+        columns = set()
+        for category, boolean_columns, conditions, dependencies in FPDS_BUSINESS_CATEGORY_RULES:
+            columns.update(boolean_columns)
+            columns.update(column for column, values in conditions)
+        return sorted(columns)
+    else:
+        raise ValueError(
+            "Invalid object type provided to update_business_categories. "
+            "Must be one of the following types: TransactionFPDS, TransactionFABS"
+        )
 
-        if business_categories_boolean_dict["us_state_government"] is True:
-            business_category_set.add("regional_and_state_government")
 
-        if business_categories_boolean_dict["council_of_governments"] is True:
-            business_category_set.add("council_of_governments")
-
-        if (
-            business_categories_boolean_dict["city_local_government"] is True
-            or business_categories_boolean_dict["county_local_government"] is True
-            or business_categories_boolean_dict["inter_municipal_local_gove"] is True
-            or business_categories_boolean_dict["municipality_local_governm"] is True
-            or business_categories_boolean_dict["township_local_government"] is True
-            or business_categories_boolean_dict["us_local_government"] is True
-            or business_categories_boolean_dict["local_government_owned"] is True
-            or business_categories_boolean_dict["school_district_local_gove"] is True
-        ):
-            business_category_set.add("local_government")
+def rows_to_business_category_columns(rows: Sequence[dict], data_type: str) -> Dict[str, list]:
+    """Pivot row dictionaries into the columnar input of get_business_categories_bulk()"""
+    return {column: [row.get(column) for row in rows] for column in business_category_source_columns(data_type)}
 
-        if (
-            business_categories_boolean_dict["us_tribal_government"] is True
-            or business_categories_boolean_dict["indian_tribe_federally_rec"] is True
-        ):
-            business_category_set.add("indian_native_american_tribal_government")
 
-        if (
-            business_categories_boolean_dict["housing_authorities_public"] is True
-            or business_categories_boolean_dict["airport_authority"] is True
-            or business_categories_boolean_dict["port_authority"] is True
-            or business_categories_boolean_dict["transit_authority"] is True
-            or business_categories_boolean_dict["planning_commission"] is True
-        ):
-            business_category_set.add("authorities_and_commissions")
+def get_business_categories_bulk(columns: Dict[str, Sequence], data_type: str) -> List[List[str]]:
+    """
+    Chunk-at-a-time equivalent of get_business_categories(). Takes the source columns of a chunk of rows as equal
+    length arrays (missing columns are treated as NULL) and returns each row's sorted list of business categories.
 
-        if business_category_set & {
-            "national_government",
-            "regional_and_state_government",
-            "local_government",
-            "indian_native_american_tribal_government",
-            "authorities_and_commissions",
-            "interstate_entity",
-            "council_of_governments",
-        }:
-            business_category_set.add("government")
+    FABS categories depend on a single code, so they are looked up from a table built once per distinct code.
+    FPDS categories are computed for all rows at once as boolean masks, and the category list is only built once
+    per distinct combination of categories in the chunk.
+    """
+    source_columns = business_category_source_columns(data_type)
+    row_count = len(next(iter(columns.values()))) if columns else 0
+    if row_count == 0:
+        return []
 
-        return sorted(business_category_set)
-    else:
-        raise ValueError(
-            "Invalid object type provided to update_business_categories. "
-            "Must be one of the following types: TransactionFPDS, TransactionFABS"
-        )
+    if data_type == "fabs":
+        business_types = columns.get("business_types") or [None] * row_count
+        categories_by_code = {
+            code: get_business_categories({"business_types": code}, "fabs") for code in set(business_types)
+        }
+        return [list(categories_by_code[code]) for code in business_types]
+
+    parsed_columns = {}
+    for column in source_columns:
+        if column in ("contracting_officers_deter", "domestic_or_foreign_entity"):
+            parsed_columns[column] = _object_column(columns.get(column), row_count)
+        else:
+            parsed_columns[column] = _parse_boolean_column(columns.get(column), row_count)
+
+    masks = {}
+    for category, boolean_columns, conditions, dependencies in FPDS_BUSINESS_CATEGORY_RULES:
+        mask = np.zeros(row_count, dtype=bool)
+        for column in boolean_columns:
+            mask |= parsed_columns[column]
+        for column, matching_values in conditions:
+            for value in matching_values:
+                mask |= parsed_columns[column] == value
+        for dependency in dependencies:
+            mask |= masks[dependency]
+        masks[category] = mask
+
+    category_names = np.array(sorted(masks), dtype=object)
+    category_matrix = np.column_stack([masks[name] for name in category_names])
+    patterns, pattern_index = np.unique(np.packbits(category_matrix, axis=1), axis=0, return_inverse=True)
+    pattern_matrix = np.unpackbits(patterns, axis=1, count=len(category_names)).astype(bool)
+    categories_by_pattern = [category_names[pattern].tolist() for pattern in pattern_matrix]
+    return [list(categories_by_pattern[i]) for i in pattern_index.ravel()]
+
+
+def _object_column(column: Sequence, row_count: int) -> np.ndarray:
+    if column is None:
+        return np.full(row_count, None, dtype=object)
+    array = np.empty(row_count, dtype=object)
+    array[:] = column
+    return array
+
+
+def _parse_boolean_column(column: Sequence, row_count: int) -> np.ndarray:
+    """Vectorized form of the strtobool() parsing done by build_business_categories_boolean_dict()"""
+    if column is None:
+        return np.zeros(row_count, dtype=bool)
+    parsed = {value: bool(strtobool(value or "false")) for value in set(column)}
+    if not any(parsed.values()):
+        return np.zeros(row_count, dtype=bool)
+    return np.fromiter(map(parsed.__getitem__, column), dtype=bool, count=row_count)
@@ -4,9 +4,13 @@ import time
 from copy import copy
 from datetime import datetime, timezone
 from django.db import connection, transaction
+from psycopg2.extras import execute_values
 
 from usaspending_api.awards.models import TransactionFABS, TransactionNormalized, Award
-from usaspending_api.broker.helpers.get_business_categories import get_business_categories
+from usaspending_api.broker.helpers.get_business_categories import (
+    get_business_categories_bulk,
+    rows_to_business_category_columns,
+)
 from usaspending_api.common.helpers.date_helper import cast_datetime_to_utc
 from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
@@ -15,12 +19,17 @@ from usaspending_api.common.helpers.timing_helpers import timer
 from usaspending_api.etl.award_helpers import update_awards, update_assistance_awards
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date
+from usaspending_api.etl.transaction_loaders.cached_reference_data import (
+    get_subtier_agency_id,
+    refresh_subtier_agency_cache,
+)
 from usaspending_api.references.models import Agency
 
 
 logger = logging.getLogger("script")
 
 BATCH_FETCH_SIZE = 25000
+BULK_WRITE_BATCH_SIZE = 5000
 
 
 def fetch_fabs_data_generator(dap_uid_list):
@@ -45,43 +54,92 @@ def fetch_fabs_data_generator(dap_uid_list):
 
 
 @transaction.atomic
-def insert_all_new_fabs(all_new_to_insert):
+def insert_all_new_fabs(all_new_to_insert, bulk=False):
+    insert_batch = insert_new_fabs_in_bulk if bulk else insert_new_fabs
     update_award_ids = []
+    refresh_subtier_agency_cache()  # pick up any agencies loaded since the last run in this process
     for to_insert in fetch_fabs_data_generator(all_new_to_insert):
         start = time.perf_counter()
-        update_award_ids.extend(insert_new_fabs(to_insert))
+        update_award_ids.extend(insert_batch(to_insert))
         logger.info("FABS insertions took {:.2f}s".format(time.perf_counter() - start))
     return update_award_ids
 
 
-def insert_new_fabs(to_insert):
-    fabs_normalized_field_map = {
-        "type": "assistance_type",
-        "description": "award_description",
-        "funding_amount": "total_funding_amount",
+def _get_agency_by_subtier_only(subtier_code):
+    """Same result as Agency.get_by_subtier_only, but resolved from the shared in-memory reference cache"""
+    agency_id = get_subtier_agency_id(subtier_code, unique_only=True)
+    return None if agency_id is None else Agency(id=agency_id)
+
+
+FABS_NORMALIZED_FIELD_MAP = {
+    "type": "assistance_type",
+    "description": "award_description",
+    "funding_amount": "total_funding_amount",
+}
+
+FABS_FIELD_MAP = {
+    "officer_1_name": "high_comp_officer1_full_na",
+    "officer_1_amount": "high_comp_officer1_amount",
+    "officer_2_name": "high_comp_officer2_full_na",
+    "officer_2_amount": "high_comp_officer2_amount",
+    "officer_3_name": "high_comp_officer3_full_na",
+    "officer_3_amount": "high_comp_officer3_amount",
+    "officer_4_name": "high_comp_officer4_full_na",
+    "officer_4_amount": "high_comp_officer4_amount",
+    "officer_5_name": "high_comp_officer5_full_na",
+    "officer_5_amount": "high_comp_officer5_amount",
+}
+
+
+def _build_transaction_dicts(row, award, business_categories):
+    """Map one upper-cased source row onto the TransactionNormalized and TransactionFABS columns"""
+    try:
+        last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S.%f").date()
+    except ValueError:
+        last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S").date()
+
+    parent_txn_value_map = {
+        "award": award,
+        # Find the toptier awards from the subtier awards
+        "awarding_agency": _get_agency_by_subtier_only(row["awarding_sub_tier_agency_c"]),
+        "funding_agency": _get_agency_by_subtier_only(row["funding_sub_tier_agency_co"]),
+        "period_of_performance_start_date": format_date(row["period_of_performance_star"]),
+        "period_of_performance_current_end_date": format_date(row["period_of_performance_curr"]),
+        "action_date": format_date(row["action_date"]),
+        "last_modified_date": last_mod_date,
+        "type_description": row["assistance_type_desc"],
+        "transaction_unique_id": row["afa_generated_unique"],
+        "business_categories": business_categories,
     }
 
-    fabs_field_map = {
-        "officer_1_name": "high_comp_officer1_full_na",
-        "officer_1_amount": "high_comp_officer1_amount",
-        "officer_2_name": "high_comp_officer2_full_na",
-        "officer_2_amount": "high_comp_officer2_amount",
-        "officer_3_name": "high_comp_officer3_full_na",
-        "officer_3_amount": "high_comp_officer3_amount",
-        "officer_4_name": "high_comp_officer4_full_na",
-        "officer_4_amount": "high_comp_officer4_amount",
-        "officer_5_name": "high_comp_officer5_full_na",
-        "officer_5_amount": "high_comp_officer5_amount",
-    }
+    transaction_normalized_dict = load_data_into_model(
+        TransactionNormalized(),  # thrown away
+        row,
+        field_map=FABS_NORMALIZED_FIELD_MAP,
+        value_map=parent_txn_value_map,
+        as_dict=True,
+    )
 
-    update_award_ids = []
+    financial_assistance_data = load_data_into_model(
+        TransactionFABS(), row, field_map=FABS_FIELD_MAP, as_dict=True  # thrown away
+    )
+
+    # Hack to cut back on the number of warnings dumped to the log.
+    financial_assistance_data["updated_at"] = cast_datetime_to_utc(financial_assistance_data["updated_at"])
+    financial_assistance_data["created_at"] = cast_datetime_to_utc(financial_assistance_data["created_at"])
+    financial_assistance_data["modified_at"] = cast_datetime_to_utc(financial_assistance_data["modified_at"])
+
+    return transaction_normalized_dict, financial_assistance_data
+
+
+def insert_new_fabs(to_insert):
     for row in to_insert:
         upper_case_dict_values(row)
 
-        # Find the toptier awards from the subtier awards
-        awarding_agency = Agency.get_by_subtier_only(row["awarding_sub_tier_agency_c"])
-        funding_agency = Agency.get_by_subtier_only(row["funding_sub_tier_agency_co"])
+    business_categories = get_business_categories_bulk(rows_to_business_category_columns(to_insert, "fabs"), "fabs")
 
+    update_award_ids = []
+    for row, row_business_categories in zip(to_insert, business_categories):
         # Create the summary Award
         (created, award) = Award.get_or_create_summary_award(
             generated_unique_award_id=row["unique_award_key"],
@@ -94,41 +152,10 @@ def insert_new_fabs(to_insert):
         # Append row to list of Awards updated
         update_award_ids.append(award.id)
 
-        try:
-            last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S.%f").date()
-        except ValueError:
-            last_mod_date = datetime.strptime(str(row["modified_at"]), "%Y-%m-%d %H:%M:%S").date()
-
-        parent_txn_value_map = {
-            "award": award,
-            "awarding_agency": awarding_agency,
-            "funding_agency": funding_agency,
-            "period_of_performance_start_date": format_date(row["period_of_performance_star"]),
-            "period_of_performance_current_end_date": format_date(row["period_of_performance_curr"]),
-            "action_date": format_date(row["action_date"]),
-            "last_modified_date": last_mod_date,
-            "type_description": row["assistance_type_desc"],
-            "transaction_unique_id": row["afa_generated_unique"],
-            "business_categories": get_business_categories(row=row, data_type="fabs"),
-        }
-
-        transaction_normalized_dict = load_data_into_model(
-            TransactionNormalized(),  # thrown away
-            row,
-            field_map=fabs_normalized_field_map,
-            value_map=parent_txn_value_map,
-            as_dict=True,
+        transaction_normalized_dict, financial_assistance_data = _build_transaction_dicts(
+            row, award, row_business_categories
         )
 
-        financial_assistance_data = load_data_into_model(
-            TransactionFABS(), row, field_map=fabs_field_map, as_dict=True  # thrown away
-        )
-
-        # Hack to cut back on the number of warnings dumped to the log.
-        financial_assistance_data["updated_at"] = cast_datetime_to_utc(financial_assistance_data["updated_at"])
-        financial_assistance_data["created_at"] = cast_datetime_to_utc(financial_assistance_data["created_at"])
-        financial_assistance_data["modified_at"] = cast_datetime_to_utc(financial_assistance_data["modified_at"])
-
         afa_generated_unique = financial_assistance_data["afa_generated_unique"]
         unique_fabs = TransactionFABS.objects.filter(afa_generated_unique=afa_generated_unique)
 
@@ -155,13 +182,147 @@ def insert_new_fabs(to_insert):
     return update_award_ids
 
 
-def upsert_fabs_transactions(ids_to_upsert, externally_updated_award_ids):
+def insert_new_fabs_in_bulk(to_insert):
+    """
+    Set-based equivalent of insert_new_fabs. Summary awards and existing transactions for the whole batch are
+    resolved up front and everything is written with a handful of bulk statements instead of several queries per row.
+    Agencies come from the in-memory subtier agency cache.
+    """
+    if any(row["unique_award_key"] is None for row in to_insert):
+        # Awards without a generated unique ID are matched on agency and FAIN/URI, which only the per-row path does
+        logger.info("Batch contains transactions without a unique_award_key; loading it one row at a time")
+        return insert_new_fabs(to_insert)
+
+    for row in to_insert:
+        upper_case_dict_values(row)
+
+    business_categories = get_business_categories_bulk(rows_to_business_category_columns(to_insert, "fabs"), "fabs")
+    award_ids = _get_or_create_summary_awards(to_insert)
+
+    # A batch can contain the same transaction more than once; as in the per-row path, the last one wins
+    latest_rows = {}
+    for row, row_business_categories in zip(to_insert, business_categories):
+        latest_rows[row["afa_generated_unique"]] = (row, row_business_categories)
+
+    existing_transaction_ids = dict(
+        TransactionFABS.objects.filter(afa_generated_unique__in=list(latest_rows)).values_list(
+            "afa_generated_unique", "transaction_id"
+        )
+    )
+
+    now = datetime.now(timezone.utc)
+    new_normalized, new_fabs, updated_normalized, updated_fabs = [], [], [], []
+    for afa_generated_unique, (row, row_business_categories) in latest_rows.items():
+        award = Award(id=award_ids[row["unique_award_key"]])
+        transaction_normalized_dict, financial_assistance_data = _build_transaction_dicts(
+            row, award, row_business_categories
+        )
+        transaction_normalized_dict["fiscal_year"] = fy(transaction_normalized_dict["action_date"])
+
+        transaction_id = existing_transaction_ids.get(afa_generated_unique)
+        if transaction_id is None:
+            new_normalized.append(TransactionNormalized(**transaction_normalized_dict))
+            new_fabs.append(financial_assistance_data)
+        else:
+            transaction_normalized_dict["update_date"] = now
+            updated_normalized_fields = list(transaction_normalized_dict)
+            updated_fabs_fields = list(financial_assistance_data)
+            updated_normalized.append(TransactionNormalized(id=transaction_id, **transaction_normalized_dict))
+            updated_fabs.append(TransactionFABS(transaction_id=transaction_id, **financial_assistance_data))
+
+    if new_normalized:
+        # bulk_create fills in the primary keys the TransactionFABS records need
+        TransactionNormalized.objects.bulk_create(new_normalized, batch_size=BULK_WRITE_BATCH_SIZE)
+        TransactionFABS.objects.bulk_create(
+            [
+                TransactionFABS(transaction=transaction_normalized, **financial_assistance_data)
+                for transaction_normalized, financial_assistance_data in zip(new_normalized, new_fabs)
+            ],
+            batch_size=BULK_WRITE_BATCH_SIZE,
+        )
+
+    if updated_normalized:
+        # Like QuerySet.update() in the per-row path, only write the columns that were mapped from the source row
+        _bulk_update_from_staging_table(TransactionNormalized, updated_normalized, updated_normalized_fields)
+        _bulk_update_from_staging_table(TransactionFABS, updated_fabs, updated_fabs_fields)
+
+    logger.info(
+        f"{len(new_normalized):,} FABS transactions inserted, {len(updated_normalized):,} updated, "
+        f"{len(to_insert) - len(latest_rows):,} duplicates skipped"
+    )
+
+    return [award_ids[row["unique_award_key"]] for row in to_insert]
+
+
+def _bulk_update_from_staging_table(model, instances, field_names):
+    """
+    Writes FIELD_NAMES of the INSTANCES to their rows in one UPDATE ... FROM a temporary staging table that mirrors
+    the destination columns.  Used instead of bulk_update(), whose CASE WHEN per column and row gets very expensive
+    for tables as wide as transaction_fabs.
+    """
+    table = model._meta.db_table
+    pk = model._meta.pk
+    fields = [model._meta.get_field(field_name) for field_name in field_names if field_name != pk.name]
+    quote_name = connection.ops.quote_name
+    staging_table = quote_name(f"temp_fabs_loader_{table}_updates")
+    columns = ", ".join(quote_name(field.column) for field in [pk] + fields)
+    update_pairs = ", ".join(f"{quote_name(field.column)} = s.{quote_name(field.column)}" for field in fields)
+    rows = [
+        [field.get_db_prep_save(getattr(instance, field.attname), connection) for field in [pk] + fields]
+        for instance in instances
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging_table} AS SELECT {columns} FROM {quote_name(table)} LIMIT 0")
+        execute_values(
+            cursor.cursor, f"INSERT INTO {staging_table} ({columns}) VALUES %s", rows, page_size=BULK_WRITE_BATCH_SIZE
+        )
+        cursor.execute(
+            f"UPDATE {quote_name(table)} AS t SET {update_pairs} FROM {staging_table} AS s "
+            f"WHERE t.{quote_name(pk.column)} = s.{quote_name(pk.column)}"
+        )
+        cursor.execute(f"DROP TABLE {staging_table}")
+
+
+def _get_or_create_summary_awards(rows):
+    """
+    Bulk version of Award.get_or_create_summary_award for rows that all have a unique_award_key. Returns a
+    unique_award_key -> award id dict covering every row.
+    """
+    award_ids = dict(
+        Award.objects.filter(generated_unique_award_id__in={row["unique_award_key"] for row in rows}).values_list(
+            "generated_unique_award_id", "id"
+        )
+    )
+
+    # The per-row path saves every award it touches, which refreshes update_date
+    Award.objects.filter(id__in=list(award_ids.values())).update(update_date=datetime.now(timezone.utc))
+
+    new_awards = {}
+    for row in rows:
+        unique_award_key = row["unique_award_key"]
+        if unique_award_key in award_ids or unique_award_key in new_awards:
+            continue
+        # Financial assistance awards are identified by URI (record_type=1) or FAIN (record_type=2 or 3)
+        lookup_field = "fain" if str(row["record_type"]) in ("2", "3") else "uri"
+        new_awards[unique_award_key] = Award(
+            generated_unique_award_id=unique_award_key, **{lookup_field: row[lookup_field]}
+        )
+
+    Award.objects.bulk_create(new_awards.values(), batch_size=BULK_WRITE_BATCH_SIZE)
+    award_ids.update({unique_award_key: award.id for unique_award_key, award in new_awards.items()})
+
+    return award_ids
+
+
+def upsert_fabs_transactions(ids_to_upsert, externally_updated_award_ids, bulk=False):
     if ids_to_upsert or externally_updated_award_ids:
         update_award_ids = copy(externally_updated_award_ids)
 
         if ids_to_upsert:
             with timer("inserting new FABS data", logger.info):
-                update_award_ids.extend(insert_all_new_fabs(ids_to_upsert))
+                update_award_ids.extend(insert_all_new_fabs(ids_to_upsert, bulk))
 
         if update_award_ids:
             update_award_ids = tuple(set(update_award_ids))  # Convert to tuple and remove duplicates.
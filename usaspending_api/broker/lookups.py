@@ -18,6 +18,7 @@ EXTERNAL_DATA_TYPE = [
     LookupType(101, "es_awards", "Load elasticsearch with awards from USAspending"),
     # Additional times to keep track of
     LookupType(120, "touch_last_period_awards", "Touch awards from last period, so they will be updated in ES"),
+    LookupType(121, "recipient_lookup", "Incremental refresh of recipient_lookup and related recipient tables"),
 ]
 EXTERNAL_DATA_TYPE_DICT = {item.name: item.id for item in EXTERNAL_DATA_TYPE}
 EXTERNAL_DATA_TYPE_DICT_ID = {item.id: item.name for item in EXTERNAL_DATA_TYPE}
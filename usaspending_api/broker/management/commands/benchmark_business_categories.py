@@ -0,0 +1,65 @@
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from usaspending_api.broker.helpers.get_business_categories import (
+    business_category_source_columns,
+    get_business_categories,
+    get_business_categories_bulk,
+    rows_to_business_category_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+CODE_COLUMNS = ("contracting_officers_deter", "domestic_or_foreign_entity")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare deriving FPDS business categories a row at a time with pivoting the rows to columns and deriving "
+        "them a chunk at a time, as the FPDS loader does. The rows are synthetic, mostly sparse flag combinations and "
+        "both results are verified to match."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000, help="Number of synthetic FPDS rows")
+        parser.add_argument("--runs", type=int, default=3, help="Each derivation is timed this many times, best kept")
+        parser.add_argument("--seed", type=int, default=2318, help="Seed for the synthetic rows")
+
+    def handle(self, *args, **options):
+        rows = self.synthetic_rows(options["rows"], options["seed"])
+
+        per_row, expected = self.best_of(options["runs"], lambda: [get_business_categories(r, "fpds") for r in rows])
+        bulk, actual = self.best_of(
+            options["runs"],
+            lambda: get_business_categories_bulk(rows_to_business_category_columns(rows, "fpds"), "fpds"),
+        )
+        if actual != expected:
+            raise RuntimeError("Bulk business categories do not match the per-row function")
+        logger.info(
+            f"{len(rows):,} FPDS rows: per-row {per_row:.3f}s, pivot plus bulk {bulk:.3f}s ({per_row / bulk:.1f}x), "
+            f"verified"
+        )
+
+    @staticmethod
+    def best_of(runs, func):
+        timings = []
+        for _ in range(max(1, runs)):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    @staticmethod
+    def synthetic_rows(row_count, seed):
+        rng = random.Random(seed)
+        boolean_columns = [c for c in business_category_source_columns("fpds") if c not in CODE_COLUMNS]
+        rows = []
+        for _ in range(row_count):
+            row = {column: rng.choice(["true", "false", "t", "f", None]) for column in rng.sample(boolean_columns, 5)}
+            row["contracting_officers_deter"] = rng.choice(["S", "O", None])
+            row["domestic_or_foreign_entity"] = rng.choice(["A", "C", "D", None])
+            rows.append(row)
+        return rows
@@ -14,6 +14,7 @@ from usaspending_api.broker.helpers.delete_fabs_transactions import (
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
 from usaspending_api.broker.helpers.upsert_fabs_transactions import upsert_fabs_transactions
 from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.helpers.date_helper import cast_datetime_to_naive, datetime_command_line_argument_type
 from usaspending_api.common.helpers.timing_helpers import timer
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
@@ -179,6 +180,13 @@ class Command(BaseCommand):
             "quotes if date/time contains spaces.",
         )
 
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Resolve summary awards and existing transactions for each batch up front and write them with "
+            "bulk statements instead of several queries per transaction.",
+        )
+
     def handle(self, *args, **options):
         processing_start_datetime = datetime.now(timezone.utc)
 
@@ -217,7 +225,8 @@ class Command(BaseCommand):
             ids_to_upsert = get_fabs_transaction_ids(ids, afa_ids, start_datetime, end_datetime)
 
         update_award_ids = delete_fabs_transactions(ids_to_delete) if is_incremental_load else []
-        upsert_fabs_transactions(ids_to_upsert, update_award_ids)
+        upsert_fabs_transactions(ids_to_upsert, update_award_ids, options["bulk"])
+        bump_data_version("awards")
 
         if is_incremental_load:
             logger.info(f"Storing {processing_start_datetime} for the next incremental run")
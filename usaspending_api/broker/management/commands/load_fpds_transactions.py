@@ -4,12 +4,14 @@ import re
 
 from datetime import datetime, timezone
 from django.core.management.base import BaseCommand
-from typing import IO, List, AnyStr, Optional
+from multiprocessing import Pool
+from typing import IO, List, AnyStr, Generator, Iterable, Optional, Tuple
 
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.helpers.date_helper import datetime_command_line_argument_type
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
-from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
+from usaspending_api.common.helpers.sql_helpers import close_all_django_db_conns, get_database_dsn_string
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, prune_empty_awards
 from usaspending_api.etl.transaction_loaders.fpds_loader import load_fpds_transactions, failed_ids, delete_stale_fpds
@@ -22,10 +24,23 @@ CHUNK_SIZE = 15000
 ALL_FPDS_QUERY = "SELECT {} FROM source_procurement_transaction"
 
 
+def _load_chunk_in_worker(args: Tuple[List[int], bool]) -> Tuple[List[int], List[int], int]:
+    """
+    Load one chunk of IDs in a worker process, which opens its own DB connection on first use.
+    Returns the awards touched and the IDs that failed so the parent process can merge them.
+    """
+    id_list, bulk = args
+    failures_before = len(failed_ids)
+    award_ids = load_fpds_transactions(id_list, bulk)
+    return award_ids, failed_ids[failures_before:], len(id_list)
+
+
 class Command(BaseCommand):
     help = "Sync USAspending DB FPDS data using source transaction for new or modified records and S3 for deleted IDs"
 
     modified_award_ids = []
+    bulk = False
+    processes = 1
 
     @staticmethod
     def get_cursor_for_date_query(connection, date, count=False):
@@ -60,15 +75,40 @@ class Command(BaseCommand):
             records_processed = 0
             logger.info("{} total records to update".format(total_records))
             cursor = self.get_cursor_for_date_query(connection, date)
-            while True:
-                id_list = cursor.fetchmany(chunk_size)
-                if len(id_list) == 0:
-                    break
-                logger.info("Loading batch (size: {}) from date query...".format(len(id_list)))
-                self.modified_award_ids.extend(load_fpds_transactions([row[0] for row in id_list]))
-                records_processed = records_processed + len(id_list)
+            for chunk_record_count in self.load_chunks(self.gen_id_chunks_from_cursor(cursor, chunk_size)):
+                records_processed = records_processed + chunk_record_count
                 logger.info("{} out of {} processed".format(records_processed, total_records))
 
+    @staticmethod
+    def gen_id_chunks_from_cursor(cursor, chunk_size: int = CHUNK_SIZE) -> Generator[List[int], None, None]:
+        while True:
+            id_list = cursor.fetchmany(chunk_size)
+            if len(id_list) == 0:
+                break
+            logger.info("Loading batch (size: {}) from date query...".format(len(id_list)))
+            yield [row[0] for row in id_list]
+
+    def load_chunks(self, id_chunks: Iterable[List[int]]) -> Generator[int, None, None]:
+        """
+        Load each chunk of IDs, yielding the size of each chunk as it completes. With more than one process,
+        chunks are handed to a pool of worker processes, each with its own DB connection, and complete out of order.
+        """
+        if self.processes == 1:
+            for id_list in id_chunks:
+                self.modified_award_ids.extend(load_fpds_transactions(id_list, self.bulk))
+                yield len(id_list)
+            return
+
+        # Django must not share its connection with the forked workers
+        close_all_django_db_conns()
+        with Pool(self.processes) as pool:
+            for award_ids, chunk_failed_ids, chunk_record_count in pool.imap_unordered(
+                _load_chunk_in_worker, ((id_list, self.bulk) for id_list in id_chunks)
+            ):
+                self.modified_award_ids.extend(award_ids)
+                failed_ids.extend(chunk_failed_ids)
+                yield chunk_record_count
+
     @staticmethod
     def gen_read_file_for_ids(file: IO[AnyStr], chunk_size: int = CHUNK_SIZE) -> List[str]:
         """ """
@@ -88,7 +128,7 @@ class Command(BaseCommand):
                 id_list = [int(re.search(r"\d+", x).group()) for x in next_batch]
                 total_count += len(id_list)
                 logger.info(f"Loading next batch (size: {len(id_list)}, ids {id_list[0]}-{id_list[-1]})...")
-                self.modified_award_ids.extend(load_fpds_transactions(id_list))
+                self.modified_award_ids.extend(load_fpds_transactions(id_list, self.bulk))
 
         logger.info(f"Total transaction IDs in file: {total_count}")
 
@@ -139,11 +179,28 @@ class Command(BaseCommand):
             action="store_true",
             help="Script will load or reload all FPDS records in source tables, from all time. This does NOT clear the USAspending database first",
         )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="Number of worker processes, each with its own DB connection, used to load chunks of IDs in parallel."
+            " Applies to --date, --since-last-load and --reload-all.",
+            default=1,
+            choices=range(1, 65),
+            metavar="[1-64]",
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Resolve and write the awards and transactions of each chunk with set-based statements instead of "
+            "several queries per transaction. Chunks that fail are retried one transaction at a time.",
+        )
 
     def handle(self, *args, **options):
 
         # Record script execution start time to update the FPDS last updated date in DB as appropriate
         update_time = datetime.now(timezone.utc)
+        self.bulk = options["bulk"]
+        self.processes = options["processes"]
 
         if options["reload_all"]:
             self.load_fpds_incrementally(None)
@@ -152,7 +209,7 @@ class Command(BaseCommand):
             self.load_fpds_incrementally(options["date"])
 
         elif options["ids"]:
-            self.modified_award_ids.extend(load_fpds_transactions(options["ids"]))
+            self.modified_award_ids.extend(load_fpds_transactions(options["ids"], self.bulk))
 
         elif options["file"]:
             self.load_fpds_from_file(options["file"])
@@ -164,6 +221,7 @@ class Command(BaseCommand):
             self.load_fpds_incrementally(last_load)
 
         self.update_award_records(awards=self.modified_award_ids, skip_cd_linkage=False)
+        bump_data_version("awards")
 
         logger.info(f"Script took {datetime.now(timezone.utc) - update_time}")
 
@@ -0,0 +1,94 @@
+import pytest
+
+from datetime import datetime, timezone
+from model_mommy import mommy
+
+from usaspending_api.awards.models import Award, TransactionFABS, TransactionNormalized
+from usaspending_api.broker.helpers.upsert_fabs_transactions import insert_all_new_fabs
+
+
+COMPARED_NORMALIZED_FIELDS = (
+    "transaction_unique_id",
+    "award__generated_unique_award_id",
+    "award__fain",
+    "award__uri",
+    "awarding_agency_id",
+    "funding_agency_id",
+    "action_date",
+    "fiscal_year",
+    "last_modified_date",
+    "type",
+    "type_description",
+    "description",
+    "business_categories",
+    "federal_action_obligation",
+)
+
+
+def _make_source_assistance_transactions():
+    mommy.make("references.Agency", id=1, subtier_agency__subtier_code="0001")
+    shared_subtier = mommy.make("references.SubtierAgency", subtier_code="0002")
+    mommy.make("references.Agency", id=2, subtier_agency=shared_subtier)
+    mommy.make("references.Agency", id=3, subtier_agency=shared_subtier)
+
+    common = {
+        "action_date": "2010-10-01 00:00:00",
+        "assistance_type": "02",
+        "assistance_type_desc": "block grant",
+        "award_description": "a description",
+        "business_types": "a",
+        "created_at": datetime(2020, 1, 1, tzinfo=timezone.utc),
+        "updated_at": datetime(2020, 1, 1, tzinfo=timezone.utc),
+        "modified_at": "2020-01-01 00:00:00",
+        "period_of_performance_star": "2010-10-01 00:00:00",
+        "period_of_performance_curr": "2011-10-01 00:00:00",
+        "record_type": 2,
+    }
+    for published_id, (award_key, fain, awarding_subtier, obligation) in enumerate(
+        [("ASST_NON_1", "1", "0001", 10), ("ASST_NON_1", "1", "0002", 20), ("ASST_NON_2", "2", "0003", 30)], 1
+    ):
+        mommy.make(
+            "transactions.SourceAssistanceTransaction",
+            published_award_financial_assistance_id=published_id,
+            afa_generated_unique=f"afa_{published_id}",
+            unique_award_key=award_key,
+            fain=fain,
+            awarding_sub_tier_agency_c=awarding_subtier,
+            funding_sub_tier_agency_co="0001",
+            federal_action_obligation=obligation,
+            **common,
+        )
+
+
+def _snapshot():
+    return sorted(
+        TransactionNormalized.objects.values_list(*COMPARED_NORMALIZED_FIELDS, "assistance_data__fain"),
+        key=lambda values: values[0],
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_fabs_load_matches_per_row_load():
+    _make_source_assistance_transactions()
+
+    insert_all_new_fabs([1, 2, 3])
+    per_row = _snapshot()
+
+    TransactionFABS.objects.all().delete()
+    TransactionNormalized.objects.all().delete()
+    Award.objects.all().delete()
+
+    insert_all_new_fabs([1, 2, 3], bulk=True)
+    assert _snapshot() == per_row
+    assert Award.objects.count() == 2
+
+    # A second bulk load of the same transactions updates them in place
+    award_ids = insert_all_new_fabs([1, 2, 3], bulk=True)
+    assert _snapshot() == per_row
+    assert Award.objects.count() == 2
+    assert TransactionFABS.objects.count() == 3
+    assert set(award_ids) == set(Award.objects.values_list("id", flat=True))
+
+    # Subtier 0002 matches two agencies and subtier 0003 none, so neither resolves to an agency
+    assert [values[4] for values in per_row] == [1, None, None]
+    assert [values[5] for values in per_row] == [1, 1, 1]
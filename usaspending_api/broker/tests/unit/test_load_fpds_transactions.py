@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from usaspending_api.broker.management.commands.load_fpds_transactions import Command
+from usaspending_api.etl.transaction_loaders.fpds_loader import failed_ids
+
+
+def _stub_load_fpds_transactions(id_list, bulk=False):
+    """Pretend every ID belongs to the award with ID // 100 and that odd IDs fail to load"""
+    failed_ids.extend(i for i in id_list if i % 2)
+    return list({i // 100 for i in id_list})
+
+
+@patch("usaspending_api.broker.management.commands.load_fpds_transactions.close_all_django_db_conns")
+@patch(
+    "usaspending_api.broker.management.commands.load_fpds_transactions.load_fpds_transactions",
+    side_effect=_stub_load_fpds_transactions,
+)
+def test_load_chunks_merges_worker_results(mock_load_fpds_transactions, mock_close_all_django_db_conns):
+    id_chunks = [[100, 101, 200], [300, 301], [400]]
+
+    for processes in (1, 3):
+        cmd = Command()
+        cmd.modified_award_ids = []
+        cmd.processes = processes
+        del failed_ids[:]
+
+        assert sorted(cmd.load_chunks(iter(id_chunks))) == [1, 2, 3]
+        assert sorted(cmd.modified_award_ids) == [1, 2, 3, 4]
+        assert sorted(failed_ids) == [101, 301]
+
+    del failed_ids[:]
@@ -1,11 +1,71 @@
 import hashlib
 import json
+import logging
+import time
+import uuid
 
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
 from usaspending_api.common.helpers.dict_helpers import order_nested_object
 
+logger = logging.getLogger("console")
+
+# Source domains of the data behind cached responses.  Each has a version token in the usaspending-cache that is
+# part of every cache key for views built on that domain, so bumping a token makes only those responses stale.
+DATA_VERSION_DOMAINS = ("awards", "accounts", "references")
+DATA_VERSION_KEY_PREFIX = "data-version:"
+
+_data_versions = {"checked_at": None, "versions": {}}
+
+
+def get_data_versions():
+    """
+    Returns the current version token of every domain, re-reading them from the usaspending-cache at most every
+    DATA_VERSION_CHECK_SECONDS.  A domain that has never been bumped (or was cleared) is at version "0".
+    """
+    now = time.monotonic()
+    if (
+        _data_versions["checked_at"] is None
+        or now - _data_versions["checked_at"] >= settings.DATA_VERSION_CHECK_SECONDS
+    ):
+        try:
+            stored = caches["usaspending-cache"].get_many([DATA_VERSION_KEY_PREFIX + d for d in DATA_VERSION_DOMAINS])
+        except Exception:
+            logger.exception("Problem while retrieving data versions from cache")
+            stored = {}
+        _data_versions["versions"] = {d: stored.get(DATA_VERSION_KEY_PREFIX + d, "0") for d in DATA_VERSION_DOMAINS}
+        _data_versions["checked_at"] = now
+    return _data_versions["versions"]
+
+
+def bump_data_version(*domains):
+    """
+    Gives each domain a new version token so cached responses built on it are no longer used.  Call once the data
+    change is committed, e.g. with transaction.on_commit.
+    """
+    cache = caches["usaspending-cache"]
+    for domain in domains:
+        if domain not in DATA_VERSION_DOMAINS:
+            raise ValueError(f"Unknown data version domain '{domain}'. Expected one of {DATA_VERSION_DOMAINS}")
+        cache.set(DATA_VERSION_KEY_PREFIX + domain, uuid.uuid4().hex, None)
+        logger.info(f"Bumped cache data version for '{domain}'")
+    _data_versions["checked_at"] = None
+
+
+class DataVersionKeyBit(bits.KeyBitBase):
+    """
+    Adds the version token of each domain the view depends on as a key bit.  Views declare their domains with a
+    cache_data_domains attribute; views without one depend on every domain.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        versions = get_data_versions()
+        domains = getattr(view_instance, "cache_data_domains", DATA_VERSION_DOMAINS)
+        return {domain: versions[domain] for domain in domains}
+
 
 class PathKeyBit(bits.QueryParamsKeyBit):
     """
@@ -49,6 +109,7 @@ class USAspendingKeyConstructor(DefaultKeyConstructor):
 
     path_bit = PathKeyBit()
     request_params = GetPostQueryParamsKeyBit()
+    data_versions = DataVersionKeyBit()
 
     def prepare_key(self, key_dict):
         # Order the key_dict using the order_nested_object function to make sure cache keys are always exactly the same
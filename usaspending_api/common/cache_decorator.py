@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
+import threading
+import time
+import uuid
+import zlib
 
+from collections import OrderedDict
 from collections.abc import Iterable
 from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
 from django.db.models import QuerySet
+from django.http import HttpResponse
+from rest_framework.response import Response
 from rest_framework_extensions.cache.decorators import CacheResponse
-from typing import Any
+from typing import Any, Optional, Tuple
 from usaspending_api.common.experimental_api_flags import is_experimental_elasticsearch_api
+from usaspending_api.common.helpers.timing_helpers import request_stage
 
 logger = logging.getLogger("console")
 
@@ -26,7 +36,227 @@ def contains_queryset(data: Any) -> bool:
         return False
 
 
+# Headers that describe how a response was served rather than its content, so are never stored with it
+UNCACHED_HEADERS = ("cache-trace", "key")
+
+# (zlib compressed rendered content, status code, [(header, value), ...])
+CachedPayload = Tuple[bytes, int, list]
+
+
+class LocalResponseCache:
+    """
+    Bounded, per-process LRU of CachedPayloads with a TTL per entry.  Sits in front of the shared usaspending-cache
+    for small, very frequently requested responses to save the network round trip.  Counts hits, misses, evictions
+    (entries dropped to make room) and expirations, and logs them every METRICS_LOG_INTERVAL lookups.
+    """
+
+    METRICS_LOG_INTERVAL = 10000
+
+    def __init__(self, max_entries: int, max_entry_bytes: int):
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[CachedPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            if (self.hits + self.misses) % self.METRICS_LOG_INTERVAL == 0:
+                logger.info(f"Local response cache: {self.metrics()}")
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, payload: CachedPayload, timeout: int) -> None:
+        if self.max_entries < 1 or len(payload[0]) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+local_response_cache = LocalResponseCache(
+    settings.LOCAL_RESPONSE_CACHE_MAX_ENTRIES, settings.LOCAL_RESPONSE_CACHE_MAX_ENTRY_BYTES
+)
+
+
+class _Flight:
+    """A response being computed by one request that other identical requests in this process are waiting for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+# Deletes KEYS[1] only if it still holds ARGV[1], as one atomic step on the Redis server
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Lets only one request compute the response for a cache key while identical requests wait for its result.
+
+    Requests in the same process wait on an in-process _Flight, which also hands them the result directly.  Across
+    processes the leader takes a lock in the usaspending-cache (an atomic add, so SET NX on Redis) and the other
+    processes' leaders poll the cache for the result until the lock is released.  If the cache cannot be reached the
+    in-process flight is the only coalescing.  Waiters give up after SINGLE_FLIGHT_WAIT_SECONDS and compute the
+    response themselves, and the lock expires after SINGLE_FLIGHT_LOCK_TIMEOUT in case its holder dies.
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, cache, key: str):
+        self.cache = cache
+        self.key = key
+        self.lock_key = f"single-flight:{key}"
+        self.token = uuid.uuid4().hex
+        self.flight = None
+        self.is_leader = False
+        self.holds_lock = False
+
+    def join(self) -> bool:
+        """Returns True if this request should compute the response, otherwise False if another request in this
+        process already is"""
+        with _flights_lock:
+            self.flight = _flights.get(self.key)
+            if self.flight is None:
+                self.flight = _flights[self.key] = _Flight()
+                self.is_leader = True
+        return self.is_leader
+
+    def wait_for_flight(self) -> Optional[CachedPayload]:
+        self.flight.done.wait(settings.SINGLE_FLIGHT_WAIT_SECONDS)
+        return self.flight.payload
+
+    def acquire_lock(self) -> bool:
+        """Returns True if no other process is computing the response"""
+        try:
+            self.holds_lock = self.cache.add(self.lock_key, self.token, settings.SINGLE_FLIGHT_LOCK_TIMEOUT)
+        except Exception:
+            logger.exception(f"Problem while taking single flight lock [{self.lock_key}], continuing without it")
+            return True
+        return self.holds_lock
+
+    def wait_for_lock(self, get_payload) -> Optional[CachedPayload]:
+        """Polls get_payload until it returns a payload, the other process releases its lock, or the wait times out"""
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            payload = get_payload()
+            if payload is not None:
+                return payload
+            try:
+                if self.cache.get(self.lock_key) is None:
+                    return get_payload()
+            except Exception:
+                return None
+        return None
+
+    def finish(self, payload: Optional[CachedPayload]) -> None:
+        """Hands the payload (None if the response was not cacheable) to waiting requests and releases the lock"""
+        if self.holds_lock:
+            try:
+                self.release_lock()
+            except Exception:
+                logger.exception(f"Problem while releasing single flight lock [{self.lock_key}]")
+        if self.is_leader:
+            self.flight.payload = payload
+            with _flights_lock:
+                _flights.pop(self.key, None)
+            self.flight.done.set()
+
+    def release_lock(self) -> None:
+        """
+        Only deletes the lock if it is still ours, in case it expired and another request took it over.  On Redis
+        (django_redis) the check and delete run as a script so the lock cannot change hands in between; other
+        backends only share the lock within this process (locmem) or not at all, so a get and delete is enough there.
+        """
+        client = getattr(self.cache, "client", None)
+        if hasattr(client, "get_client"):
+            client.get_client(write=True).eval(
+                RELEASE_LOCK_SCRIPT, 1, client.make_key(self.lock_key), client.encode(self.token)
+            )
+        elif self.cache.get(self.lock_key) == self.token:
+            self.cache.delete(self.lock_key)
+
+
+def to_cached_payload(response) -> CachedPayload:
+    """Reduces a rendered response to its compressed content, status and headers for storage"""
+    headers = [header for header in response._headers.values() if header[0].lower() not in UNCACHED_HEADERS]
+    return zlib.compress(response.content), response.status_code, headers
+
+
+def from_cached_payload(payload: Any) -> Optional[HttpResponse]:
+    """Rebuilds a response from a CachedPayload, or returns None for anything else (e.g. entries in an old format)"""
+    if not isinstance(payload, tuple) or len(payload) != 3:
+        return None
+    content, status, headers = payload
+    response = HttpResponse(content=zlib.decompress(content), status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def get_response_data(response: HttpResponse) -> Any:
+    """
+    Returns the data of a response from a cache_response view.  Cache hits are rebuilt from the rendered content and
+    have no .data, so views that call another cached view internally must read its result through this.
+    """
+    if isinstance(response, Response):
+        return response.data
+    return json.loads(response.content)
+
+
 class CustomCacheResponse(CacheResponse):
+    """
+    Caches rendered responses in the usaspending-cache as compressed bytes.  Views that return small, very frequently
+    requested payloads can pass local=True to also keep them in this process' local_response_cache for up to
+    LOCAL_RESPONSE_CACHE_TIMEOUT seconds, which bounds how long a cleared usaspending-cache can be out of step.
+
+    On a miss, identical requests are coalesced with SingleFlight so only one of them runs the view while the others
+    wait for its result.  None of this is used when the usaspending-cache is disabled.
+    """
+
+    def __init__(self, *args, local: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enabled = not isinstance(self.cache, DummyCache)
+        self.local = local and self.enabled
+
     def process_cache_response(self, view_instance, view_method, request, args, kwargs):
         if is_experimental_elasticsearch_api(request):
             # bypass cache altogether
@@ -37,50 +267,108 @@ class CustomCacheResponse(CacheResponse):
         key = self.calculate_key(
             view_instance=view_instance, view_method=view_method, request=request, args=args, kwargs=kwargs
         )
-        response = None
+        response = self.get_cached_response(key, request)
+
+        if response is None and self.enabled:
+            single_flight = SingleFlight(self.cache, key)
+            payload = None
+            try:
+                if not single_flight.join():
+                    payload = single_flight.wait_for_flight()
+                elif not single_flight.acquire_lock():
+                    payload = single_flight.wait_for_lock(lambda: self.get_cached_payload(key, request))
+                else:
+                    # The previous leader may have stored the response between our cache miss and taking the lead
+                    payload = self.get_cached_payload(key, request)
+                response = from_cached_payload(payload)
+                if response is not None:
+                    response["Cache-Trace"] = "hit-coalesced"
+                else:
+                    response = self.get_response(key, view_instance, view_method, request, args, kwargs)
+                    payload = getattr(response, "cached_payload", None)
+            finally:
+                single_flight.finish(payload)
+        elif response is None:
+            response = self.get_response(key, view_instance, view_method, request, args, kwargs)
+
+        if not hasattr(response, "_closable_objects"):
+            response._closable_objects = []
+
+        response["key"] = key
+        return response
+
+    def get_cached_payload(self, key, request) -> Optional[CachedPayload]:
+        """Looks for the key in the shared usaspending-cache, saving what it finds in the local tier"""
+        payload = None
         try:
-            response = self.cache.get(key)
+            with request_stage("cache_get"):
+                payload = self.cache.get(key)
         except Exception:
             msg = "Problem while retrieving key [{k}] from cache for path:'{p}'"
             logger.exception(msg.format(k=key, p=str(request.path)))
+        if not isinstance(payload, tuple):
+            return None
+        if self.local:
+            local_response_cache.set(key, payload, self.local_timeout)
+        return payload
 
-        if not response:
-            response = view_method(view_instance, request, *args, **kwargs)
-            response = view_instance.finalize_response(request, response, *args, **kwargs)
+    def get_cached_response(self, key, request) -> Optional[HttpResponse]:
+        if self.local:
+            with request_stage("cache_get"):
+                response = from_cached_payload(local_response_cache.get(key))
+            if response is not None:
+                response["Cache-Trace"] = "hit-local-cache"
+                return response
 
-            # While returning a Queryset is functional most of the time, it isn't
-            # fully supported by Django Rest Framework. This check was inserted
-            # in local mode to catch if a Queryset is being returned by the view
-            # which could cause an exception when setting the cache
-            if settings.IS_LOCAL and response and not response.is_rendered:
-                if contains_queryset(response.data):
-                    raise RuntimeError(
-                        "Your view is returning a QuerySet. QuerySets are not"
-                        " really designed to be pickled and can cause caching"
-                        " issues. Please materialize the QuerySet using a List"
-                        " or some other more primitive data structure."
-                    )
-
-            response["Cache-Trace"] = "no-cache"
-            response.render()  # should be rendered, before pickling while storing to cache
-
-            if not response.status_code >= 400 or self.cache_errors:
-                if self.cache_errors:
-                    logger.error(self.cache_errors)
-                try:
-                    self.cache.set(key, response, self.timeout)
-                    response["Cache-Trace"] = "set-cache"
-                except Exception:
-                    msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
-                    logger.exception(msg.format(p=str(request.path), d=str(request.data)))
-        else:
+        response = from_cached_payload(self.get_cached_payload(key, request))
+        if response is not None:
             response["Cache-Trace"] = "hit-cache"
+        return response
 
-        if not hasattr(response, "_closable_objects"):
-            response._closable_objects = []
+    def get_response(self, key, view_instance, view_method, request, args, kwargs):
+        """Runs the view and stores its rendered response in the cache.  The stored payload is kept on the response
+        as cached_payload so coalesced requests can be given it directly."""
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
 
-        response["key"] = key
+        # While returning a Queryset is functional most of the time, it isn't
+        # fully supported by Django Rest Framework. This check was inserted
+        # in local mode to catch if a Queryset is being returned by the view
+        # which could cause an exception when setting the cache
+        if settings.IS_LOCAL and response and not response.is_rendered:
+            if contains_queryset(response.data):
+                raise RuntimeError(
+                    "Your view is returning a QuerySet. QuerySets are not"
+                    " really designed to be pickled and can cause caching"
+                    " issues. Please materialize the QuerySet using a List"
+                    " or some other more primitive data structure."
+                )
+
+        response["Cache-Trace"] = "no-cache"
+        with request_stage("serialization"):
+            response.render()  # should be rendered, before storing its content in the cache
+
+        if not response.status_code >= 400 or self.cache_errors:
+            if self.cache_errors:
+                logger.error(self.cache_errors)
+            payload = to_cached_payload(response)
+            response.cached_payload = payload
+            try:
+                with request_stage("cache_set"):
+                    self.cache.set(key, payload, self.timeout)
+                response["Cache-Trace"] = "set-cache"
+            except Exception:
+                msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
+                logger.exception(msg.format(p=str(request.path), d=str(request.data)))
+            if self.local:
+                local_response_cache.set(key, payload, self.local_timeout)
         return response
 
+    @property
+    def local_timeout(self) -> int:
+        if isinstance(self.timeout, int):
+            return min(self.timeout, settings.LOCAL_RESPONSE_CACHE_TIMEOUT)
+        return settings.LOCAL_RESPONSE_CACHE_TIMEOUT
+
 
 cache_response = CustomCacheResponse
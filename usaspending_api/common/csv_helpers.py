@@ -79,6 +79,49 @@ def partition_large_delimited_file(
     return new_csv_list
 
 
+def partition_delimited_stream(
+    stream, output_path, delimiter=",", row_limit=10000, output_name_template="output_%s.csv", keep_headers=True
+):
+    """Streaming counterpart of partition_large_delimited_file for delimited text that is still being produced.
+
+    Reads rows from `stream` (any iterable of lines, e.g. a pipe from psql) and writes them to numbered partitions of
+    at most `row_limit` rows in `output_path`. Each partition is yielded as a (file path, row count) tuple as soon as
+    it is complete, so callers can start working on it while later rows are still arriving. As with
+    partition_large_delimited_file, at least one partition is always written.
+    """
+    reader = csv.reader(stream, delimiter=delimiter)
+    headers = next(reader, None) if keep_headers else None
+    partition_number = 1
+    partition_rows = 0
+    current_out_path = os.path.join(output_path, output_name_template % partition_number)
+    dest_csv = open(current_out_path, "w")
+    try:
+        current_partition_writer = csv.writer(dest_csv, delimiter=delimiter)
+        if headers is not None:
+            current_partition_writer.writerow(headers)
+
+        for row in reader:
+            if partition_rows == row_limit:  # limit reached, hand off this partition and start the next one
+                dest_csv.close()
+                yield current_out_path, partition_rows
+                partition_number += 1
+                partition_rows = 0
+                current_out_path = os.path.join(output_path, output_name_template % partition_number)
+                dest_csv = open(current_out_path, "w")
+                current_partition_writer = csv.writer(dest_csv, delimiter=delimiter)
+                if headers is not None:
+                    current_partition_writer.writerow(headers)
+
+            current_partition_writer.writerow(row)
+            partition_rows += 1
+
+        dest_csv.close()
+        yield current_out_path, partition_rows
+    finally:
+        if not dest_csv.closed:
+            dest_csv.close()
+
+
 def read_csv_file_as_list_of_dictionaries(file_path):
     """
     Read in the specified CSV file and return as a list of dictionaries ("records").
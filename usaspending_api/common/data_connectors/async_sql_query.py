@@ -1,7 +1,9 @@
+import asyncio
 import asyncpg
 import sqlparse
 
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
+from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 
 
 async def async_run_select(sql):
@@ -30,3 +32,66 @@ async def async_run_creates(sql_statements, wrapper):
             stmt = await conn.prepare(sql)
             await stmt.fetch()
         await conn.close()
+
+
+def order_dag_steps(steps):
+    """
+    Returns the steps ({"name", "sql", "depends_on"}) ordered so that every step comes after the steps it depends on.
+    Raises ValueError for duplicate names, unknown dependencies and dependency cycles.
+    """
+    steps_by_name = {}
+    for step in steps:
+        if step["name"] in steps_by_name:
+            raise ValueError(f"Duplicate step name: {step['name']}")
+        steps_by_name[step["name"]] = step
+
+    remaining = {name: set(step.get("depends_on", [])) for name, step in steps_by_name.items()}
+    for name, dependencies in remaining.items():
+        unknown = dependencies - steps_by_name.keys()
+        if unknown:
+            raise ValueError(f"Step {name} depends on unknown step(s): {', '.join(sorted(unknown))}")
+
+    ordered_steps = []
+    while remaining:
+        ready = [name for name, dependencies in remaining.items() if not dependencies]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+        for name in ready:
+            ordered_steps.append(steps_by_name[name])
+            del remaining[name]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+
+    return ordered_steps
+
+
+async def async_run_dag(steps, concurrency, run_step=None):
+    """
+    Run each step as soon as the steps it depends on have finished, with at most `concurrency` steps (and so
+    connections) running at once. The first failure cancels every step that has not finished yet and is re-raised.
+
+    run_step is awaited with the step and defaults to running its SQL with async_run_creates.
+    """
+    if run_step is None:
+        run_step = _run_sql_step
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = {}
+
+    async def run(step):
+        await asyncio.gather(*[tasks[name] for name in step.get("depends_on", [])])
+        async with semaphore:
+            return await run_step(step)
+
+    for step in order_dag_steps(steps):
+        tasks[step["name"]] = asyncio.ensure_future(run(step))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+async def _run_sql_step(step):
+    await async_run_creates(step["sql"], wrapper=Timer(step["name"]))
@@ -0,0 +1,144 @@
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Generator, List, Optional, Union
+
+from django.conf import settings
+from elasticsearch import ConnectionError, TransportError
+from elasticsearch_dsl import A
+
+from usaspending_api.common.elasticsearch.search_wrappers import AccountSearch, AwardSearch, TransactionSearch
+
+logger = logging.getLogger("console")
+
+SearchType = Union[AccountSearch, AwardSearch, TransactionSearch]
+
+
+def get_num_partitions(total: int, size: int, max_results: Optional[int] = None) -> int:
+    """
+    Returns the number of partitions of SIZE needed to cover TOTAL results, capped so that no more than MAX_RESULTS
+    are requested when a maximum is given.
+    """
+    num_partitions = max(1, (total // size) + 1)
+    if max_results is not None:
+        num_partitions = min(num_partitions, max(1, max_results // size))
+    return num_partitions
+
+
+def _is_retryable(error: TransportError) -> bool:
+    """
+    Connection problems, timeouts, throttling (429), and server errors may go away on their own; anything else (a
+    malformed query, a missing index, etc.) will fail the same way every time.
+    """
+    if isinstance(error, ConnectionError):  # ConnectionTimeout is a ConnectionError
+        return True
+    return isinstance(error.status_code, int) and (error.status_code == 429 or error.status_code >= 500)
+
+
+def _with_retries(func: Callable, retries: int, description: str):
+    """
+    Runs FUNC up to RETRIES times, backing off between attempts. A None result is treated as a failed attempt since
+    that is how the search wrappers report an unreachable cluster. Errors that retrying cannot fix are raised at once.
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            result = func()
+            if result is not None:
+                return result
+            error = Exception(f"Unable to reach cluster for {description}")
+        except TransportError as e:
+            if not _is_retryable(e):
+                raise
+            error = e
+        if attempt < retries:
+            logger.warning(f"Attempt {attempt} of {retries} failed for {description}: {error}")
+            time.sleep(min(2**attempt, 30))
+    raise error
+
+
+def _run_concurrently(
+    tasks: List[Callable[[], List]], concurrency: Optional[int], retries: int, description: str
+) -> Generator[List, None, None]:
+    """
+    Runs each task (with its own retries) on a bounded thread pool and yields their results in the order they
+    complete. Tasks that have not started are cancelled if the caller stops iterating or a task fails.
+    """
+    concurrency = concurrency or settings.ES_DOWNLOAD_PARTITION_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(tasks)))) as pool:
+        futures = [
+            pool.submit(_with_retries, task, retries, f"{description} {index + 1} of {len(tasks)}")
+            for index, task in enumerate(tasks)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def partitioned_terms_scan(
+    search: SearchType,
+    field: str,
+    num_partitions: int,
+    size: int,
+    concurrency: Optional[int] = None,
+    retries: int = 10,
+) -> Generator[List, None, None]:
+    """
+    Splits the unique values of FIELD matched by SEARCH into NUM_PARTITIONS terms aggregation partitions of up to SIZE
+    values each. Partitions are requested with bounded concurrency and a list of values is yielded per partition as
+    each completes, so values are not in any particular order.
+    """
+
+    def get_partition(partition: int) -> Callable[[], List]:
+        def execute():
+            # Setting the shard_size works because we are aggregating on a unique field. Otherwise, this would not
+            # work due to the number of records.
+            aggregation = A(
+                "terms",
+                field=field,
+                include={"partition": partition, "num_partitions": num_partitions},
+                size=size,
+                shard_size=size,
+            )
+            partition_search = search.extra(size=0)
+            partition_search.aggs.bucket("results", aggregation)
+            response = partition_search.handle_execute(retries=1)
+            if response is None:
+                return None
+            return [bucket["key"] for bucket in response.to_dict()["aggregations"]["results"]["buckets"]]
+
+        return execute
+
+    tasks = [get_partition(partition) for partition in range(num_partitions)]
+    yield from _run_concurrently(tasks, concurrency, retries, f"terms partition of {field}")
+
+
+def sliced_scroll_scan(
+    search: SearchType,
+    field: str,
+    num_slices: int,
+    concurrency: Optional[int] = None,
+    retries: int = 10,
+) -> Generator[List, None, None]:
+    """
+    Reads FIELD from every document matched by SEARCH using NUM_SLICES sliced scrolls. This avoids the per-partition
+    aggregation cost of partitioned_terms_scan when the field is unique per document, and is not subject to the
+    terms partition size limit. A list of values is yielded per slice as each completes.
+
+    A slice is retried from its start when it fails, so it is read into memory before it is yielded.
+    """
+
+    def get_slice(slice_id: int) -> Callable[[], List]:
+        def execute():
+            slice_search = search.source([field])
+            if num_slices > 1:
+                slice_search = slice_search.extra(slice={"id": slice_id, "max": num_slices})
+            return [hit[field] for hit in slice_search.scan()]
+
+        return execute
+
+    tasks = [get_slice(slice_id) for slice_id in range(num_slices)]
+    yield from _run_concurrently(tasks, concurrency, retries, f"scroll slice of {field}")
@@ -11,6 +11,7 @@ from elasticsearch import ConnectionError, Elasticsearch
 from elasticsearch import ConnectionTimeout
 from elasticsearch import NotFoundError
 from elasticsearch import TransportError
+from usaspending_api.common.helpers.timing_helpers import request_stage
 
 logger = logging.getLogger("console")
 
@@ -47,10 +48,12 @@ class _Search(Search):
             logger.error("Error creating the elasticsearch client: {}".format(e))
 
     def _execute(self, timeout: str):
-        return self.params(timeout=timeout).execute()
+        with request_stage("es"):
+            return self.params(timeout=timeout).execute()
 
     def _count(self, timeout: str):
-        return self.count()
+        with request_stage("es"):
+            return self.count()
 
     def _handle_retry(self, func: Callable, retries: int, timeout: str) -> Optional[Union[Response, int]]:
         if retries > 20:
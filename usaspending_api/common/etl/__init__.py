@@ -1,3 +1,4 @@
+from usaspending_api.common.etl.etl_checkpoint import ETLCheckpoint
 from usaspending_api.common.etl.etl_dblink_table import ETLDBLinkTable
 from usaspending_api.common.etl.etl_object_base import ETLObjectBase
 from usaspending_api.common.etl.etl_writable_object_base import ETLWritableObjectBase
@@ -8,6 +9,7 @@ from usaspending_api.common.etl.etl_temporary_table import ETLTemporaryTable
 
 
 __all__ = [
+    "ETLCheckpoint",
     "ETLDBLinkTable",
     "ETLObjectBase",
     "ETLQuery",
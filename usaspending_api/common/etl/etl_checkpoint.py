@@ -0,0 +1,45 @@
+import json
+
+from pathlib import Path
+from typing import Optional, Union
+
+
+class ETLCheckpoint:
+    """
+    Remembers how far chunked ETL operations got so that an interrupted sync can pick up where it left off.
+    Progress is kept in a small JSON file keyed by operation, so one checkpoint can be shared by all of the
+    operations of a sync.  Since chunks are committed before their progress is recorded, a resumed operation
+    may redo at most one chunk, which is harmless because all of the chunked operations are idempotent.
+    """
+
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        self.file_path = Path(file_path)
+
+    def get(self, name: str) -> Optional[int]:
+        """ Returns the key value the named operation should resume from or None if it has not started. """
+        return self._read().get(name)
+
+    def set(self, name: str, value: int) -> None:
+        progress = self._read()
+        progress[name] = value
+        self._write(progress)
+
+    def clear(self, name: str) -> None:
+        """ Forget the named operation, usually because it completed. """
+        progress = self._read()
+        if progress.pop(name, None) is not None:
+            self._write(progress)
+
+    def _read(self) -> dict:
+        if not self.file_path.exists():
+            return {}
+        return json.loads(self.file_path.read_text() or "{}")
+
+    def _write(self, progress: dict) -> None:
+        # Write then rename so an interruption can't leave a half written checkpoint behind.
+        temp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        temp_path.write_text(json.dumps(progress, indent=2, sort_keys=True))
+        temp_path.replace(self.file_path)
+
+
+__all__ = ["ETLCheckpoint"]
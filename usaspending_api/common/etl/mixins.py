@@ -1,7 +1,7 @@
 from pathlib import Path
 from psycopg2.sql import Composed
 from typing import Any, Callable, Optional, Union
-from usaspending_api.common.etl import ETLObjectBase
+from usaspending_api.common.etl import ETLCheckpoint, ETLObjectBase
 from usaspending_api.common.etl.operations import delete_obsolete_rows, insert_missing_rows, update_changed_rows
 from usaspending_api.common.helpers.sql_helpers import execute_dml_sql
 from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
@@ -15,17 +15,27 @@ class ETLMixin:
     etl_rows_affected_template = "{:,} rows affected"
     etl_timer = Timer
 
-    def _delete_update_insert_rows(self, what: str, source: ETLObjectBase, destination: ETLObjectBase):
-        """ Convenience function to run delete, update, and create ETL operations. """
+    def _delete_update_insert_rows(
+        self,
+        what: str,
+        source: ETLObjectBase,
+        destination: ETLObjectBase,
+        chunk_size: Optional[int] = None,
+        checkpoint: Optional[ETLCheckpoint] = None,
+    ):
+        """
+        Convenience function to run delete, update, and create ETL operations.  chunk_size and checkpoint
+        are passed along to the operations.
+        """
         rows_affected = 0
         rows_affected += self._execute_function_and_log(
-            delete_obsolete_rows, "Delete obsolete {}".format(what), source, destination
+            delete_obsolete_rows, "Delete obsolete {}".format(what), source, destination, chunk_size, checkpoint
         )
         rows_affected += self._execute_function_and_log(
-            update_changed_rows, "Update changed {}".format(what), source, destination
+            update_changed_rows, "Update changed {}".format(what), source, destination, chunk_size, checkpoint
         )
         rows_affected += self._execute_function_and_log(
-            insert_missing_rows, "Insert missing {}".format(what), source, destination
+            insert_missing_rows, "Insert missing {}".format(what), source, destination, chunk_size, checkpoint
         )
         return rows_affected
 
@@ -1,12 +1,25 @@
 """ Functions to generate SQL for several higher level ETL operations. """
 
-
-from psycopg2.sql import SQL, Identifier
-from typing import List
-from usaspending_api.common.etl import ETLObjectBase, ETLWritableObjectBase, ETLTemporaryTable, primatives
+import logging
+
+from django.db import transaction
+from psycopg2.sql import Composable, Composed, SQL, Identifier, Literal
+from typing import Callable, List, Optional
+from usaspending_api.common.etl import (
+    ETLCheckpoint,
+    ETLObjectBase,
+    ETLWritableObjectBase,
+    ETLTemporaryTable,
+    primatives,
+)
 from usaspending_api.common.helpers import sql_helpers
 
 
+logger = logging.getLogger("script")
+
+CHUNKABLE_DATA_TYPES = ("smallint", "integer", "bigint")
+
+
 def _get_shared_columns(source_columns: List[str], destination_columns: List[str]) -> List[str]:
     """ Return the list of columns contained in both lists. """
 
@@ -40,23 +53,120 @@ def _get_settable_columns(source: ETLObjectBase, destination: ETLWritableObjectB
     return settable_columns
 
 
-def delete_obsolete_rows(source: ETLObjectBase, destination: ETLWritableObjectBase) -> int:
-    """ Delete rows from destination that do not exist in source and return the number of rows deleted. """
+def _execute_dml_sql_in_chunks(
+    operation_name: str,
+    destination: ETLWritableObjectBase,
+    make_sql: Callable[[Composable], Composed],
+    bounds_object: ETLObjectBase,
+    key_column: primatives.ColumnDefinition,
+    key_alias: Composable,
+    chunk_size: Optional[int],
+    checkpoint: Optional[ETLCheckpoint],
+) -> int:
+    """
+    Run the statement built by make_sql once per range of chunk_size key values, committing after each range,
+    instead of once for everything.  make_sql receives a conditional to AND onto the statement's where clause
+    that limits it to the current range of key_column (qualified by key_alias).  The range of key values comes
+    from bounds_object.  Rows with a null key, if any, make up the last chunk.  If a checkpoint is provided,
+    progress is recorded there after every chunk and an operation that was interrupted resumes from its last
+    uncommitted chunk.  Chunks can only be committed one at a time when there is no enclosing transaction;
+    otherwise they just become savepoints, so a checkpoint is refused there since it would record progress that
+    could still be rolled back.  Without a chunk_size, the statement is run once over everything, as usual.
+    Returns the total number of rows affected.
+    """
+    if not chunk_size:
+        return sql_helpers.execute_dml_sql(make_sql(SQL("true")))
+
+    connection = sql_helpers.get_connection(read_only=False)
+    if checkpoint and connection.in_atomic_block:
+        raise RuntimeError(
+            f"{operation_name}: a checkpoint cannot be used inside of a transaction since its chunks are not "
+            f"committed until the transaction is."
+        )
+
+    if key_column.data_type not in CHUNKABLE_DATA_TYPES:
+        raise RuntimeError(f"Chunking requires an integer key column.  {key_column.name} is {key_column.data_type}.")
+
+    key = SQL("{}.{}").format(key_alias, Identifier(key_column.name))
+    min_key, max_key = sql_helpers.execute_sql(
+        SQL("select min({key}), max({key}) from {object_representation}").format(
+            key=Identifier(key_column.name), object_representation=bounds_object.object_representation
+        ),
+        read_only=False,
+    )[0]
+
+    destination_name = sql_helpers.convert_composable_query_to_string(destination.object_representation)
+    checkpoint_name = f"{operation_name} {destination_name}"
+    resume_from = checkpoint.get(checkpoint_name) if checkpoint else None
+    if resume_from is not None:
+        logger.info(f"{operation_name}: resuming from {key_column.name} {resume_from:,}")
+
+    chunks = []
+    if min_key is not None:
+        start = min_key if resume_from is None else max(min_key, resume_from)
+        for lower in range(start, max_key + 1, chunk_size):
+            upper = lower + chunk_size
+            conditional = SQL("{key} >= {lower} and {key} < {upper}").format(
+                key=key, lower=Literal(lower), upper=Literal(upper)
+            )
+            chunks.append((conditional, upper))
+    if not key_column.not_nullable:
+        chunks.append((SQL("{key} is null").format(key=key), None))
+
+    rows_affected = 0
+    for chunk_number, (conditional, upper) in enumerate(chunks, 1):
+        with transaction.atomic(using=connection.alias):
+            rows_affected += sql_helpers.execute_dml_sql(make_sql(conditional))
+        if checkpoint and upper is not None:
+            checkpoint.set(checkpoint_name, upper)
+        logger.info(
+            f"{operation_name}: finished chunk {chunk_number:,} of {len(chunks):,}, {rows_affected:,} rows affected so far"
+        )
+
+    if checkpoint:
+        checkpoint.clear(checkpoint_name)
+
+    return rows_affected
+
+
+def delete_obsolete_rows(
+    source: ETLObjectBase,
+    destination: ETLWritableObjectBase,
+    chunk_size: Optional[int] = None,
+    checkpoint: Optional[ETLCheckpoint] = None,
+) -> int:
+    """
+    Delete rows from destination that do not exist in source and return the number of rows deleted.  See
+    _execute_dml_sql_in_chunks for chunk_size and checkpoint.
+    """
 
     sql = """
         delete from {destination_object_representation}
         where not exists (
             select from {source_object_representation} s where {join}
-        )
+        ) and ({chunk})
     """
 
-    sql = SQL(sql).format(
-        destination_object_representation=destination.object_representation,
-        source_object_representation=source.object_representation,
-        join=primatives.make_join_to_table_conditional(destination.key_columns, "s", destination.object_representation),
-    )
+    def make_sql(chunk: Composable) -> Composed:
+        return SQL(sql).format(
+            destination_object_representation=destination.object_representation,
+            source_object_representation=source.object_representation,
+            join=primatives.make_join_to_table_conditional(
+                destination.key_columns, "s", destination.object_representation
+            ),
+            chunk=chunk,
+        )
 
-    return sql_helpers.execute_dml_sql(sql)
+    return _execute_dml_sql_in_chunks(
+        "delete_obsolete_rows",
+        destination,
+        make_sql,
+        destination,
+        destination.key_columns[0],
+        destination.object_representation,
+        chunk_size,
+        checkpoint,
+    )
 
 
 def identify_new_or_updated(
@@ -91,8 +201,16 @@ def identify_new_or_updated(
     return sql_helpers.execute_dml_sql(sql)
 
 
-def insert_missing_rows(source: ETLObjectBase, destination: ETLWritableObjectBase) -> int:
-    """ Insert rows from source that do not exist in destination and return the number of rows inserted. """
+def insert_missing_rows(
+    source: ETLObjectBase,
+    destination: ETLWritableObjectBase,
+    chunk_size: Optional[int] = None,
+    checkpoint: Optional[ETLCheckpoint] = None,
+) -> int:
+    """
+    Insert rows from source that do not exist in destination and return the number of rows inserted.  See
+    _execute_dml_sql_in_chunks for chunk_size and checkpoint.
+    """
 
     # Destination columns that are in source or are overridden.
     insertable_columns = _get_shared_columns(source.columns + list(destination.insert_overrides), destination.columns)
@@ -102,19 +220,30 @@ def insert_missing_rows(source: ETLObjectBase, destination: ETLWritableObjectBas
         select      {select_columns}
         from        {source_object_representation} as s
                     left outer join {destination_object_representation} as d on {join}
-        where       {excluder}
+        where       {excluder} and ({chunk})
     """
 
-    sql = SQL(sql).format(
-        destination_object_representation=destination.object_representation,
-        insert_columns=primatives.make_column_list(insertable_columns),
-        select_columns=primatives.make_column_list(insertable_columns, "s", destination.insert_overrides),
-        source_object_representation=source.object_representation,
-        join=primatives.make_join_conditional(destination.key_columns, "d", "s"),
-        excluder=primatives.make_join_excluder_conditional(destination.key_columns, "d"),
-    )
+    def make_sql(chunk: Composable) -> Composed:
+        return SQL(sql).format(
+            destination_object_representation=destination.object_representation,
+            insert_columns=primatives.make_column_list(insertable_columns),
+            select_columns=primatives.make_column_list(insertable_columns, "s", destination.insert_overrides),
+            source_object_representation=source.object_representation,
+            join=primatives.make_join_conditional(destination.key_columns, "d", "s"),
+            excluder=primatives.make_join_excluder_conditional(destination.key_columns, "d"),
+            chunk=chunk,
+        )
 
-    return sql_helpers.execute_dml_sql(sql)
+    return _execute_dml_sql_in_chunks(
+        "insert_missing_rows",
+        destination,
+        make_sql,
+        source,
+        destination.key_columns[0],
+        Identifier("s"),
+        chunk_size,
+        checkpoint,
+    )
 
 
 def stage_table(source: ETLObjectBase, destination: ETLWritableObjectBase, staging: ETLTemporaryTable) -> int:
@@ -137,8 +266,16 @@ def stage_table(source: ETLObjectBase, destination: ETLWritableObjectBase, stagi
     return sql_helpers.execute_dml_sql(sql)
 
 
-def update_changed_rows(source: ETLObjectBase, destination: ETLWritableObjectBase) -> int:
-    """ Update rows in destination that have changed in source and return the number of rows updated. """
+def update_changed_rows(
+    source: ETLObjectBase,
+    destination: ETLWritableObjectBase,
+    chunk_size: Optional[int] = None,
+    checkpoint: Optional[ETLCheckpoint] = None,
+) -> int:
+    """
+    Update rows in destination that have changed in source and return the number of rows updated.  See
+    _execute_dml_sql_in_chunks for chunk_size and checkpoint.
+    """
 
     # Destination columns that are in source or are overridden but are not keys.
     settable_columns = _get_settable_columns(source, destination)
@@ -150,23 +287,43 @@ def update_changed_rows(source: ETLObjectBase, destination: ETLWritableObjectBas
         update      {destination_object_representation} as d
         set         {set}
         from        {source_object_representation} as s
-        where       {where} and ({detect_changes})
+        where       {where} and ({detect_changes}) and ({chunk})
     """
 
-    sql = SQL(sql).format(
-        destination_object_representation=destination.object_representation,
-        set=primatives.make_column_setter_list(settable_columns, "s", destination.update_overrides),
-        source_object_representation=source.object_representation,
-        where=primatives.make_join_conditional(destination.key_columns, "s", "d"),
-        detect_changes=primatives.make_change_detector_conditional(changeable_columns, "s", "d"),
-    )
+    def make_sql(chunk: Composable) -> Composed:
+        return SQL(sql).format(
+            destination_object_representation=destination.object_representation,
+            set=primatives.make_column_setter_list(settable_columns, "s", destination.update_overrides),
+            source_object_representation=source.object_representation,
+            where=primatives.make_join_conditional(destination.key_columns, "s", "d"),
+            detect_changes=primatives.make_change_detector_conditional(changeable_columns, "s", "d"),
+            chunk=chunk,
+        )
 
-    return sql_helpers.execute_dml_sql(sql)
+    return _execute_dml_sql_in_chunks(
+        "update_changed_rows",
+        destination,
+        make_sql,
+        source,
+        destination.key_columns[0],
+        Identifier("s"),
+        chunk_size,
+        checkpoint,
+    )
 
 
 def upsert_records_with_predicate(
-    source: ETLObjectBase, destination: ETLWritableObjectBase, predicate: list, primary_key: str
+    source: ETLObjectBase,
+    destination: ETLWritableObjectBase,
+    predicate: list,
+    primary_key: str,
+    chunk_size: Optional[int] = None,
+    checkpoint: Optional[ETLCheckpoint] = None,
 ) -> int:
+    """
+    Insert or update the rows of source matching predicate in destination and return the number of rows
+    affected.  See _execute_dml_sql_in_chunks for chunk_size and checkpoint.
+    """
     # Destination columns that are in source or are overridden.
     insertable_columns = _get_shared_columns(source.columns + list(destination.insert_overrides), destination.columns)
 
@@ -181,23 +338,44 @@ def upsert_records_with_predicate(
         INSERT INTO {destination_object_representation} ({insert_columns})
         SELECT      {select_columns}
         FROM        {source_object} AS {alias}
+        WHERE       {chunk}
         ON CONFLICT ({primary_key}) DO UPDATE SET
         {excluded}
         RETURNING {primary_key}
     """
     alias = "s"
 
-    sql = SQL(upsert_sql_template).format(
-        primary_key=Identifier(primary_key),
-        alias=Identifier(alias),
-        destination_object_representation=destination.object_representation,
-        insert_columns=primatives.make_column_list(insertable_columns),
-        select_columns=primatives.make_column_list(insertable_columns, alias, destination.insert_overrides),
-        source_object=source.object_representation_custom_predicate(predicate),
-        excluded=excluded,
+    source_object = source.object_representation_custom_predicate(predicate)
+
+    def make_sql(chunk: Composable) -> Composed:
+        return SQL(upsert_sql_template).format(
+            primary_key=Identifier(primary_key),
+            alias=Identifier(alias),
+            destination_object_representation=destination.object_representation,
+            insert_columns=primatives.make_column_list(insertable_columns),
+            select_columns=primatives.make_column_list(insertable_columns, alias, destination.insert_overrides),
+            source_object=source_object,
+            excluded=excluded,
+            chunk=chunk,
+        )
+
+    return _execute_dml_sql_in_chunks(
+        "upsert_records_with_predicate",
+        destination,
+        make_sql,
+        _SourceWithPredicate(source_object),
+        destination.data_types[primary_key],
+        Identifier(alias),
+        chunk_size,
+        checkpoint,
     )
 
-    return sql_helpers.execute_dml_sql(sql)
+
+class _SourceWithPredicate:
+    """ Stands in for the source of an upsert when determining the range of keys to chunk over. """
+
+    def __init__(self, object_representation: Composed) -> None:
+        self.object_representation = SQL("{} as t").format(object_representation)
 
 
 __all__ = [
@@ -2,6 +2,7 @@ import boto3
 import io
 import logging
 import math
+import threading
 
 from boto3.s3.transfer import TransferConfig, S3Transfer
 from django.conf import settings
@@ -56,3 +57,110 @@ def multipart_upload(bucketname, regionname, source_path, keyname):
     config = TransferConfig(multipart_chunksize=bytes_per_chunk)
     transfer = S3Transfer(s3client, config)
     transfer.upload_file(source_path, bucketname, Path(keyname).name, extra_args={"ACL": "bucket-owner-full-control"})
+
+
+class StreamingMultipartUpload:
+    """
+    Multipart upload of a file that is still being written. Call `notify` whenever the first N bytes of the file can
+    no longer change; a background thread uploads every complete part within those bytes while the writer carries on.
+    `complete` then uploads whatever is left as the final part. Use as a context manager to abort the upload (and
+    discard the parts already sent) if anything goes wrong before it is completed.
+    """
+
+    # S3 requires every part but the last to be at least 5MB and allows at most 10,000 parts
+    MIN_PART_SIZE = 5242880
+
+    def __init__(self, bucket_name, region_name, source_path, key_name, part_size=None, endpoint_url=None):
+        self.bucket_name = bucket_name
+        self.key_name = Path(key_name).name
+        self.source_path = source_path
+        self.part_size = max(part_size or settings.BULK_DOWNLOAD_S3_STREAMING_PART_SIZE, self.MIN_PART_SIZE)
+        self.client = boto3.client("s3", region_name=region_name, endpoint_url=endpoint_url)
+        self.upload_id = None
+        self.parts = []
+        self.uploaded_bytes = 0
+        self._finalized_bytes = 0
+        self._finished = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._upload_parts_as_they_are_finalized, daemon=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def start(self):
+        self.upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.key_name, ACL="bucket-owner-full-control"
+        )["UploadId"]
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+
+    def notify(self, finalized_bytes):
+        """Let the uploader know that the first `finalized_bytes` bytes of the file are final"""
+        with self._condition:
+            self._finalized_bytes = max(self._finalized_bytes, finalized_bytes)
+            self._condition.notify()
+
+    def complete(self):
+        """Upload the rest of the file and complete the upload. The file must not change after this is called."""
+        with self._condition:
+            self._finished = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+        with open(self.source_path, "rb") as source:
+            source.seek(self.uploaded_bytes)
+            remainder = source.read()
+        if remainder or not self.parts:
+            self._upload_part(remainder)
+
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.key_name,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        self.upload_id = None
+        logger.info(f"Uploaded {self.uploaded_bytes:,} bytes to s3://{self.bucket_name}/{self.key_name}")
+
+    def abort(self):
+        """Stop uploading and discard the parts sent so far; does nothing once the upload has been completed"""
+        with self._condition:
+            self._finished = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.upload_id:
+            self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.key_name, UploadId=self.upload_id)
+            self.upload_id = None
+
+    def _upload_parts_as_they_are_finalized(self):
+        try:
+            while True:
+                with self._condition:
+                    while not self._finished and self._finalized_bytes - self.uploaded_bytes < self.part_size:
+                        self._condition.wait()
+                    if self._finalized_bytes - self.uploaded_bytes < self.part_size:
+                        return
+                # The file is only opened once part of it is final since it may not exist yet when the upload starts
+                with open(self.source_path, "rb") as source:
+                    source.seek(self.uploaded_bytes)
+                    body = source.read(self.part_size)
+                self._upload_part(body)
+        except Exception as e:
+            logger.exception("Streaming multipart upload failed")
+            self._error = e
+
+    def _upload_part(self, body):
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket_name, Key=self.key_name, UploadId=self.upload_id, PartNumber=part_number, Body=body
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.uploaded_bytes += len(body)
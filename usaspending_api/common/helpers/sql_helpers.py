@@ -284,7 +284,8 @@ def get_connection(model=Award, read_only=True):
     databases using usaspending_api.routers.replicas.ReadReplicaRouter.  Django
     will not take advantage of this router when executing raw SQL against a
     connection.  This function will help with that by using the database router
-    to choose an appropriate connection.
+    to choose an appropriate connection, so raw SQL reads get the same replica
+    health and load balancing as ORM reads.
 
     Both db_for_read and db_for_write need a model to help them decide which
     database connection to choose.  My advice is to supply the model associated
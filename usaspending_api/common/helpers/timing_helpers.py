@@ -1,6 +1,7 @@
 import contextlib
 import logging
 import math
+import threading
 import time
 
 from datetime import timedelta
@@ -186,3 +187,75 @@ class ScriptTimer(Timer):
     def __init__(self, message=None):
         logger = logging.getLogger("script")
         super().__init__(message=message, success_logger=logger.info, failure_logger=logger.error)
+
+
+_request_timings = threading.local()
+
+
+class RequestTimings:
+    """
+    Wall time and number of calls spent in each backend stage ("db", "es", "validation", ...) of the request being
+    handled on this thread.  Work handed off to other threads is not included.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, seconds):
+        total, count = self.stages.get(stage, (0.0, 0))
+        self.stages[stage] = (total + seconds, count + 1)
+
+    def as_server_timing(self, total_ms=None):
+        """Formats the stages as a Server-Timing header value, with the number of calls as each description"""
+        metrics = [f'{stage};dur={total * 1000:.1f};desc="{count}"' for stage, (total, count) in self.stages.items()]
+        if total_ms is not None:
+            metrics.append(f"total;dur={total_ms}")
+        return ", ".join(metrics)
+
+    def as_log_fields(self):
+        fields = {}
+        for stage, (total, count) in self.stages.items():
+            fields[f"{stage}_ms"] = int(total * 1000)
+            fields[f"{stage}_count"] = count
+        return fields
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    return getattr(_request_timings, "timings", None)
+
+
+@contextlib.contextmanager
+def record_request_timings():
+    """Collects the request_stage timings of everything run on this thread until the context exits"""
+    previous = current_request_timings()
+    _request_timings.timings = RequestTimings()
+    try:
+        yield _request_timings.timings
+    finally:
+        _request_timings.timings = previous
+
+
+@contextlib.contextmanager
+def request_stage(stage):
+    """
+    Adds the time spent in the block to STAGE of the request currently being recorded.  Does nothing outside of
+    record_request_timings so it is safe to use in code shared with scripts and loaders.
+
+        with request_stage("es"):
+            response = search.execute()
+    """
+    timings = current_request_timings()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, time.perf_counter() - start)
+
+
+def time_database_query(execute, sql, params, many, context):
+    """Django connection.execute_wrapper that records every query under the "db" request stage"""
+    with request_stage("db"):
+        return execute(sql, params, many, context)
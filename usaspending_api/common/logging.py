@@ -1,9 +1,16 @@
+from contextlib import ExitStack
+from django.db import connections
 from django.utils.timezone import now
 from django.utils.deprecation import MiddlewareMixin
 
 import logging
 import traceback
 from time import perf_counter  # Matches response time browsers return more accurately than now()
+from usaspending_api.common.helpers.timing_helpers import (
+    current_request_timings,
+    record_request_timings,
+    time_database_query,
+)
 
 
 def get_remote_addr(request):
@@ -24,9 +31,14 @@ class LoggingMiddleware(MiddlewareMixin):
     automatically when the following happens:
 
     process_request(): Django calls this when a view is requested.
+    process_template_response(): Django calls this before rendering a view's (DRF) response.
     process_response(): Django calls this when a view returns a response.
     process_exception(): Django calls this when a view raises an exception.
 
+    The whole request is run inside record_request_timings with every database query timed, so the time spent in
+    each backend stage (db, es, validation, serialization, cache_get, cache_set) is returned in a Server-Timing
+    header and logged in the "timings" field.
+
     Desired format laid out in settings.py : {
       "timestamp": "11/01/18 22:52:03", (When the request was made)
       "status": "INFO", (Level name of log)
@@ -36,6 +48,7 @@ class LoggingMiddleware(MiddlewareMixin):
       "remote_addr": "127.0.0.1", (IP address where request came from)
       "host": "localhost:8000", (Host name or IP address)
       "response_ms": "848", (Time it took to return a response or exception)
+      "timings": {"db_ms": 512, "db_count": 3, ...}, (Time and number of calls per backend stage)
       "message": "[11/01/18 22:52:03] [INFO] [POST] [/api/v2/download/count/ : 200]
                     [127.0.0.1] [localhost:8000] [848]",
       (message is [timestamp] [status] [method] [ path : status_code] [remote_addr] [host] [response_ms]
@@ -56,6 +69,12 @@ class LoggingMiddleware(MiddlewareMixin):
     start = None
     log = None
 
+    def __call__(self, request):
+        with record_request_timings(), ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(time_database_query))
+            return super().__call__(request)
+
     def process_request(self, request):
         """Func called when a request is called on server, function stores request fields for logging"""
         self.start = perf_counter()
@@ -74,6 +93,14 @@ class LoggingMiddleware(MiddlewareMixin):
         except UnicodeDecodeError:
             self.log["request"] = getattr(request, "_body", request.body)
 
+    def process_template_response(self, request, response):
+        """Func called before a response is rendered, used to time serialization of the response data"""
+        timings = current_request_timings()
+        if timings is not None:
+            start = perf_counter()
+            response.add_post_render_callback(lambda rendered: timings.add("serialization", perf_counter() - start))
+        return response
+
     def process_response(self, request, response):
         """
         Func gets called before response is returned from server, stores response fields and logs
@@ -85,6 +112,7 @@ class LoggingMiddleware(MiddlewareMixin):
         self.log["status_code"] = status_code
         self.log["response_ms"] = self.get_response_ms()
         self.log["traceback"] = None
+        self.add_timings(response)
         if response._headers:
             if "key" in response._headers and len(response._headers["key"]) >= 2:
                 self.log["cache_key"] = response._headers["key"][1]
@@ -136,9 +164,19 @@ class LoggingMiddleware(MiddlewareMixin):
         self.log["status"] = "ERROR"
         self.log["timestamp"] = now().strftime("%d/%m/%y %H:%M:%S")
         self.log["traceback"] = traceback.format_exc()
+        self.add_timings()
 
         self.server_logger.error("%s", self.get_message_string(), extra=self.log)
 
+    def add_timings(self, response=None):
+        """Adds the time spent in each backend stage to the log and, when given, the response's Server-Timing header"""
+        timings = current_request_timings()
+        if timings is None:
+            return
+        self.log["timings"] = timings.as_log_fields()
+        if response is not None:
+            response["Server-Timing"] = timings.as_server_timing(self.log["response_ms"])
+
     def get_response_ms(self):
         """Returns time elapsed from request to response/exception"""
         duration = perf_counter() - self.start
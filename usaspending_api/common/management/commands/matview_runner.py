@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 import psycopg2
 import subprocess
@@ -7,7 +8,8 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from pathlib import Path
 
-from usaspending_api.common.data_connectors.async_sql_query import async_run_creates
+from usaspending_api.common.cache import bump_data_version
+from usaspending_api.common.data_connectors.async_sql_query import async_run_dag
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.common.matview_manager import (
     CHUNKED_MATERIALIZED_VIEWS,
@@ -24,6 +26,15 @@ from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 
 logger = logging.getLogger("script")
 
+# award_search_refresh_ids is the name the generated <matview>__incremental.sql files read the queued awards from.
+# Only the queue rows this statement removes are refreshed, so rows a loader commits after it started stay queued.
+DEQUEUE_REFRESH_IDS_SQL = """
+CREATE TEMPORARY TABLE award_search_refresh_ids (award_id BIGINT) ON COMMIT DROP;
+WITH dequeued AS (DELETE FROM award_search_refresh_queue RETURNING award_id)
+INSERT INTO award_search_refresh_ids SELECT DISTINCT award_id FROM dequeued;
+ANALYZE award_search_refresh_ids;
+"""
+
 
 class Command(BaseCommand):
 
@@ -45,13 +56,22 @@ class Command(BaseCommand):
         self.chunk_count = args["chunk_count"]
         self.include_chunked_matviews = args["include_chunked_matviews"]
         self.index_concurrency = args["index_concurrency"]
+        self.incremental = args["incremental"]
+        self.incremental_matviews = [matview for matview, config in self.matviews.items() if config.get("incremental")]
 
     def add_arguments(self, parser):
-        parser.add_argument(
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument(
             "--only",
             choices=list(MATERIALIZED_VIEWS.keys()) + ["none"],
             help="If matviews are listed with this option, only those matviews will be run. 'none' will result in no matviews being run",
         )
+        scope.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Instead of rebuilding anything, re-derive the awards queued by the transaction loaders in the award "
+            "search tables. Other matviews are left alone. Use a full run after changing a matview definition.",
+        )
         parser.add_argument(
             "--leave-sql",
             action="store_true",
@@ -85,7 +105,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Chunked Transaction Search matviews will be refreshed and inserted into table",
         )
-        parser.add_argument("--index-concurrency", default=20, help="Number of indexes to be created at once", type=int)
+        parser.add_argument(
+            "--index-concurrency",
+            default=20,
+            help="Number of connections used at once to build the matviews, their indexes and statistics",
+            type=int,
+        )
 
     def handle(self, *args, **options):
         """Overloaded Command Entrypoint"""
@@ -94,7 +119,10 @@ class Command(BaseCommand):
             self.generate_matview_sql()
             if self.run_dependencies:
                 create_dependencies()
-            self.create_views()
+            if self.incremental:
+                self.refresh_incrementally()
+            else:
+                self.create_views()
             if not self.no_cleanup:
                 self.cleanup()
 
@@ -112,7 +140,7 @@ class Command(BaseCommand):
 
         # IF using this for operations, DO NOT LEAVE hardcoded `python3` in the command
         # Create main list of Matview SQL files
-        exec_str = f"python3 {MATVIEW_GENERATOR_FILE} --quiet --dest={self.matview_dir}/ --batch_indexes=3"
+        exec_str = f"python3 {MATVIEW_GENERATOR_FILE} --quiet --dest={self.matview_dir}/"
         subprocess.call(exec_str, shell=True)
 
         if self.include_chunked_matviews:
@@ -131,31 +159,57 @@ class Command(BaseCommand):
         recursive_delete(self.matview_dir)
         recursive_delete(self.matview_chunked_dir)
 
+    def refresh_incrementally(self):
+        """Replace the rows of the queued awards in each award search table in one transaction"""
+        with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
+            with connection.cursor() as cursor:
+                award_count = refresh_award_search_incrementally(cursor, self.matview_dir, self.incremental_matviews)
+        if award_count:
+            logger.info(f"Refreshed {award_count:,} queued awards in the award search tables")
+            bump_data_version("awards")
+        else:
+            logger.info("No awards are queued for the award search tables")
+
     def create_views(self):
-        loop = asyncio.new_event_loop()
-        tasks = []
+        # Rebuilding every award search table covers the awards queued before the rebuild started
+        queued_refreshes = None
+        if self.matviews is MATERIALIZED_VIEWS:
+            with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
+                with connection.cursor() as cursor:
+                    queued_refreshes = get_queued_award_refreshes(cursor)
 
-        # Create Matviews
-        for matview, config in self.matviews.items():
-            logger.info(f"Creating Future for matview {matview}")
-            sql = (self.matview_dir / config["sql_filename"]).read_text()
-            tasks.append(asyncio.ensure_future(async_run_creates(sql, wrapper=Timer(matview)), loop=loop))
+        steps = []
+
+        # Each matview is built from the steps in its plan: the matview itself, then every index and the extended
+        # statistics, then ANALYZE and finally the renames. All of them go into one graph so that the indexes of
+        # every matview share the same pool of connections.
+        for matview in self.matviews:
+            logger.info(f"Adding build steps for matview {matview}")
+            steps.extend(json.loads((self.matview_dir / "componentized" / f"{matview}__plan.json").read_text()))
 
         # Create Chunked Matviews
         if self.include_chunked_matviews:
             for matview, config in self.chunked_matviews.items():
                 for current_chunk in range(self.chunk_count):
                     chunked_matview = f"{matview}_{current_chunk}"
-                    logger.info(f"Creating Future for chunked matview {chunked_matview}")
+                    logger.info(f"Adding build step for chunked matview {chunked_matview}")
                     sql = (self.matview_chunked_dir / f"{chunked_matview}.sql").read_text()
-                    tasks.append(
-                        asyncio.ensure_future(async_run_creates(sql, wrapper=Timer(chunked_matview)), loop=loop)
-                    )
+                    steps.append({"name": chunked_matview, "sql": sql, "depends_on": []})
 
-        if len(tasks) > 0:
-            loop.run_until_complete(asyncio.gather(*tasks))
+        if len(steps) > 0:
+            loop = asyncio.new_event_loop()
+            try:
+                with Timer(f"Running {len(steps)} build steps over {self.index_concurrency} connections"):
+                    loop.run_until_complete(async_run_dag(steps, self.index_concurrency))
+            finally:
+                loop.close()
 
-        loop.close()
+        if queued_refreshes:
+            # Only the rows committed before the rebuild started are covered by it; later ones stay queued
+            with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
+                with connection.cursor() as cursor:
+                    with Timer("Clearing award refresh queue"):
+                        cursor.execute("DELETE FROM award_search_refresh_queue WHERE id = ANY(%s)", [queued_refreshes])
 
         if "transaction_search" in self.chunked_matviews and self.include_chunked_matviews:
             logger.info("Inserting data from transaction_search chunks into transaction_search table.")
@@ -172,6 +226,30 @@ class Command(BaseCommand):
         if self.remove_matviews:
             run_sql(DROP_OLD_MATVIEWS.read_text(), "Drop Old Materialized Views")
 
+        # Responses cached while the loaders ran were built from the matviews as they were before this rebuild
+        bump_data_version("awards")
+
+
+def get_queued_award_refreshes(cursor):
+    cursor.execute("SELECT id FROM award_search_refresh_queue")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def refresh_award_search_incrementally(cursor, matview_dir, matviews):
+    """
+    Dequeue the queued awards and re-derive them in each of the given award search tables from their generated
+    <matview>__incremental.sql.  The caller's transaction must cover the whole refresh; returns the number of awards.
+    """
+    cursor.execute(DEQUEUE_REFRESH_IDS_SQL)
+    cursor.execute("SELECT COUNT(*) FROM award_search_refresh_ids")
+    award_count = cursor.fetchone()[0]
+    if award_count:
+        for matview in matviews:
+            sql = (Path(matview_dir) / "componentized" / f"{matview}__incremental.sql").read_text()
+            with Timer(f"Incremental refresh of {matview}"):
+                cursor.execute(sql)
+    return award_count
+
 
 def create_dependencies():
     run_sql(DEPENDENCY_FILEPATH.read_text(), "dependencies")
@@ -35,6 +35,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.ContractAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_contract_award_search.json"),
                 "sql_filename": "mv_contract_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -51,6 +52,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.DirectPaymentAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_directpayment_award_search.json"),
                 "sql_filename": "mv_directpayment_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -59,6 +61,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.GrantAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_grant_award_search.json"),
                 "sql_filename": "mv_grant_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -67,6 +70,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.IDVAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_idv_award_search.json"),
                 "sql_filename": "mv_idv_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -75,6 +79,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.LoanAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_loan_award_search.json"),
                 "sql_filename": "mv_loan_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -83,6 +88,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.OtherAwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_other_award_search.json"),
                 "sql_filename": "mv_other_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -91,6 +97,7 @@ MATERIALIZED_VIEWS = OrderedDict(
                 "model": mv.Pre2008AwardSearchMatview,
                 "json_filepath": str(JSON_DIR / "mv_pre2008_award_search.json"),
                 "sql_filename": "mv_pre2008_award_search.sql",
+                "incremental": True,
             },
         ),
         (
@@ -0,0 +1,38 @@
+import pytest
+import subprocess
+
+from datetime import datetime, timezone
+from django.db import connection
+from model_mommy import mommy
+
+from usaspending_api.common.management.commands.matview_runner import refresh_award_search_incrementally
+from usaspending_api.common.matview_manager import MATVIEW_GENERATOR_FILE
+from usaspending_api.search.models import AwardSearchRefreshQueue
+
+
+@pytest.mark.django_db
+def test_refresh_award_search_incrementally(tmp_path):
+    subprocess.call(f"python3 {MATVIEW_GENERATOR_FILE} --quiet --dest={tmp_path}/", shell=True)
+
+    mommy.make("awards.Award", id=1, type="A", latest_transaction_id=1, generated_unique_award_id="CONT_AWD_1")
+    mommy.make("awards.TransactionNormalized", id=1, action_date="2010-10-01", award_id=1, is_fpds=True)
+    mommy.make("awards.TransactionFPDS", transaction_id=1)
+    now = datetime.now(timezone.utc)
+    mommy.make(AwardSearchRefreshQueue, award_id=1, queued_at=now)
+    mommy.make(AwardSearchRefreshQueue, award_id=1, queued_at=now)
+    mommy.make(AwardSearchRefreshQueue, award_id=2, queued_at=now)
+
+    with connection.cursor() as cursor:
+        # Tests create the award search tables as views, so swap in a table like the one matview_runner maintains
+        cursor.execute("ALTER VIEW mv_contract_award_search RENAME TO mv_contract_award_search_view")
+        cursor.execute("CREATE TABLE mv_contract_award_search AS SELECT * FROM mv_contract_award_search_view")
+        # A stale row for award 2, which has since been deleted, and no row yet for award 1
+        cursor.execute("UPDATE mv_contract_award_search SET award_id = 2")
+
+        award_count = refresh_award_search_incrementally(cursor, tmp_path, ["mv_contract_award_search"])
+
+        cursor.execute("SELECT award_id, generated_unique_award_id FROM mv_contract_award_search")
+        assert cursor.fetchall() == [(1, "CONT_AWD_1")]
+
+    assert award_count == 2
+    assert not AwardSearchRefreshQueue.objects.exists()
@@ -4,6 +4,7 @@ from collections import OrderedDict
 from pathlib import Path
 from psycopg2.sql import Identifier, Literal, SQL
 from usaspending_api.common.etl import (
+    ETLCheckpoint,
     ETLDBLinkTable,
     ETLTable,
     ETLTemporaryTable,
@@ -216,9 +217,7 @@ def test_etl_query_file(make_a_table, temp_file_path):
     )
 
 
-@pytest.fixture
-@pytest.mark.django_db
-def operations_fixture():
+def _create_operations_tables():
     with get_connection(read_only=False).cursor() as cursor:
         cursor.execute(
             """
@@ -249,6 +248,20 @@ def operations_fixture():
         )
 
 
+@pytest.fixture
+@pytest.mark.django_db
+def operations_fixture():
+    _create_operations_tables()
+
+
+@pytest.fixture
+def committed_operations_fixture(transactional_db):
+    """ For checkpointed operations, which refuse to run inside of the transaction django_db wraps tests in. """
+    _create_operations_tables()
+    yield
+    execute_sql("drop table if exists t1, t2", read_only=False)
+
+
 @pytest.mark.django_db
 def test_delete_obsolete_rows(operations_fixture):
     assert execute_sql("select id1, id2 from t2 order by id1") == [(1, 2), (4, 5), (9, 9)]
@@ -306,3 +319,53 @@ def test_introspection(operations_fixture):
     expected = ["id1", "id2"]
     assert introspection.get_primary_key_columns("t1") == expected
     assert introspection.get_primary_key_columns("t1", "public") == expected
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chunked_operations(committed_operations_fixture, tmp_path):
+    checkpoint = ETLCheckpoint(tmp_path / "checkpoint.json")
+
+    operations.delete_obsolete_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=2, checkpoint=checkpoint)
+    assert execute_sql("select id1, id2 from t2 order by id1") == [(1, 2), (4, 5)]
+
+    operations.update_changed_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=2, checkpoint=checkpoint)
+    operations.insert_missing_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=2, checkpoint=checkpoint)
+    assert execute_sql("select id1, id2, name, description from t2 order by id1") == [
+        (1, 2, "three", "four"),
+        (4, 5, "six", "seven"),
+        (8, 8, "eight", "eight"),
+    ]
+
+    # Completed operations don't leave anything behind to resume from.
+    assert checkpoint._read() == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chunked_operation_resumes_from_checkpoint(committed_operations_fixture, tmp_path):
+    checkpoint = ETLCheckpoint(tmp_path / "checkpoint.json")
+
+    # Pretend an earlier run made it through every id1 below 5 before being interrupted.
+    checkpoint.set('insert_missing_rows "public"."t2"', 5)
+    execute_sql("insert into t1 values (2, 2, 'two', 'two')", read_only=False)
+
+    assert operations.insert_missing_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=1, checkpoint=checkpoint) == 1
+    assert execute_sql("select id1, id2 from t2 order by id1") == [(1, 2), (4, 5), (8, 8), (9, 9)]
+    assert checkpoint.get('insert_missing_rows "public"."t2"') is None
+
+
+@pytest.mark.django_db
+def test_chunked_operation_refuses_checkpoint_inside_transaction(operations_fixture, tmp_path):
+    checkpoint = ETLCheckpoint(tmp_path / "checkpoint.json")
+    with pytest.raises(RuntimeError):
+        operations.insert_missing_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=1, checkpoint=checkpoint)
+    assert checkpoint._read() == {}
+
+    # Without a checkpoint, chunks simply become savepoints.
+    assert operations.insert_missing_rows(ETLTable("t1"), ETLTable("t2"), chunk_size=1) == 1
+
+
+@pytest.mark.django_db
+def test_chunked_operation_requires_integer_key(make_a_table):
+    execute_sql("create table t4 (name text primary key, description text)", read_only=False)
+    with pytest.raises(RuntimeError):
+        operations.update_changed_rows(ETLTable("t4"), ETLTable("t4"), chunk_size=10)
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+
+from usaspending_api.common.data_connectors.async_sql_query import async_run_dag, order_dag_steps
+
+
+def _step(name, *depends_on):
+    return {"name": name, "sql": f"-- {name}", "depends_on": list(depends_on)}
+
+
+MATVIEW_STEPS = [
+    _step("a__finalize", "a__analyze"),
+    _step("a__analyze", "a__index_0", "a__index_1", "a__stats"),
+    _step("a__index_0", "a__create"),
+    _step("a__index_1", "a__create"),
+    _step("a__stats", "a__create"),
+    _step("a__create"),
+    _step("b__create"),
+    _step("b__index_0", "b__create"),
+    _step("b__analyze", "b__index_0"),
+    _step("b__finalize", "b__analyze"),
+]
+
+
+def test_order_dag_steps():
+    ordered = [step["name"] for step in order_dag_steps(MATVIEW_STEPS)]
+
+    assert sorted(ordered) == sorted(step["name"] for step in MATVIEW_STEPS)
+    for step in MATVIEW_STEPS:
+        for dependency in step["depends_on"]:
+            assert ordered.index(dependency) < ordered.index(step["name"])
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        order_dag_steps([_step("a"), _step("a")])
+    with pytest.raises(ValueError, match="unknown"):
+        order_dag_steps([_step("a", "missing")])
+    with pytest.raises(ValueError, match="cycle"):
+        order_dag_steps([_step("a", "b"), _step("b", "a"), _step("c")])
+
+
+def test_async_run_dag_respects_dependencies_and_concurrency():
+    finished = []
+    running = set()
+    most_running = 0
+
+    async def run_step(step):
+        nonlocal most_running
+        assert all(dependency in finished for dependency in step["depends_on"])
+        running.add(step["name"])
+        most_running = max(most_running, len(running))
+        await asyncio.sleep(0.01)
+        running.discard(step["name"])
+        finished.append(step["name"])
+
+    asyncio.run(async_run_dag(MATVIEW_STEPS, 2, run_step))
+
+    assert sorted(finished) == sorted(step["name"] for step in MATVIEW_STEPS)
+    assert most_running == 2
+
+
+def test_async_run_dag_stops_after_a_failure():
+    started = []
+
+    async def run_step(step):
+        started.append(step["name"])
+        if step["name"] == "a__index_0":
+            raise RuntimeError("index build failed")
+        await asyncio.sleep(0.01)
+
+    with pytest.raises(RuntimeError, match="index build failed"):
+        asyncio.run(async_run_dag(MATVIEW_STEPS, 4, run_step))
+
+    assert "a__analyze" not in started
+    assert "a__finalize" not in started
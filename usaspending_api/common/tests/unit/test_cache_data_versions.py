@@ -0,0 +1,50 @@
+import pytest
+
+from django.core.cache import caches
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from usaspending_api.common import cache
+from usaspending_api.common.cache import bump_data_version, usaspending_key_func
+
+
+class EverythingView:
+    def get(self, request):
+        pass
+
+
+class AwardsView(EverythingView):
+    cache_data_domains = ("awards",)
+
+
+@pytest.fixture
+def versioned_cache(monkeypatch):
+    monkeypatch.setattr(cache, "caches", {"usaspending-cache": caches["default"]})
+    monkeypatch.setitem(cache._data_versions, "checked_at", None)
+    yield
+    caches["default"].clear()
+    cache._data_versions["checked_at"] = None
+
+
+def key_for(view):
+    request = Request(RequestFactory().get("/api/v2/some/endpoint/", {"a": "1"}))
+    request.accepted_renderer = JSONRenderer()
+    return usaspending_key_func(view_instance=view, view_method=view.get, request=request, args=(), kwargs={})
+
+
+def test_keys_change_only_with_the_domains_a_view_depends_on(versioned_cache):
+    awards_key, everything_key = key_for(AwardsView()), key_for(EverythingView())
+    assert awards_key != everything_key
+
+    bump_data_version("references")
+    assert key_for(AwardsView()) == awards_key
+    assert key_for(EverythingView()) != everything_key
+
+    bump_data_version("awards")
+    assert key_for(AwardsView()) != awards_key
+
+
+def test_bump_data_version_rejects_unknown_domains(versioned_cache):
+    with pytest.raises(ValueError):
+        bump_data_version("recipients")
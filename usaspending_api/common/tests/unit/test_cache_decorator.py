@@ -0,0 +1,168 @@
+import pytest
+import threading
+
+from unittest.mock import MagicMock
+
+from django.core.cache import caches
+from django.test import RequestFactory
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usaspending_api.common import cache_decorator
+from usaspending_api.common.cache_decorator import (
+    RELEASE_LOCK_SCRIPT,
+    CustomCacheResponse,
+    LocalResponseCache,
+    SingleFlight,
+    get_response_data,
+)
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    local_cache = LocalResponseCache(max_entries=2, max_entry_bytes=1024)
+    monkeypatch.setattr(cache_decorator, "local_response_cache", local_cache)
+    yield local_cache
+    caches["default"].clear()
+
+
+def test_local_response_cache_is_a_bounded_lru_with_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_decorator.time, "monotonic", lambda: now)
+    local_cache = LocalResponseCache(max_entries=2, max_entry_bytes=10)
+
+    local_cache.set("a", (b"a", 200, []), 60)
+    local_cache.set("b", (b"b", 200, []), 60)
+    assert local_cache.get("a") == (b"a", 200, [])
+    local_cache.set("c", (b"c", 200, []), 60)
+    local_cache.set("too big", (b"x" * 11, 200, []), 60)
+
+    assert local_cache.get("b") is None
+    assert local_cache.get("too big") is None
+    now += 61
+    assert local_cache.get("a") is None
+    assert local_cache.metrics() == {"entries": 1, "hits": 1, "misses": 3, "evictions": 1, "expirations": 1}
+
+
+def test_cache_response_tiers(local_cache):
+    calls = []
+
+    class CachedView(APIView):
+        @CustomCacheResponse(cache="default", local=True)
+        def get(self, request):
+            calls.append(request)
+            return Response({"results": ["a"] * 100})
+
+    view = CachedView.as_view()
+
+    traces = [view(RequestFactory().get("/api/v2/cached/"))["Cache-Trace"] for _ in range(2)]
+    local_cache.clear()
+    response = view(RequestFactory().get("/api/v2/cached/"))
+    traces.append(response["Cache-Trace"])
+
+    assert traces == ["set-cache", "hit-local-cache", "hit-cache"]
+    assert len(calls) == 1
+    assert response.content == b'{"results":[' + b",".join([b'"a"'] * 100) + b"]}"
+    assert response["Content-Type"] == "application/json"
+    assert len(caches["default"].get(response["key"])[0]) < len(response.content)
+
+
+def test_cache_response_coalesces_concurrent_misses(local_cache):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowView(APIView):
+        @CustomCacheResponse(cache="default")
+        def get(self, request):
+            calls.append(request)
+            started.set()
+            release.wait(5)
+            return Response({"results": "slow"})
+
+    view = SlowView.as_view()
+    traces = []
+
+    def request():
+        traces.append(view(RequestFactory().get("/api/v2/slow/"))["Cache-Trace"])
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=request) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(10)
+
+    assert len(calls) == 1
+    assert len(traces) == 4
+    assert traces.count("set-cache") == 1
+    assert set(traces) <= {"set-cache", "hit-coalesced", "hit-cache"}
+    assert cache_decorator._flights == {}
+
+
+def test_cache_response_waits_for_lock_held_by_another_process(local_cache, monkeypatch):
+    monkeypatch.setattr(cache_decorator.SingleFlight, "POLL_INTERVAL", 0.01)
+    calls = []
+
+    class CachedView(APIView):
+        @CustomCacheResponse(cache="default")
+        def get(self, request):
+            calls.append(request)
+            return Response({"results": "fresh"})
+
+    view = CachedView.as_view()
+    key = view(RequestFactory().get("/api/v2/cached/"))["key"]
+    caches["default"].delete(key)
+    caches["default"].set(f"single-flight:{key}", "another process", 60)
+    threading.Timer(0.05, caches["default"].delete, args=[f"single-flight:{key}"]).start()
+
+    response = view(RequestFactory().get("/api/v2/cached/"))
+
+    assert len(calls) == 2
+    assert response["Cache-Trace"] == "set-cache"
+
+
+def test_single_flight_releases_its_lock_only():
+    cache = caches["default"]
+    single_flight = SingleFlight(cache, "released")
+    assert single_flight.acquire_lock()
+
+    cache.set(single_flight.lock_key, "another request", 60)
+    single_flight.release_lock()
+    assert cache.get(single_flight.lock_key) == "another request"
+
+    cache.set(single_flight.lock_key, single_flight.token, 60)
+    single_flight.release_lock()
+    assert cache.get(single_flight.lock_key) is None
+
+
+def test_single_flight_releases_redis_lock_atomically():
+    cache = MagicMock()
+    cache.client.make_key.side_effect = lambda key: f":1:{key}"
+    cache.client.encode.side_effect = lambda value: f"pickled {value}".encode()
+    single_flight = SingleFlight(cache, "released")
+    single_flight.holds_lock = True
+
+    single_flight.finish(None)
+
+    redis = cache.client.get_client.return_value
+    redis.eval.assert_called_once_with(
+        RELEASE_LOCK_SCRIPT, 1, ":1:single-flight:released", f"pickled {single_flight.token}".encode()
+    )
+    assert not cache.delete.called
+
+
+def test_get_response_data_from_cache_hit(local_cache):
+    class CachedView(APIView):
+        @CustomCacheResponse(cache="default")
+        def get(self, request):
+            return Response({"count": 3})
+
+    view = CachedView.as_view()
+    responses = [view(RequestFactory().get("/api/v2/cached/")) for _ in range(2)]
+
+    assert [response["Cache-Trace"] for response in responses] == ["set-cache", "hit-cache"]
+    assert [get_response_data(response) for response in responses] == [{"count": 3}, {"count": 3}]
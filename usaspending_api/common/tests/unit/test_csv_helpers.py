@@ -0,0 +1,30 @@
+import csv
+import io
+
+from usaspending_api.common.csv_helpers import partition_delimited_stream
+
+
+def _read_rows(file_path):
+    with open(file_path) as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_partition_delimited_stream(tmp_path):
+    stream = io.StringIO('a,b\r\n1,"multi\nline"\r\n2,x\r\n3,y\r\n4,z\r\n5,w\r\n')
+    partitions = partition_delimited_stream(stream, str(tmp_path), row_limit=2, output_name_template="part_%s.csv")
+
+    # Each partition is handed back as soon as it is complete
+    first_path, first_count = next(partitions)
+    assert first_path == str(tmp_path / "part_1.csv")
+    assert first_count == 2
+    assert _read_rows(first_path) == [["a", "b"], ["1", "multi\nline"], ["2", "x"]]
+
+    remaining = list(partitions)
+    assert [count for _, count in remaining] == [2, 1]
+    assert _read_rows(remaining[-1][0]) == [["a", "b"], ["5", "w"]]
+
+
+def test_partition_delimited_stream_header_only(tmp_path):
+    partitions = list(partition_delimited_stream(io.StringIO("a,b\r\n"), str(tmp_path)))
+    assert partitions == [(str(tmp_path / "output_1.csv"), 0)]
+    assert _read_rows(partitions[0][0]) == [["a", "b"]]
@@ -0,0 +1,24 @@
+from usaspending_api.common.etl import ETLCheckpoint
+
+
+def test_etl_checkpoint(tmp_path):
+    file_path = tmp_path / "checkpoint.json"
+    checkpoint = ETLCheckpoint(file_path)
+
+    assert checkpoint.get("update_changed_rows t") is None
+    assert not file_path.exists()
+
+    checkpoint.set("update_changed_rows t", 100)
+    checkpoint.set("insert_missing_rows t", 50)
+    checkpoint.set("update_changed_rows t", 200)
+
+    # A new instance, like a resumed run would create, sees the same progress.
+    resumed = ETLCheckpoint(file_path)
+    assert resumed.get("update_changed_rows t") == 200
+    assert resumed.get("insert_missing_rows t") == 50
+
+    resumed.clear("update_changed_rows t")
+    resumed.clear("never started")
+    assert checkpoint.get("update_changed_rows t") is None
+    assert checkpoint.get("insert_missing_rows t") == 50
+    assert not file_path.with_name("checkpoint.json.tmp").exists()
@@ -0,0 +1,104 @@
+import pytest
+
+from elasticsearch import ConnectionTimeout, TransportError
+from unittest.mock import MagicMock
+
+from usaspending_api.common.elasticsearch import partitioned_scan
+from usaspending_api.common.elasticsearch.partitioned_scan import (
+    get_num_partitions,
+    partitioned_terms_scan,
+    sliced_scroll_scan,
+)
+
+IDS = list(range(1, 31))
+
+
+class FakeSearch:
+    """Partitions and slices IDS by remainder, failing the first request made for partition or slice 1"""
+
+    def __init__(self, failures=None, extra=None):
+        self.aggs = MagicMock()
+        self.failures = failures if failures is not None else {}
+        self._extra = extra or {}
+
+    def extra(self, **kwargs):
+        return type(self)(self.failures, {**self._extra, **kwargs})
+
+    def source(self, fields):
+        return self
+
+    def _fail_once(self, key):
+        if key == 1 and not self.failures.get(key):
+            self.failures[key] = True
+            raise ConnectionTimeout("TIMEOUT", "timed out", None)
+
+    def handle_execute(self, retries):
+        include = self.aggs.bucket.call_args[0][1].to_dict()["terms"]["include"]
+        self._fail_once(include["partition"])
+        keys = [i for i in IDS if i % include["num_partitions"] == include["partition"]]
+        response = MagicMock()
+        response.to_dict.return_value = {"aggregations": {"results": {"buckets": [{"key": key} for key in keys]}}}
+        return response
+
+    def scan(self):
+        slice_ = self._extra.get("slice", {"id": 0, "max": 1})
+        self._fail_once(slice_["id"])
+        return [{"award_id": i} for i in IDS if i % slice_["max"] == slice_["id"]]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(partitioned_scan.time, "sleep", lambda seconds: None)
+
+
+def test_get_num_partitions():
+    assert get_num_partitions(0, 10) == 1
+    assert get_num_partitions(25, 10) == 3
+    assert get_num_partitions(25, 10, max_results=20) == 2
+    assert get_num_partitions(25, 10, max_results=5) == 1
+
+
+def test_partitioned_terms_scan_retries_failed_partitions():
+    results = list(partitioned_terms_scan(FakeSearch(), "award_id", 4, 10, concurrency=2))
+
+    assert len(results) == 4
+    assert sorted(i for result in results for i in result) == IDS
+
+
+def test_partitioned_terms_scan_gives_up_after_retries():
+    class AlwaysFailingSearch(FakeSearch):
+        def _fail_once(self, key):
+            raise ConnectionTimeout("TIMEOUT", "timed out", None)
+
+    with pytest.raises(ConnectionTimeout):
+        list(partitioned_terms_scan(AlwaysFailingSearch(), "award_id", 2, 10, retries=3))
+
+
+@pytest.mark.parametrize(
+    "error,attempts",
+    [
+        (TransportError(429, "es_rejected_execution_exception", None), 3),
+        (TransportError(503, "unavailable_shards_exception", None), 3),
+        (TransportError(400, "search_phase_execution_exception", None), 1),
+        (TransportError(404, "index_not_found_exception", None), 1),
+    ],
+)
+def test_partitioned_terms_scan_only_retries_transient_errors(error, attempts):
+    calls = []
+
+    class FailingSearch(FakeSearch):
+        def _fail_once(self, key):
+            calls.append(key)
+            raise error
+
+    with pytest.raises(TransportError):
+        list(partitioned_terms_scan(FailingSearch(), "award_id", 1, 10, retries=3))
+
+    assert len(calls) == attempts
+
+
+def test_sliced_scroll_scan():
+    results = list(sliced_scroll_scan(FakeSearch(), "award_id", 3))
+
+    assert len(results) == 3
+    assert sorted(i for result in results for i in result) == IDS
@@ -0,0 +1,93 @@
+from collections import Counter
+from unittest.mock import MagicMock
+
+from django.db import DEFAULT_DB_ALIAS
+
+from usaspending_api.awards.models import Award
+from usaspending_api.references.models import FilterHash
+from usaspending_api.routers import replicas
+from usaspending_api.routers.replicas import DefaultOnlyRouter, ReadReplicaRouter
+
+
+class TwoReplicaRouter(ReadReplicaRouter):
+    read_replicas = ["db_r1", "db_r2"]
+
+    def __init__(self, probe_results):
+        super().__init__()
+        self.probe_results = probe_results
+        self.probes = 0
+
+    def probe_replica(self, alias):
+        self.probes += 1
+        self.replica_health[alias].update(self.probe_results[alias])
+
+
+def healthy(latency=0.01, lag=0, active=0):
+    return {"healthy": True, "latency": latency, "lag": lag, "active": active}
+
+
+def test_reads_are_weighted_toward_faster_replicas():
+    router = TwoReplicaRouter({"db_r1": healthy(latency=0.001), "db_r2": healthy(latency=0.02)})
+
+    counts = Counter(router.db_for_read(Award) for _ in range(1000))
+
+    assert DEFAULT_DB_ALIAS not in counts
+    assert counts["db_r1"] > counts["db_r2"] * 3
+    assert router.db_for_read(FilterHash) == DEFAULT_DB_ALIAS
+    assert router.db_for_write(Award) == DEFAULT_DB_ALIAS
+
+
+def test_unhealthy_and_lagging_replicas_are_skipped(settings):
+    settings.REPLICA_MAX_LAG_SECONDS = 60
+    router = TwoReplicaRouter({"db_r1": {"healthy": False}, "db_r2": healthy(lag=120)})
+    assert router.db_for_read(Award) == DEFAULT_DB_ALIAS
+
+    router = TwoReplicaRouter({"db_r1": {"healthy": False}, "db_r2": healthy(lag=30)})
+    assert {router.db_for_read(Award) for _ in range(100)} == {"db_r2"}
+
+
+def test_replicas_are_probed_periodically(settings):
+    settings.REPLICA_HEALTH_CHECK_SECONDS = 60
+    router = TwoReplicaRouter({"db_r1": healthy(), "db_r2": healthy()})
+
+    for _ in range(10):
+        router.db_for_read(Award)
+    assert router.probes == 2
+
+    router.check_replica_health(force=True)
+    assert router.probes == 4
+
+
+def test_default_only_router():
+    router = DefaultOnlyRouter()
+    assert router.db_for_read(Award) == DEFAULT_DB_ALIAS
+    assert router.usaspending_databases == [DEFAULT_DB_ALIAS]
+
+
+def probed_router(monkeypatch, settings, result):
+    settings.DATABASES = {**settings.DATABASES, "db_r1": dict(settings.DATABASES[DEFAULT_DB_ALIAS])}
+    connect = MagicMock()
+    connect.return_value.cursor.return_value.__enter__.return_value.fetchone.return_value = result
+    monkeypatch.setattr(replicas.psycopg2, "connect", connect)
+    router = ReadReplicaRouter()
+    router.read_replicas = ["db_r1"]
+    router.replica_health = {"db_r1": {"healthy": True, "latency": None, "lag": 0, "active": 0}}
+    router.probe_replica("db_r1")
+    return router, connect
+
+
+def test_probe_replica(monkeypatch, settings):
+    settings.REPLICA_HEALTH_TIMEOUT_SECONDS = 2
+    router, connect = probed_router(monkeypatch, settings, (12.5, 4))
+
+    assert connect.call_args[1] == {"connect_timeout": 2, "options": "-c statement_timeout=2000"}
+    assert connect.return_value.close.called
+    health = router.replica_health["db_r1"]
+    assert (health["healthy"], health["lag"], health["active"]) == (True, 12.5, 3)
+
+
+def test_probe_replica_that_stopped_replicating(monkeypatch, settings):
+    router, _ = probed_router(monkeypatch, settings, (None, 1))
+
+    assert router.replica_health["db_r1"]["healthy"] is False
+    assert router.db_for_read(Award) == DEFAULT_DB_ALIAS
@@ -0,0 +1,49 @@
+import time
+
+from django.test import RequestFactory
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usaspending_api.common.helpers.timing_helpers import (
+    current_request_timings,
+    record_request_timings,
+    request_stage,
+)
+from usaspending_api.common.logging import LoggingMiddleware
+
+
+def test_request_stages_are_only_recorded_inside_a_request():
+    with request_stage("db"):
+        pass
+    assert current_request_timings() is None
+
+    with record_request_timings() as timings:
+        for _ in range(2):
+            with request_stage("db"):
+                time.sleep(0.001)
+        with request_stage("es"):
+            pass
+
+    assert current_request_timings() is None
+    assert timings.stages["db"][1] == 2
+    assert timings.as_log_fields()["db_count"] == 2
+    assert timings.as_log_fields()["db_ms"] >= 2
+    assert timings.as_server_timing(10).startswith("db;dur=")
+    assert ', es;dur=0.0;desc="1", total;dur=10' in timings.as_server_timing(10)
+
+
+class TimedView(APIView):
+    def get(self, request):
+        with request_stage("es"):
+            pass
+        return Response({"results": []})
+
+
+def test_logging_middleware_adds_server_timing():
+    middleware = LoggingMiddleware(TimedView.as_view())
+
+    response = middleware(RequestFactory().get("/api/v2/timed/"))
+
+    stages = [metric.split(";")[0] for metric in response["Server-Timing"].split(", ")]
+    assert stages == ["es", "total"]
+    assert middleware.log["timings"] == {"es_ms": 0, "es_count": 1}
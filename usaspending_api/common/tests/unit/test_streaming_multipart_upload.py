@@ -0,0 +1,77 @@
+import pytest
+
+from unittest.mock import MagicMock, patch
+
+from usaspending_api.common.helpers.s3_helpers import StreamingMultipartUpload
+
+PART_SIZE = StreamingMultipartUpload.MIN_PART_SIZE
+
+
+class FakeS3Client:
+    """Keeps uploaded parts in memory, standing in for S3 (or moto/MinIO)"""
+
+    def __init__(self):
+        self.parts = {}
+        self.objects = {}
+        self.aborted = False
+        self.upload_part = MagicMock(side_effect=self._upload_part)
+
+    def create_multipart_upload(self, Bucket, Key, ACL):
+        return {"UploadId": "upload-1"}
+
+    def _upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = b"".join(self.parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted = True
+
+
+@pytest.fixture
+def fake_s3_client():
+    client = FakeS3Client()
+    with patch("usaspending_api.common.helpers.s3_helpers.boto3.client", return_value=client):
+        yield client
+
+
+def test_streaming_multipart_upload(tmp_path, fake_s3_client):
+    source_path = tmp_path / "download.zip"
+    source_path.write_bytes(b"a" * (PART_SIZE + 100))
+
+    with StreamingMultipartUpload("bucket", "region", str(source_path), "download.zip", PART_SIZE) as upload:
+        # Bytes past the finalized offset may still change, so nothing beyond a full part is sent early
+        upload.notify(PART_SIZE + 50)
+        with open(source_path, "ab") as source:
+            source.write(b"b" * 10)
+        upload.complete()
+
+    assert fake_s3_client.upload_part.call_count == 2
+    assert fake_s3_client.objects["download.zip"] == source_path.read_bytes()
+    assert not fake_s3_client.aborted
+
+
+def test_streaming_multipart_upload_aborts_on_error(tmp_path, fake_s3_client):
+    source_path = tmp_path / "download.zip"
+    source_path.write_bytes(b"a")
+
+    with pytest.raises(RuntimeError):
+        with StreamingMultipartUpload("bucket", "region", str(source_path), "download.zip"):
+            raise RuntimeError("Download generation failed")
+
+    assert fake_s3_client.aborted
+    assert fake_s3_client.objects == {}
+
+
+def test_streaming_multipart_upload_started_before_file_exists(tmp_path, fake_s3_client):
+    source_path = tmp_path / "download.zip"
+
+    with StreamingMultipartUpload("bucket", "region", str(source_path), "download.zip", PART_SIZE) as upload:
+        source_path.write_bytes(b"a" * (PART_SIZE * 2))
+        upload.notify(PART_SIZE * 2)
+        upload.complete()
+
+    assert fake_s3_client.upload_part.call_count == 2
+    assert fake_s3_client.objects["download.zip"] == source_path.read_bytes()
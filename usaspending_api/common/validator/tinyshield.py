@@ -4,6 +4,7 @@ import copy
 from django.utils.decorators import method_decorator
 
 from usaspending_api.common.exceptions import UnprocessableEntityException
+from usaspending_api.common.helpers.timing_helpers import request_stage
 from usaspending_api.common.validator.helpers import INVALID_TYPE_MSG, MAX_ITEMS
 from usaspending_api.common.validator.helpers import SUPPORTED_TEXT_TYPES, TINY_SHIELD_SEPARATOR
 from usaspending_api.common.validator.helpers import validate_array
@@ -182,8 +183,9 @@ class TinyShield:
         self.data = {}
 
     def block(self, request):
-        self.parse_request(request)
-        self.enforce_rules()
+        with request_stage("validation"):
+            self.parse_request(request)
+            self.enforce_rules()
         return self.data
 
     def check_model(self, model, in_any=False):
@@ -5,11 +5,13 @@ import pytest
 import tempfile
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.management import call_command
 from django.db import connections
 from django.test import override_settings
 from pathlib import Path
 
+from usaspending_api.common import cache_decorator
 from usaspending_api.common.helpers.sql_helpers import execute_sql_simple
 from usaspending_api.common.elasticsearch.elasticsearch_sql_helpers import (
     ensure_view_exists,
@@ -342,6 +344,25 @@ def temp_file_path():
         pass
 
 
+@pytest.fixture
+def enable_response_cache(monkeypatch):
+    """
+    The usaspending-cache is disabled for tests.  This returns a function that points the cache_response decorators of
+    the given view methods at a local memory cache for the rest of the test.
+    """
+
+    def enable(*view_methods):
+        for view_method in view_methods:
+            for cell in view_method.__closure__:
+                decorator = cell.cell_contents
+                if isinstance(decorator, cache_decorator.CustomCacheResponse):
+                    monkeypatch.setattr(decorator, "cache", caches["default"])
+                    monkeypatch.setattr(decorator, "enabled", True)
+
+    yield enable
+    caches["default"].clear()
+
+
 @pytest.fixture(scope="session")
 def unittest_fake_sqs_queue_instance():
     fake_unittest_q = _FakeUnitTestFileBackedSQSQueue.instance()
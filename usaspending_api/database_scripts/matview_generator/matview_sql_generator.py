@@ -3,6 +3,7 @@
 import argparse
 import glob
 import hashlib
+import json
 import os
 
 from shared_sql_generator import (
@@ -10,6 +11,8 @@ from shared_sql_generator import (
     generate_uid,
     HERE,
     ingest_json,
+    make_build_steps,
+    make_incremental_refresh_sql,
     make_indexes_sql,
     make_matview_refresh,
     make_modification_sql,
@@ -48,6 +51,7 @@ EXAMPLE SQL DESCRIPTION JSON FILE:
     "  action_date DESC"
 
     ],
+    "incremental": true,
     "index": {
         "name": "<name>",
         "columns": [
@@ -66,33 +70,45 @@ EXAMPLE SQL DESCRIPTION JSON FILE:
 """
 
 
-def make_matview_drops(final_matview_name):
+def make_matview_drops(final_matview_name, as_table=False):
     matview_temp_name = final_matview_name + "_temp"
     matview_archive_name = final_matview_name + "_old"
+    # Award search tables used to be matviews, so whichever of the two exists is dropped
+    drop_template = TEMPLATE["drop_table_or_matview" if as_table else "drop_matview"]
 
-    return [TEMPLATE["drop_matview"].format(matview_temp_name), TEMPLATE["drop_matview"].format(matview_archive_name)]
+    return [drop_template.format(matview_temp_name), drop_template.format(matview_archive_name)]
 
 
-def make_matview_create(final_matview_name, sql):
+def make_matview_create(final_matview_name, sql, as_table=False):
     matview_sql = "\n".join(sql)
     matview_temp_name = final_matview_name + "_temp"
     with_or_without_data = ""
     if GLOBAL_ARGS.no_data:
         with_or_without_data = "NO "
 
-    return [TEMPLATE["create_matview"].format(matview_temp_name, matview_sql, with_or_without_data)]
+    create_template = TEMPLATE["create_table_as" if as_table else "create_matview"]
+    return [create_template.format(matview_temp_name, matview_sql, with_or_without_data)]
 
 
-def make_rename_sql(matview_name, old_indexes, old_stats, new_indexes, new_stats):
+def make_no_data_fill(matview_name, sql, as_table=False):
+    """With --no-data the temp matview (or table) is only populated once its indexes exist"""
+    matview_temp_name = matview_name + "_temp"
+    if as_table:
+        return [TEMPLATE["insert_from_sql"].format(matview_temp_name, "\n".join(sql))]
+    return [TEMPLATE["refresh_matview"].format("", matview_temp_name)]
+
+
+def make_rename_sql(matview_name, old_indexes, old_stats, new_indexes, new_stats, as_table=False):
     matview_temp_name = matview_name + "_temp"
     matview_archive_name = matview_name + "_old"
+    rename_template = TEMPLATE["rename_table" if as_table else "rename_matview"]
     sql_strings = []
-    sql_strings.append(TEMPLATE["rename_matview"].format("IF EXISTS ", matview_name, matview_archive_name))
+    sql_strings.append(rename_template.format("IF EXISTS ", matview_name, matview_archive_name))
     sql_strings += old_indexes
     sql_strings.append("")
     sql_strings += old_stats
     sql_strings.append("")
-    sql_strings.append(TEMPLATE["rename_matview"].format("", matview_temp_name, matview_name))
+    sql_strings.append(rename_template.format("", matview_temp_name, matview_name))
     sql_strings += new_indexes
     sql_strings.append("")
     sql_strings += new_stats
@@ -115,15 +131,16 @@ def create_all_sql_strings(sql_json):
 
     matview_name = sql_json["final_name"]
     matview_temp_name = matview_name + "_temp"
+    as_table = sql_json.get("incremental", False)
 
     create_indexes, rename_old_indexes, rename_new_indexes = make_indexes_sql(
         sql_json, matview_temp_name, UNIQUE_STRING, True, GLOBAL_ARGS.quiet
     )
     create_stats, rename_old_stats, rename_new_stats = make_stats_sql(sql_json, matview_temp_name, UNIQUE_STRING)
 
-    final_sql_strings.extend(make_matview_drops(matview_name))
+    final_sql_strings.extend(make_matview_drops(matview_name, as_table))
     final_sql_strings.append("")
-    final_sql_strings.extend(make_matview_create(matview_name, sql_json["matview_sql"]))
+    final_sql_strings.extend(make_matview_create(matview_name, sql_json["matview_sql"], as_table))
 
     final_sql_strings.append("")
     final_sql_strings += create_indexes
@@ -131,9 +148,11 @@ def create_all_sql_strings(sql_json):
     final_sql_strings += create_stats
     final_sql_strings.append("")
     if GLOBAL_ARGS.no_data:
-        final_sql_strings.extend([TEMPLATE["refresh_matview"].format("", matview_name), ""])
+        final_sql_strings.extend(make_no_data_fill(matview_name, sql_json["matview_sql"], as_table) + [""])
     final_sql_strings.extend(
-        make_rename_sql(matview_name, rename_old_indexes, rename_old_stats, rename_new_indexes, rename_new_stats)
+        make_rename_sql(
+            matview_name, rename_old_indexes, rename_old_stats, rename_new_indexes, rename_new_stats, as_table
+        )
     )
     final_sql_strings.append("")
     final_sql_strings.extend(make_modification_sql(matview_name, GLOBAL_ARGS.quiet))
@@ -150,22 +169,32 @@ def write_sql_file(str_list, filename):
         f.write("\n")
 
 
+def write_build_plan(steps, filename):
+    fname = filename + ".json"
+
+    print_debug("Creating file: {}".format(fname))
+    with open(fname, "w") as f:
+        json.dump(steps, f, indent=2)
+        f.write("\n")
+
+
 def create_componentized_files(sql_json):
     filename_base = os.path.join(DEST_FOLDER, COMPONENT_DIR, sql_json["final_name"])
     index_dir_path = os.path.join(filename_base, "batch_indexes/")
 
     matview_name = sql_json["final_name"]
     matview_temp_name = matview_name + "_temp"
+    as_table = sql_json.get("incremental", False)
 
     create_indexes, rename_old_indexes, rename_new_indexes = make_indexes_sql(
         sql_json, matview_temp_name, UNIQUE_STRING, True, GLOBAL_ARGS.quiet
     )
     create_stats, rename_old_stats, rename_new_stats = make_stats_sql(sql_json, matview_temp_name, UNIQUE_STRING)
 
-    sql_strings = make_matview_drops(matview_name)
+    sql_strings = make_matview_drops(matview_name, as_table)
     write_sql_file(sql_strings, filename_base + "__drops")
 
-    sql_strings = make_matview_create(matview_name, sql_json["matview_sql"])
+    sql_strings = make_matview_create(matview_name, sql_json["matview_sql"], as_table)
     write_sql_file(sql_strings, filename_base + "__matview")
 
     indexes_and_stats = create_indexes + create_stats
@@ -181,10 +210,24 @@ def create_componentized_files(sql_json):
     write_sql_file(sql_strings, filename_base + "__mods")
 
     sql_strings = make_rename_sql(
-        matview_name, rename_old_indexes, rename_old_stats, rename_new_indexes, rename_new_stats
+        matview_name, rename_old_indexes, rename_old_stats, rename_new_indexes, rename_new_stats, as_table
     )
     write_sql_file(sql_strings, filename_base + "__renames")
 
+    write_build_plan(
+        make_build_steps(
+            matview_name,
+            make_matview_drops(matview_name, as_table)
+            + make_matview_create(matview_name, sql_json["matview_sql"], as_table),
+            create_indexes,
+            create_stats,
+            make_no_data_fill(matview_name, sql_json["matview_sql"], as_table) if GLOBAL_ARGS.no_data else [],
+            make_modification_sql(matview_temp_name, True, grant=False),
+            sql_strings + [TEMPLATE["grant_select"].format(matview_name, "readonly")],
+        ),
+        filename_base + "__plan",
+    )
+
     if "refresh" in sql_json and sql_json["refresh"] is True:
         if GLOBAL_ARGS.no_data:
             sql_strings = make_matview_refresh(matview_temp_name, "")
@@ -192,6 +235,11 @@ def create_componentized_files(sql_json):
             sql_strings = make_matview_refresh(matview_name)
         write_sql_file(sql_strings, filename_base + "__refresh")
 
+    if as_table:
+        # Built as a table rather than a matview so that `matview_runner --incremental` can apply queued awards
+        sql_strings = make_incremental_refresh_sql(matview_name, sql_json["matview_sql"])
+        write_sql_file(sql_strings, filename_base + "__incremental")
+
 
 def create_monolith_file(sql_json):
     sql_strings = create_all_sql_strings(sql_json)
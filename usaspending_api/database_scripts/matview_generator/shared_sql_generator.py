@@ -7,8 +7,14 @@ from uuid import uuid4
 TEMPLATE = {
     "create_matview": "CREATE MATERIALIZED VIEW {} AS\n{} WITH {}DATA;",
     "create_table": "CREATE TABLE {} AS SELECT * from {} WITH NO DATA;",
+    "create_table_as": "CREATE TABLE {} AS\n{} WITH {}DATA;",
     "drop_table": "DROP TABLE IF EXISTS {} CASCADE;",
     "drop_matview": "DROP MATERIALIZED VIEW IF EXISTS {} CASCADE;",
+    "drop_table_or_matview": (
+        "DO $$ BEGIN IF to_regclass('{0}') IS NOT NULL THEN EXECUTE (SELECT 'DROP ' || CASE relkind WHEN 'm' "
+        "THEN 'MATERIALIZED VIEW' ELSE 'TABLE' END || ' {0} CASCADE' FROM pg_class WHERE oid = to_regclass('{0}')); "
+        "END IF; END $$;"
+    ),
     "rename_matview": "ALTER MATERIALIZED VIEW {}{} RENAME TO {};",
     "rename_table": "ALTER TABLE {}{} RENAME TO {};",
     "cluster_matview": "CLUSTER VERBOSE {} USING {};",
@@ -23,6 +29,12 @@ TEMPLATE = {
     "grant_select": "GRANT SELECT ON {} TO {};",
     "sql_print_output": "DO $$ BEGIN RAISE NOTICE '{}'; END $$;",
     "insert_into_table": "INSERT INTO {} SELECT * FROM {};",
+    "insert_from_sql": "INSERT INTO {}\n{};",
+    "delete_queued_awards": "DELETE FROM {} WHERE award_id IN (SELECT award_id FROM award_search_refresh_ids);",
+    "insert_queued_awards": (
+        "INSERT INTO {} SELECT * FROM (\n{}\n) AS incremental_rows\n"
+        "WHERE award_id IN (SELECT award_id FROM award_search_refresh_ids);"
+    ),
     "read_indexes": "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = '{}';",
     "read_constraints": "select conname, pg_get_constraintdef(oid) from pg_constraint where contype IN ('p', 'f') and conrelid = '{}'::regclass;",
 }
@@ -105,6 +117,18 @@ def make_matview_refresh(matview_name, concurrently="CONCURRENTLY "):
     return statement_list
 
 
+def make_incremental_refresh_sql(table_name, sql):
+    """
+    Re-derive only the awards listed in the award_search_refresh_ids temporary table. Deleting first also removes
+    awards which no longer exist or no longer belong in this table.
+    """
+    matview_sql = "\n".join(sql)
+    return [
+        TEMPLATE["delete_queued_awards"].format(table_name),
+        TEMPLATE["insert_queued_awards"].format(table_name, matview_sql),
+    ]
+
+
 def make_indexes_sql(sql_json, entity_name, unique_string, progress_sql, quiet):
     unique_name_list = []
     create_indexes = []
@@ -143,7 +167,7 @@ def make_indexes_sql(sql_json, entity_name, unique_string, progress_sql, quiet):
     return indexes_and_msg, rename_old_indexes, rename_new_indexes
 
 
-def make_modification_sql(entity_name, quiet):
+def make_modification_sql(entity_name, quiet, grant=True):
     global CLUSTERING_INDEX
     sql_strings = []
     if CLUSTERING_INDEX:
@@ -151,7 +175,8 @@ def make_modification_sql(entity_name, quiet):
             print("*** This matview will be clustered on {} ***".format(CLUSTERING_INDEX))
         sql_strings.append(TEMPLATE["cluster_matview"].format(entity_name, CLUSTERING_INDEX))
     sql_strings.append(TEMPLATE["analyze"].format(entity_name))
-    sql_strings.append(TEMPLATE["grant_select"].format(entity_name, "readonly"))
+    if grant:
+        sql_strings.append(TEMPLATE["grant_select"].format(entity_name, "readonly"))
     return sql_strings
 
 
@@ -191,6 +216,34 @@ def make_stats_sql(sql_json, matview_name, unique_string):
     return create_stats, rename_old_stats, rename_new_stats
 
 
+def make_build_steps(entity_name, create_sql, create_indexes, create_stats, refresh_sql, analyze_sql, finalize_sql):
+    """
+    Describe the build as a list of steps that each only need the steps listed in their "depends_on" to have finished.
+    Every index is its own step so that a runner can build the indexes of all matviews at once over a pool of
+    connections instead of one after another in a single connection. ANALYZE waits for all of the indexes since it
+    also gathers statistics for expression indexes, and the renames wait for ANALYZE so that a matview is never
+    swapped in without statistics.
+    """
+    create_step = entity_name + "__create"
+    steps = [{"name": create_step, "sql": "\n".join(create_sql), "depends_on": []}]
+
+    for i, index in enumerate([index for index in create_indexes if index.startswith("CREATE")]):
+        steps.append({"name": "{}__index_{}".format(entity_name, i), "sql": index, "depends_on": [create_step]})
+    if create_stats:
+        steps.append({"name": entity_name + "__stats", "sql": "\n".join(create_stats), "depends_on": [create_step]})
+
+    built_steps = [step["name"] for step in steps[1:]] or [create_step]
+    if refresh_sql:
+        steps.append({"name": entity_name + "__refresh", "sql": "\n".join(refresh_sql), "depends_on": built_steps})
+        built_steps = [entity_name + "__refresh"]
+
+    steps.append({"name": entity_name + "__analyze", "sql": "\n".join(analyze_sql), "depends_on": built_steps})
+    steps.append(
+        {"name": entity_name + "__finalize", "sql": "\n".join(finalize_sql), "depends_on": [entity_name + "__analyze"]}
+    )
+    return steps
+
+
 def split_indexes_chunks(index_list, file_count):
     """
     loop through all index strings (only the lines which start with "CREATE") and populate
@@ -1,12 +1,26 @@
 DROP MATERIALIZED VIEW IF EXISTS mv_agency_autocomplete_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_contract_award_search_old;
 DROP MATERIALIZED VIEW IF EXISTS mv_covid_financial_account_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_directpayment_award_search_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_grant_award_search_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_idv_award_search_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_loan_award_search_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_other_award_search_old;
-DROP MATERIALIZED VIEW IF EXISTS mv_pre2008_award_search_old;
 DROP MATERIALIZED VIEW IF EXISTS subaward_view_old;
 DROP MATERIALIZED VIEW IF EXISTS summary_state_view_old;
 DROP MATERIALIZED VIEW IF EXISTS tas_autocomplete_matview_old;
+
+-- The award search tables were matviews before they could be refreshed incrementally, so drop either kind
+DO $$
+DECLARE
+  relation record;
+BEGIN
+  FOR relation IN
+    SELECT relname, relkind FROM pg_class
+    WHERE relnamespace = 'public'::regnamespace AND relname IN (
+      'mv_contract_award_search_old',
+      'mv_directpayment_award_search_old',
+      'mv_grant_award_search_old',
+      'mv_idv_award_search_old',
+      'mv_loan_award_search_old',
+      'mv_other_award_search_old',
+      'mv_pre2008_award_search_old'
+    )
+  LOOP
+    EXECUTE format('DROP %s %I', CASE relation.relkind WHEN 'm' THEN 'MATERIALIZED VIEW' ELSE 'TABLE' END, relation.relname);
+  END LOOP;
+END $$;
@@ -1,12 +1,5 @@
 REFRESH MATERIALIZED VIEW CONCURRENTLY mv_agency_autocomplete;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_contract_award_search;
 REFRESH MATERIALIZED VIEW CONCURRENTLY mv_covid_financial_account;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_directpayment_award_search;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_grant_award_search;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_idv_award_search;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_loan_award_search;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_other_award_search;
-REFRESH MATERIALIZED VIEW CONCURRENTLY mv_pre2008_award_search;
 REFRESH MATERIALIZED VIEW CONCURRENTLY subaward_view;
 REFRESH MATERIALIZED VIEW CONCURRENTLY summary_state_view;
 REFRESH MATERIALIZED VIEW CONCURRENTLY tas_autocomplete_matview;
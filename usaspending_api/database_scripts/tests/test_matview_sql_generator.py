@@ -24,9 +24,14 @@ def convert_traditional_views_to_materialized_views(transactional_db):
 
     yield
 
-    # Great.  Test is over.  Drop all of our materialized views.
+    # Great.  Test is over.  Drop all of our materialized views (and the award search tables).
     with connection.cursor() as cursor:
-        cursor.execute("; ".join(f"drop materialized view if exists {v} cascade" for v in ALL_MATVIEWS))
+        cursor.execute(
+            "; ".join(
+                f"drop {'table' if config.get('incremental') else 'materialized view'} if exists {v} cascade"
+                for v, config in ALL_MATVIEWS.items()
+            )
+        )
 
     # Recreate our traditional views.
     generate_matviews(materialized_views_as_traditional_views=True)
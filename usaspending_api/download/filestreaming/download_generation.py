@@ -1,17 +1,21 @@
+import io
 import json
 import logging
 import multiprocessing
 import os
+import queue
 from pathlib import Path
 from typing import Optional, Tuple, List
 
 import psutil as ps
 import re
 import shutil
+import signal
 import subprocess
 import tempfile
 import time
 import traceback
+import zipfile
 
 from datetime import datetime, timezone
 from ddtrace import tracer
@@ -20,10 +24,14 @@ from django.conf import settings
 
 from usaspending_api.awards.v2.filters.filter_helpers import add_date_range_comparison_types
 from usaspending_api.awards.v2.lookups.lookups import contract_type_mapping, assistance_type_mapping, idv_type_mapping
-from usaspending_api.common.csv_helpers import count_rows_in_delimited_file, partition_large_delimited_file
+from usaspending_api.common.csv_helpers import (
+    count_rows_in_delimited_file,
+    partition_delimited_stream,
+    partition_large_delimited_file,
+)
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
-from usaspending_api.common.helpers.s3_helpers import multipart_upload
+from usaspending_api.common.helpers.s3_helpers import multipart_upload, StreamingMultipartUpload
 from usaspending_api.common.helpers.text_helpers import slugify_text_for_file_names
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.common.tracing import SubprocessTrace
@@ -33,6 +41,7 @@ from usaspending_api.download.filestreaming.download_source import DownloadSourc
 from usaspending_api.download.filestreaming.file_description import build_file_description, save_file_description
 from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
 from usaspending_api.download.helpers import verify_requested_columns_available, write_to_download_log as write_to_log
+from usaspending_api.download.helpers.elasticsearch_download_functions import get_download_id_table
 from usaspending_api.download.lookups import JOB_STATUS_DICT, VALUE_MAPPINGS, FILE_FORMATS
 from usaspending_api.download.models.download_job import DownloadJob
 
@@ -40,6 +49,7 @@ DOWNLOAD_VISIBILITY_TIMEOUT = 60 * 10
 MAX_VISIBILITY_TIMEOUT = 60 * 60 * settings.DOWNLOAD_DB_TIMEOUT_IN_HOURS
 EXCEL_ROW_LIMIT = 1000000
 WAIT_FOR_PROCESS_SLEEP = 5
+EXPORT_STOP_TIMEOUT = 30
 JOB_TYPE = "USAspendingDownloader"
 
 logger = logging.getLogger(__name__)
@@ -64,6 +74,7 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
 
     file_name = start_download(download_job)
     working_dir = None
+    streaming_upload = None
     try:
         # Create temporary files and working directory
         zip_file_path = settings.CSV_LOCAL_PATH + file_name
@@ -74,10 +85,21 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
         if not os.path.exists(working_dir):
             os.mkdir(working_dir)
 
+        if not settings.IS_LOCAL and settings.BULK_DOWNLOAD_S3_STREAMING_UPLOAD:
+            # Send the zip file to S3 part by part as it is written, overlapping the upload with its generation
+            streaming_upload = StreamingMultipartUpload(
+                settings.BULK_DOWNLOAD_S3_BUCKET_NAME,
+                settings.USASPENDING_AWS_REGION,
+                zip_file_path,
+                os.path.basename(zip_file_path),
+                endpoint_url=settings.BULK_DOWNLOAD_S3_ENDPOINT_URL,
+            ).start()
+
         write_to_log(message=f"Generating {file_name}", download_job=download_job)
 
         # Generate sources from the JSON request object
         sources = get_download_sources(json_request, origination)
+        sources_to_parse = []
         for source in sources:
             # Parse and write data to the file; if there are no matching columns for a source then add an empty file
             source_column_count = len(source.columns(columns))
@@ -85,11 +107,28 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
                 create_empty_data_file(
                     source, download_job, working_dir, piid, assistance_id, zip_file_path, file_format
                 )
+            elif settings.DOWNLOAD_PIPELINED_EXPORT:
+                download_job.number_of_columns += source_column_count
+                sources_to_parse.append(source)
             else:
                 download_job.number_of_columns += source_column_count
                 parse_source(
                     source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format
                 )
+            notify_streaming_upload(streaming_upload, zip_file_path)
+        if sources_to_parse:
+            parse_sources_concurrently(
+                sources_to_parse,
+                columns,
+                download_job,
+                working_dir,
+                piid,
+                assistance_id,
+                zip_file_path,
+                limit,
+                file_format,
+                streaming_upload,
+            )
         include_data_dictionary = json_request.get("include_data_dictionary")
         if include_data_dictionary:
             add_data_dictionary_to_zip(working_dir, zip_file_path)
@@ -106,11 +145,15 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
     except InvalidParameterException as e:
         exc_msg = "InvalidParameterException was raised while attempting to process the DownloadJob"
         fail_download(download_job, e, exc_msg)
+        if streaming_upload:
+            streaming_upload.abort()
         raise InvalidParameterException(e)
     except Exception as e:
         # Set error message; job_status_id will be set in download_sqs_worker.handle()
         exc_msg = "An exception was raised while attempting to process the DownloadJob"
         fail_download(download_job, e, exc_msg)
+        if streaming_upload:
+            streaming_upload.abort()
         raise Exception(download_job.error_message) from e
     finally:
         # Remove working directory
@@ -141,7 +184,11 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
                 region = settings.USASPENDING_AWS_REGION
                 s3_span.set_tags({"bucket": bucket, "region": region, "file": zip_file_path})
                 start_uploading = time.perf_counter()
-                multipart_upload(bucket, region, zip_file_path, os.path.basename(zip_file_path))
+                if streaming_upload:
+                    # Only the parts written since the last notification are left to upload
+                    streaming_upload.complete()
+                else:
+                    multipart_upload(bucket, region, zip_file_path, os.path.basename(zip_file_path))
                 write_to_log(
                     message=f"Uploading took {time.perf_counter() - start_uploading:.2f}s", download_job=download_job
                 )
@@ -149,6 +196,8 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
                 # Set error message; job_status_id will be set in download_sqs_worker.handle()
                 exc_msg = "An exception was raised while attempting to upload the file"
                 fail_download(download_job, e, exc_msg)
+                if streaming_upload:
+                    streaming_upload.abort()
                 if isinstance(e, InvalidParameterException):
                     raise InvalidParameterException(e)
                 else:
@@ -297,7 +346,9 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
 
     # Generate the query file; values, limits, dates fixed
     export_query = generate_export_query(source_query, limit, source, columns, file_format)
-    temp_file, temp_file_path = generate_export_query_temp_file(export_query, download_job)
+    temp_file, temp_file_path = generate_export_query_temp_file(
+        export_query, download_job, id_table=get_download_id_table(source_query)
+    )
 
     start_time = time.perf_counter()
     try:
@@ -336,6 +387,211 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
         os.remove(temp_file_path)
 
 
+def parse_sources_concurrently(
+    sources,
+    columns,
+    download_job,
+    working_dir,
+    piid,
+    assistance_id,
+    zip_file_path,
+    limit,
+    file_format,
+    streaming_upload=None,
+):
+    """
+    Pipelined alternative to calling parse_source for each source. Every source is exported by its own process which
+    splits the psql COPY output into partitions while it streams in, and each finished partition is added to the zip
+    file here while the exports carry on.
+    """
+    part_queue = multiprocessing.Queue()
+    exports = []
+    try:
+        for source_index, source in enumerate(sources):
+            data_file_name = build_data_file_name(source, download_job, piid, assistance_id)
+            extension = FILE_FORMATS[file_format]["extension"]
+            source.file_name = f"{data_file_name}.{extension}"
+
+            # Each source gets its own directory so partitions with the same name cannot collide
+            source_dir = os.path.join(working_dir, f"source_{source_index}")
+            os.mkdir(source_dir)
+
+            write_to_log(message=f"Preparing to download data as {source.file_name}", download_job=download_job)
+
+            source_query = source.row_emitter(columns)
+            export_query = generate_export_query(source_query, limit, source, columns, file_format)
+            temp_file, temp_file_path = generate_export_query_temp_file(
+                export_query, download_job, id_table=get_download_id_table(source_query)
+            )
+            export_process = multiprocessing.Process(
+                target=export_and_partition_source,
+                args=(
+                    source_index,
+                    temp_file_path,
+                    source_dir,
+                    data_file_name,
+                    file_format,
+                    part_queue,
+                    download_job,
+                ),
+            )
+            exports.append((export_process, temp_file, temp_file_path))
+            export_process.start()
+
+        _zip_partitions_from_queue(
+            part_queue, [export[0] for export in exports], zip_file_path, download_job, streaming_upload
+        )
+    finally:
+        # After a failure the other exports would otherwise carry on writing into the working directory
+        stop_processes([export[0] for export in exports], download_job)
+        # Remove temporary files
+        for _, temp_file, temp_file_path in exports:
+            os.close(temp_file)
+            os.remove(temp_file_path)
+
+
+def stop_processes(processes, download_job=None, timeout=EXPORT_STOP_TIMEOUT):
+    """Terminate any of the processes that are still running and wait for all of them to exit"""
+    for process in processes:
+        if process.is_alive():
+            write_to_log(
+                message=f"Attempting to terminate process (pid {process.pid})", download_job=download_job, is_error=True
+            )
+            process.terminate()
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            # e.g. blocked flushing parts onto a queue that is no longer read
+            process.kill()
+            process.join()
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(1)
+
+
+def _zip_partitions_from_queue(part_queue, export_processes, zip_file_path, download_job, streaming_upload=None):
+    """Add partitions to the zip file as the export processes produce them, until every export has finished"""
+    start_time = time.perf_counter()
+    finished_sources = set()
+    zip_time = 0
+    while len(finished_sources) < len(export_processes):
+        if (
+            download_job
+            and not download_job.monthly_download
+            and (time.perf_counter() - start_time) > MAX_VISIBILITY_TIMEOUT
+        ):
+            raise TimeoutError(
+                f"DownloadJob {download_job.download_job_id} lasted longer than {MAX_VISIBILITY_TIMEOUT / 3600} hours"
+            )
+
+        try:
+            source_index, part_path, row_count = part_queue.get(timeout=WAIT_FOR_PROCESS_SLEEP)
+        except queue.Empty:
+            # A successful export always reports completion before exiting, so any other exit is a failure
+            if any(export_process.exitcode not in (None, 0) for export_process in export_processes):
+                raise Exception("Command failed. Please see the logs for details.")
+            continue
+
+        if part_path is None:
+            finished_sources.add(source_index)
+            download_job.save()
+            continue
+
+        log_time = time.perf_counter()
+        append_files_to_zip_file([part_path], zip_file_path)
+        os.remove(part_path)  # Already in the zip file; no need to hold on to the scratch space
+        notify_streaming_upload(streaming_upload, zip_file_path)
+        zip_time += time.perf_counter() - log_time
+        download_job.number_of_rows += row_count
+
+    for export_process in export_processes:
+        export_process.join()
+        if export_process.exitcode != 0:
+            raise Exception("Command failed. Please see the logs for details.")
+
+    write_to_log(message=f"Writing to zipfile took {zip_time:.4f}s", download_job=download_job)
+
+
+def export_and_partition_source(
+    source_index, temp_sql_file_path, output_dir, data_file_name, file_format, part_queue, download_job=None
+):
+    """
+    Executes a single PSQL command within its own Subprocess, splitting the output into partitions of
+    EXCEL_ROW_LIMIT rows as it streams in. Each partition is put on part_queue as soon as it is complete, followed by
+    a (source_index, None, total row count) message once the export has finished.
+    """
+    # Unwind on terminate so that the psql process below is stopped along with this one
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    download_sql = read_export_query(temp_sql_file_path)
+    with SubprocessTrace(
+        name=f"job.{JOB_TYPE}.download.psql",
+        service="bulk-download",
+        resource=download_sql,
+        span_type=SpanTypes.SQL,
+        output_dir=output_dir,
+    ) as span, tracer.trace(
+        name="postgres.query", service="db_downloaddb", resource=download_sql, span_type=SpanTypes.SQL
+    ), tracer.trace(
+        name="postgres.query", service="postgres", resource=download_sql, span_type=SpanTypes.SQL
+    ):
+        try:
+            log_time = time.perf_counter()
+            temp_env = os.environ.copy()
+            if download_job and not download_job.monthly_download:
+                # Since terminating the process isn't guaranteed to end the DB statement, add timeout to client connection
+                temp_env["PGOPTIONS"] = f"--statement-timeout={settings.DOWNLOAD_DB_TIMEOUT_IN_HOURS}h"
+
+            delim = FILE_FORMATS[file_format]["delimiter"]
+            extension = FILE_FORMATS[file_format]["extension"]
+            total_rows = 0
+            part_count = 0
+            # psql errors go to a file rather than a pipe so they cannot stall the export while it is being read
+            with open(temp_sql_file_path) as sql_file, tempfile.TemporaryFile() as psql_errors:
+                psql_process = subprocess.Popen(
+                    ["psql", "-q", retrieve_db_string(), "-v", "ON_ERROR_STOP=1"],
+                    stdin=sql_file,
+                    stdout=subprocess.PIPE,
+                    stderr=psql_errors,
+                    env=temp_env,
+                )
+                try:
+                    psql_output = io.TextIOWrapper(psql_process.stdout, encoding="utf-8", newline="")
+                    for part_path, row_count in partition_delimited_stream(
+                        psql_output,
+                        output_dir,
+                        delimiter=delim,
+                        row_limit=EXCEL_ROW_LIMIT,
+                        output_name_template=f"{data_file_name}_%s.{extension}",
+                    ):
+                        total_rows += row_count
+                        part_count += 1
+                        part_queue.put((source_index, part_path, row_count))
+                except BaseException:
+                    psql_process.kill()
+                    raise
+
+                if psql_process.wait() != 0:
+                    psql_errors.seek(0)
+                    raise subprocess.CalledProcessError(psql_process.returncode, "psql", psql_errors.read())
+
+            span.set_tag("file_parts", part_count)
+            duration = time.perf_counter() - log_time
+            write_to_log(
+                message=f"Wrote {total_rows} rows of {data_file_name} in {part_count} files, took {duration:.4f} "
+                "seconds",
+                download_job=download_job,
+            )
+            part_queue.put((source_index, None, total_rows))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"PSQL Error: {e.output.decode()}")
+            raise SystemExit(1)
+        except Exception as e:
+            logger.error(e)
+            logger.error(f"Faulty SQL: {Path(temp_sql_file_path).read_text()}")
+            raise e
+
+
 def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_format, download_job=None):
     with SubprocessTrace(
         name=f"job.{JOB_TYPE}.download.zip",
@@ -379,6 +635,16 @@ def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_fo
             raise e
 
 
+def notify_streaming_upload(streaming_upload, zip_file_path):
+    """
+    Everything in front of the central directory of a closed zip file is final: appending to it later starts writing
+    where the central directory begins. Let the streaming upload know it can send those bytes.
+    """
+    if streaming_upload and os.path.exists(zip_file_path):
+        with zipfile.ZipFile(zip_file_path) as zip_file:
+            streaming_upload.notify(zip_file.start_dir)
+
+
 def start_download(download_job):
     # Update job attributes
     download_job.job_status_id = JOB_STATUS_DICT["running"]
@@ -448,7 +714,7 @@ def generate_export_query(source_query, limit, source, columns, file_format):
     return r"\COPY ({}) TO STDOUT {}".format(query_annotated, options)
 
 
-def generate_export_query_temp_file(export_query, download_job, temp_dir=None):
+def generate_export_query_temp_file(export_query, download_job, temp_dir=None, id_table=None):
     write_to_log(message=f"Saving PSQL Query: {export_query}", download_job=download_job, is_debug=True)
     dir_name = "/tmp"
     if temp_dir:
@@ -457,11 +723,26 @@ def generate_export_query_temp_file(export_query, download_job, temp_dir=None):
     (temp_sql_file, temp_sql_file_path) = tempfile.mkstemp(prefix="bd_sql_", dir=dir_name)
 
     with open(temp_sql_file_path, "w") as file:
+        if id_table is not None:
+            # The query joins against a temporary table of IDs that has to be loaded in the same psql session
+            id_table.write_psql_load_commands(file)
         file.write(export_query)
 
     return temp_sql_file, temp_sql_file_path
 
 
+def read_export_query(temp_sql_file_path):
+    """
+    Returns the export query from a query file without any temporary ID table load that precedes it. Trace library
+    parses the SQL, but cannot understand the psql-specific \\COPY command, so standard COPY is returned instead.
+    """
+    download_sql = Path(temp_sql_file_path).read_text()
+    copy_start = download_sql.rfind("\\COPY")
+    if copy_start != -1:
+        download_sql = download_sql[copy_start + 1 :]
+    return download_sql
+
+
 def apply_annotations_to_sql(raw_query, aliases):
     """
     Django's ORM understandably doesn't allow aliases to be the same names as other fields available. However, if we
@@ -569,10 +850,7 @@ def _top_level_split(sql, splitter):
 
 def execute_psql(temp_sql_file_path, source_path, download_job):
     """Executes a single PSQL command within its own Subprocess"""
-    download_sql = Path(temp_sql_file_path).read_text()
-    if download_sql.startswith("\\COPY"):
-        # Trace library parses the SQL, but cannot understand the psql-specific \COPY command. Use standard COPY here.
-        download_sql = download_sql[1:]
+    download_sql = read_export_query(temp_sql_file_path)
     # Stack 3 context managers: (1) psql code, (2) Download replica query, (3) (same) Postgres query
     with SubprocessTrace(
         name=f"job.{JOB_TYPE}.download.psql",
@@ -611,8 +889,7 @@ def execute_psql(temp_sql_file_path, source_path, download_job):
                 # Not logging the command as it can contain the database connection string
                 e.cmd = "[redacted psql command]"
             logger.error(e)
-            sql = subprocess.check_output(["cat", temp_sql_file_path]).decode()
-            logger.error(f"Faulty SQL: {sql}")
+            logger.error(f"Faulty SQL: {download_sql}")
             raise e
 
 
@@ -1,8 +1,24 @@
+import logging
 import os
+import sys
 import zipfile
+import zlib
 
+from django.conf import settings
+from multiprocessing import Pool
 
-def append_files_to_zip_file(file_paths, zip_file_path):
+
+logger = logging.getLogger("console")
+
+COMPRESSION_CHUNK_SIZE = 1024 * 1024
+
+# _write_deflated_member relies on ZipFile internals that are not part of its public API.  They have been stable for
+# a long time, but parallel compression is only used on the Python versions it has been verified with.
+DEFLATED_MEMBER_PYTHON_VERSIONS = ((3, 7), (3, 11))
+DEFLATED_MEMBER_ZIPFILE_ATTRIBUTES = ("_writecheck", "fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+
+
+def append_files_to_zip_file(file_paths, zip_file_path, compression_level=None, workers=None):
     """
     Create zip archive at the specified zip_file_path if it does not exist, and add all the files at provided
     file_paths to it.
@@ -12,8 +28,110 @@ def append_files_to_zip_file(file_paths, zip_file_path):
     it will throw a UserWarning and duplicate the file.
     Use caution in this case by removing the zip in the finally of an exception and also checking for and removing
     the zip if it exists before you begin to create it from scratch
+
+    compression_level and workers default to the DOWNLOAD_ZIP_COMPRESSION_LEVEL and DOWNLOAD_ZIP_WORKERS settings.
+    With more than one worker and more than one file, the files are compressed in parallel worker processes and the
+    compressed data is then written to the zip archive in order.
     """
-    with zipfile.ZipFile(zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+    if compression_level is None:
+        compression_level = settings.DOWNLOAD_ZIP_COMPRESSION_LEVEL
+    if workers is None:
+        workers = settings.DOWNLOAD_ZIP_WORKERS
+
+    if workers > 1 and len(file_paths) > 1:
+        _append_files_to_zip_file_in_parallel(file_paths, zip_file_path, compression_level, workers)
+        return
+
+    with zipfile.ZipFile(
+        zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compression_level
+    ) as zip_file:
         for file_path in file_paths:
             archive_name = os.path.basename(file_path)
             zip_file.write(file_path, archive_name)
+
+
+def _append_files_to_zip_file_in_parallel(file_paths, zip_file_path, compression_level, workers):
+    """
+    Deflate each file into a scratch file next to it in a pool of worker processes, then copy the compressed bytes
+    into the archive behind a standard local file header so the result is an ordinary zip file.  Falls back to
+    ZipFile.write in this process when _write_deflated_member cannot be used with this Python's zipfile.
+    """
+    with zipfile.ZipFile(
+        zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compression_level
+    ) as zip_file:
+        if not _can_write_deflated_members(zip_file):
+            for file_path in file_paths:
+                zip_file.write(file_path, os.path.basename(file_path))
+            return
+
+        compress_args = [(file_path, compression_level) for file_path in file_paths]
+        with Pool(min(workers, len(file_paths))) as pool:
+            # imap keeps the archive in the same order as file_paths while later files are still being compressed
+            for file_path, crc, compress_size, deflated_path in pool.imap(_deflate_file, compress_args):
+                try:
+                    zip_info = zipfile.ZipInfo.from_file(file_path, os.path.basename(file_path))
+                    zip_info.compress_type = zipfile.ZIP_DEFLATED
+                    zip_info.CRC = crc
+                    zip_info.compress_size = compress_size
+                    _write_deflated_member(zip_file, zip_info, deflated_path)
+                finally:
+                    os.remove(deflated_path)
+
+
+def _can_write_deflated_members(zip_file):
+    """Whether zip_file is from a zipfile module that _write_deflated_member is known to work with"""
+    min_version, max_version = DEFLATED_MEMBER_PYTHON_VERSIONS
+    if min_version <= sys.version_info[:2] <= max_version and all(
+        hasattr(zip_file, attribute) for attribute in DEFLATED_MEMBER_ZIPFILE_ATTRIBUTES
+    ):
+        return True
+    logger.warning(
+        f"Parallel zip compression is not verified with Python {sys.version_info[0]}.{sys.version_info[1]}, "
+        f"compressing in a single process instead"
+    )
+    return False
+
+
+def _deflate_file(args):
+    """Raw-deflate a file the same way zipfile does, returning what the archive needs to describe the member"""
+    file_path, compression_level = args
+    deflated_path = f"{file_path}.deflate"
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    compress_size = 0
+    with open(file_path, "rb") as source, open(deflated_path, "wb") as destination:
+        while True:
+            chunk = source.read(COMPRESSION_CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            compressed = compressor.compress(chunk)
+            compress_size += len(compressed)
+            destination.write(compressed)
+        compressed = compressor.flush()
+        compress_size += len(compressed)
+        destination.write(compressed)
+    return file_path, crc, compress_size, deflated_path
+
+
+def _write_deflated_member(zip_file, zip_info, deflated_path):
+    """
+    Add an already deflated member to an open ZipFile. This mirrors what ZipFile.write does once compression is
+    done: write the local file header at the end of the existing members, copy the data, and register the member
+    so that it ends up in the central directory when the archive is closed.  ZipFile has no public API for this, so
+    callers must check _can_write_deflated_members first.
+    """
+    zip_file._writecheck(zip_info)
+    zip_file.fp.seek(zip_file.start_dir)
+    zip_info.header_offset = zip_file.start_dir
+    zip_file.fp.write(zip_info.FileHeader())
+    with open(deflated_path, "rb") as deflated:
+        while True:
+            chunk = deflated.read(COMPRESSION_CHUNK_SIZE)
+            if not chunk:
+                break
+            zip_file.fp.write(chunk)
+    zip_file.start_dir = zip_file.fp.tell()
+    zip_file.filelist.append(zip_info)
+    zip_file.NameToInfo[zip_info.filename] = zip_info
+    zip_file._didModify = True
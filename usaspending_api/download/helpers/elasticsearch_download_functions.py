@@ -1,12 +1,17 @@
-import itertools
 import logging
+import shutil
+import tempfile
 from abc import ABCMeta, abstractmethod
-from typing import Union, List
+from typing import Union, List, Optional, TextIO
 
 from django.conf import settings
 from django.db.models import QuerySet
-from elasticsearch_dsl import A
 
+from usaspending_api.common.elasticsearch.partitioned_scan import (
+    get_num_partitions,
+    partitioned_terms_scan,
+    sliced_scroll_scan,
+)
 from usaspending_api.common.elasticsearch.search_wrappers import AwardSearch, TransactionSearch
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.search.models import AwardSearchView, TransactionSearch as TransactionSearchModel
@@ -14,60 +19,84 @@ from usaspending_api.search.models import AwardSearchView, TransactionSearch as
 logger = logging.getLogger(__name__)
 
 
+class DownloadIdTable:
+    """
+    IDs matched by an Elasticsearch download query. They are spooled to a temporary file while Elasticsearch returns
+    them and loaded into a temporary table by the same psql session that runs the download export, so the download
+    SQL can join against the table instead of carrying every ID in its text.
+    """
+
+    def __init__(self, table_name: str, id_file: TextIO, count: int) -> None:
+        self.table_name = table_name
+        self.id_file = id_file
+        self.count = count
+
+    def write_psql_load_commands(self, sql_file: TextIO) -> None:
+        """Writes the psql commands that create and fill the temporary table, with the IDs inlined as COPY data"""
+        sql_file.write(f"CREATE TEMPORARY TABLE {self.table_name} (id INTEGER PRIMARY KEY);\n")
+        sql_file.write(f"COPY {self.table_name} (id) FROM STDIN;\n")
+        self.id_file.seek(0)
+        shutil.copyfileobj(self.id_file, sql_file)
+        sql_file.write("\\.\n")
+        sql_file.write(f"ANALYZE {self.table_name};\n")
+
+
+def get_download_id_table(queryset: QuerySet) -> Optional[DownloadIdTable]:
+    """
+    Returns the DownloadIdTable a download queryset joins against, if any. It is kept on the queryset's Query so it
+    follows the queryset through the filters, values, slices, and unions that are applied before it is exported.
+    """
+    return getattr(queryset.query, "download_id_table", None)
+
+
 class _ElasticsearchDownload(metaclass=ABCMeta):
     _source_field = None
     _filter_query_func = None
     _search_type = None
+    _id_table_name = None
 
     @classmethod
     def _get_download_ids_generator(cls, search: Union[AwardSearch, TransactionSearch], size: int):
         """
         Takes an AwardSearch or TransactionSearch object (that specifies the index, filter, and source) and returns
-        a generator that yields list of IDs in chunksize SIZE.
+        a generator that yields list of IDs in chunksize SIZE as each partition completes. When ES_DOWNLOAD_ID_SCAN
+        is "sliced_scroll" the IDs are read with ES_DOWNLOAD_SCROLL_SLICES sliced scrolls instead, one list per slice.
         """
         max_retries = 10
+        if settings.ES_DOWNLOAD_ID_SCAN == "sliced_scroll":
+            yield from sliced_scroll_scan(
+                search, cls._source_field, settings.ES_DOWNLOAD_SCROLL_SLICES, retries=max_retries
+            )
+            return
         total = search.handle_count(retries=max_retries)
         if total is None:
             logger.error("Error retrieving total results. Max number of attempts reached.")
             return
-        max_iterations = settings.MAX_DOWNLOAD_LIMIT // size
-        req_iterations = (total // size) + 1
-        num_iterations = min(max(1, req_iterations), max_iterations)
-
-        # Setting the shard_size below works in this case because we are aggregating on a unique field. Otherwise, this
-        # would not work due to the number of records. Other places this is set are in the different spending_by
-        # endpoints which are either routed or contain less than 10k unique values, both allowing for the shard
-        # size to be manually set to 10k.
-        for iteration in range(num_iterations):
-            aggregation = A(
-                "terms",
-                field=cls._source_field,
-                include={"partition": iteration, "num_partitions": num_iterations},
-                size=size,
-                shard_size=size,
-            )
-            search.aggs.bucket("results", aggregation)
-            response = search.handle_execute(retries=max_retries).to_dict()
-
-            if response is None:
-                raise Exception("Breaking generator, unable to reach cluster")
-            results = []
-            for bucket in response["aggregations"]["results"]["buckets"]:
-                results.append(bucket["key"])
-
-            yield results
+        num_partitions = get_num_partitions(total, size, settings.MAX_DOWNLOAD_LIMIT)
+        yield from partitioned_terms_scan(search, cls._source_field, num_partitions, size, retries=max_retries)
 
     @classmethod
-    def _get_download_ids(cls, filters: dict, size: int = 10000) -> QuerySet:
+    def _get_download_ids(cls, filters: dict, size: int = 10000) -> DownloadIdTable:
         """
-        Takes a dictionary of the different download filters and returns a flattened list of ids.
+        Takes a dictionary of the different download filters and streams the matching ids to a temporary file as
+        each partition arrives.
         """
         filter_query = cls._filter_query_func(filters)
         search = cls._search_type().filter(filter_query).source([cls._source_field])
-        ids = cls._get_download_ids_generator(search, size)
-        flat_ids = list(itertools.chain.from_iterable(ids))
-        logger.info(f"Found {len(flat_ids)} {cls._source_field} based on filters")
-        return flat_ids
+        id_file = tempfile.TemporaryFile(mode="w+", prefix="bd_ids_")
+        count = 0
+        for ids in cls._get_download_ids_generator(search, size):
+            id_file.writelines(f"{download_id}\n" for download_id in ids)
+            count += len(ids)
+        logger.info(f"Found {count} {cls._source_field} based on filters")
+        return DownloadIdTable(cls._id_table_name, id_file, count)
+
+    @classmethod
+    def _filter_by_download_ids(cls, queryset: QuerySet, filters: dict, id_column: str) -> QuerySet:
+        id_table = cls._get_download_ids(filters)
+        queryset = queryset.extra(where=[f"{id_column} IN (SELECT id FROM {id_table.table_name})"])
+        queryset.query.download_id_table = id_table
+        return queryset
 
     @classmethod
     @abstractmethod
@@ -79,14 +108,12 @@ class AwardsElasticsearchDownload(_ElasticsearchDownload):
     _source_field = "award_id"
     _filter_query_func = QueryWithFilters.generate_awards_elasticsearch_query
     _search_type = AwardSearch
+    _id_table_name = "temp_download_award_ids"
 
     @classmethod
     def query(cls, filters: dict, values: List[str] = None) -> QuerySet:
         base_queryset = AwardSearchView.objects.all()
-        flat_ids = cls._get_download_ids(filters)
-        queryset = base_queryset.extra(
-            where=[f'"vw_award_search"."award_id" = ANY(SELECT UNNEST(ARRAY{flat_ids}::INTEGER[]))']
-        )
+        queryset = cls._filter_by_download_ids(base_queryset, filters, '"vw_award_search"."award_id"')
         if values:
             queryset = queryset.values(*values)
         return queryset
@@ -96,12 +123,9 @@ class TransactionsElasticsearchDownload(_ElasticsearchDownload):
     _source_field = "transaction_id"
     _filter_query_func = QueryWithFilters.generate_transactions_elasticsearch_query
     _search_type = TransactionSearch
+    _id_table_name = "temp_download_transaction_ids"
 
     @classmethod
     def query(cls, filters: dict) -> QuerySet:
         base_queryset = TransactionSearchModel.objects.all()
-        flat_ids = cls._get_download_ids(filters)
-        queryset = base_queryset.extra(
-            where=[f'"transaction_normalized"."id" = ANY(SELECT UNNEST(ARRAY{flat_ids}::INTEGER[]))']
-        )
-        return queryset
+        return cls._filter_by_download_ids(base_queryset, filters, '"transaction_normalized"."id"')
@@ -0,0 +1,78 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from django.core.management.base import BaseCommand
+
+from usaspending_api.common.csv_helpers import partition_large_delimited_file
+from usaspending_api.download.filestreaming.download_generation import EXCEL_ROW_LIMIT
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_ROW = "{row},CONT_AWD_{row}_9700_SPE2DX16D1500_9700,2020-10-01,{amount:.2f},SOME RECIPIENT NAME LLC,VA,\n"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare single process and parallel compression of download files. The CSV is split into partitions the "
+        "same way download generation does it and both engines zip the partitions, which are then verified."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--file", metavar="FILEPATH", help="Delimited text file to benchmark with")
+        source.add_argument(
+            "--rows", type=int, help="Benchmark with a synthetic CSV of this many rows (about 100 bytes per row)"
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes used by the parallel engine")
+        parser.add_argument("--compression-level", type=int, default=-1, help="zlib compression level (-1 to 9)")
+        parser.add_argument(
+            "--row-limit", type=int, default=EXCEL_ROW_LIMIT, help="Rows per partition, as in download generation"
+        )
+        parser.add_argument("--working-dir", help="Where to write scratch files. Defaults to the system temp dir")
+
+    def handle(self, *args, **options):
+        working_dir = tempfile.mkdtemp(prefix="zip_benchmark_", dir=options["working_dir"])
+        try:
+            source_path = options["file"] or self.write_synthetic_csv(working_dir, options["rows"])
+            partition_dir = os.path.join(working_dir, "partitions")
+            os.mkdir(partition_dir)
+            partition_path = os.path.join(partition_dir, os.path.basename(source_path))
+            shutil.copyfile(source_path, partition_path)
+
+            start = time.perf_counter()
+            file_paths = partition_large_delimited_file(
+                partition_path, row_limit=options["row_limit"], output_name_template="benchmark_%s.csv"
+            )
+            os.remove(partition_path)
+            logger.info(
+                f"Split {os.path.getsize(source_path):,} bytes into {len(file_paths)} partitions in "
+                f"{time.perf_counter() - start:.2f}s"
+            )
+
+            for label, workers in (("single process", 1), (f"{options['workers']} workers", options["workers"])):
+                zip_file_path = os.path.join(working_dir, f"benchmark_{workers}.zip")
+                start = time.perf_counter()
+                append_files_to_zip_file(file_paths, zip_file_path, options["compression_level"], workers)
+                duration = time.perf_counter() - start
+                with zipfile.ZipFile(zip_file_path) as zip_file:
+                    bad_member = zip_file.testzip()
+                if bad_member:
+                    raise RuntimeError(f"{label} produced a corrupt member: {bad_member}")
+                logger.info(f"{label}: {duration:.2f}s, {os.path.getsize(zip_file_path):,} bytes, verified")
+                os.remove(zip_file_path)
+        finally:
+            shutil.rmtree(working_dir)
+
+    @staticmethod
+    def write_synthetic_csv(working_dir, rows):
+        source_path = os.path.join(working_dir, "synthetic.csv")
+        with open(source_path, "w") as source:
+            source.write("id,generated_unique_award_id,action_date,obligation,recipient_name,state,empty\n")
+            for row in range(rows):
+                source.write(SYNTHETIC_ROW.format(row=row, amount=row * 1.37))
+        return source_path
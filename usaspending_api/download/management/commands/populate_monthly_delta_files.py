@@ -23,6 +23,7 @@ from usaspending_api.download.filestreaming.download_generation import (
 )
 from usaspending_api.download.filestreaming.download_source import DownloadSource
 from usaspending_api.download.helpers import pull_modified_agencies_cgacs
+from usaspending_api.download.helpers.elasticsearch_download_functions import get_download_id_table
 from usaspending_api.download.lookups import VALUE_MAPPINGS
 from usaspending_api.references.models import ToptierAgency, SubtierAgency
 
@@ -164,7 +165,8 @@ class Command(BaseCommand):
         source_path = os.path.join(working_dir, "{}.csv".format(source_name))
 
         # Create a unique temporary file with the raw query
-        raw_quoted_query = generate_raw_quoted_query(source.row_emitter(None))  # None requests all headers
+        source_query = source.row_emitter(None)  # None requests all headers
+        raw_quoted_query = generate_raw_quoted_query(source_query)
 
         # The raw query is a union of two other queries, each in parentheses. To do replacement we need to split out
         # each query, apply annotations to each of those, then recombine in a UNION
@@ -178,6 +180,9 @@ class Command(BaseCommand):
 
         (temp_sql_file, temp_sql_file_path) = tempfile.mkstemp(prefix="bd_sql_", dir="/tmp")
         with open(temp_sql_file_path, "w") as file:
+            id_table = get_download_id_table(source_query)
+            if id_table is not None:
+                id_table.write_psql_load_commands(file)
             file.write("\\copy ({}) To STDOUT with CSV HEADER".format(csv_query_annotated))
 
         logger.info("Generated temp SQL file {}".format(temp_sql_file_path))
@@ -185,7 +190,7 @@ class Command(BaseCommand):
         cat_command = subprocess.Popen(["cat", temp_sql_file_path], stdout=subprocess.PIPE)
         try:
             subprocess.check_output(
-                ["psql", "-o", source_path, os.environ["DOWNLOAD_DATABASE_URL"], "-v", "ON_ERROR_STOP=1"],
+                ["psql", "-q", "-o", source_path, os.environ["DOWNLOAD_DATABASE_URL"], "-v", "ON_ERROR_STOP=1"],
                 stdin=cat_command.stdout,
                 stderr=subprocess.STDOUT,
             )
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+
+from usaspending_api.download.filestreaming.download_generation import (
+    generate_export_query_temp_file,
+    read_export_query,
+)
+from usaspending_api.download.helpers.elasticsearch_download_functions import (
+    AwardsElasticsearchDownload,
+    DownloadIdTable,
+    get_download_id_table,
+)
+from usaspending_api.search.models import AwardSearchView
+
+
+class FakePartitionSearch:
+    """Returns every award_id whose remainder matches the partition requested by the terms aggregation"""
+
+    award_ids = list(range(1, 26))
+
+    def __init__(self):
+        self.aggs = MagicMock()
+
+    def handle_count(self, retries):
+        return len(self.award_ids)
+
+    def extra(self, **kwargs):
+        return FakePartitionSearch()
+
+    def handle_execute(self, retries):
+        include = self.aggs.bucket.call_args[0][1].to_dict()["terms"]["include"]
+        keys = [i for i in self.award_ids if i % include["num_partitions"] == include["partition"]]
+        response = MagicMock()
+        response.to_dict.return_value = {"aggregations": {"results": {"buckets": [{"key": key} for key in keys]}}}
+        return response
+
+
+def test_download_ids_are_streamed_into_a_temp_table(monkeypatch, tmp_path):
+    search = MagicMock(**{"filter.return_value.source.return_value": FakePartitionSearch()})
+    monkeypatch.setattr(AwardsElasticsearchDownload, "_filter_query_func", MagicMock())
+    monkeypatch.setattr(AwardsElasticsearchDownload, "_search_type", MagicMock(return_value=search))
+
+    id_table = AwardsElasticsearchDownload._get_download_ids({}, size=5)
+
+    assert id_table.count == 25
+    _, temp_file_path = generate_export_query_temp_file("\\COPY (SELECT 1) TO STDOUT", None, str(tmp_path), id_table)
+    with open(temp_file_path) as file:
+        lines = file.read().splitlines()
+
+    assert lines[:2] == [
+        "CREATE TEMPORARY TABLE temp_download_award_ids (id INTEGER PRIMARY KEY);",
+        "COPY temp_download_award_ids (id) FROM STDIN;",
+    ]
+    assert sorted(int(line) for line in lines[2:27]) == FakePartitionSearch.award_ids
+    assert lines[27:] == ["\\.", "ANALYZE temp_download_award_ids;", "\\COPY (SELECT 1) TO STDOUT"]
+    assert read_export_query(temp_file_path) == "COPY (SELECT 1) TO STDOUT"
+
+
+class FakeSliceSearch:
+    """Returns every award_id whose remainder matches the scroll slice requested"""
+
+    def __init__(self, extra=None):
+        self._extra = extra or {}
+
+    def handle_count(self, retries):
+        raise AssertionError("sliced scrolls do not need a count")
+
+    def source(self, fields):
+        return self
+
+    def extra(self, **kwargs):
+        return FakeSliceSearch({**self._extra, **kwargs})
+
+    def scan(self):
+        slice_ = self._extra["slice"]
+        return [{"award_id": i} for i in FakePartitionSearch.award_ids if i % slice_["max"] == slice_["id"]]
+
+
+def test_download_ids_can_be_read_with_sliced_scrolls(monkeypatch, settings):
+    settings.ES_DOWNLOAD_ID_SCAN = "sliced_scroll"
+    settings.ES_DOWNLOAD_SCROLL_SLICES = 3
+    search = MagicMock(**{"filter.return_value.source.return_value": FakeSliceSearch()})
+    monkeypatch.setattr(AwardsElasticsearchDownload, "_filter_query_func", MagicMock())
+    monkeypatch.setattr(AwardsElasticsearchDownload, "_search_type", MagicMock(return_value=search))
+
+    id_table = AwardsElasticsearchDownload._get_download_ids({})
+
+    assert id_table.count == 25
+    id_table.id_file.seek(0)
+    assert sorted(int(line) for line in id_table.id_file) == FakePartitionSearch.award_ids
+
+
+def test_download_id_table_follows_the_queryset(monkeypatch):
+    id_table = DownloadIdTable("temp_download_award_ids", None, 0)
+    monkeypatch.setattr(AwardsElasticsearchDownload, "_get_download_ids", MagicMock(return_value=id_table))
+
+    queryset = AwardsElasticsearchDownload.query({})
+    queryset = (queryset & AwardSearchView.objects.filter(category="contract")).values("award_id")[:10]
+
+    assert get_download_id_table(queryset) is id_table
+    assert "IN (SELECT id FROM temp_download_award_ids)" in str(queryset.query)
+    assert get_download_id_table(AwardSearchView.objects.all()) is None
@@ -1,3 +1,7 @@
+import multiprocessing
+import signal
+import time
+
 from unittest.mock import MagicMock
 
 from usaspending_api.awards.v2.lookups.lookups import award_type_mapping, contract_type_mapping, idv_type_mapping
@@ -127,3 +131,24 @@ def test_idv_treasury_account_funding_csv_sources():
     VALUE_MAPPINGS["idv_federal_account_funding"]["filter_function"] = original
     assert csv_sources[0].file_type == "treasury_account"
     assert csv_sources[0].source_type == "idv_federal_account_funding"
+
+
+def _ignore_sigterm_and_sleep(ready):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    ready.set()
+    time.sleep(60)
+
+
+def test_stop_processes():
+    finished = multiprocessing.Process(target=time.sleep, args=(0,))
+    running = multiprocessing.Process(target=time.sleep, args=(60,))
+    ready = multiprocessing.Event()
+    stuck = multiprocessing.Process(target=_ignore_sigterm_and_sleep, args=(ready,))
+    for process in (finished, running, stuck):
+        process.start()
+    finished.join()
+    ready.wait(10)
+
+    download_generation.stop_processes([finished, running, stuck], timeout=1)
+
+    assert [process.exitcode for process in (finished, running, stuck)] == [0, -signal.SIGTERM, -signal.SIGKILL]
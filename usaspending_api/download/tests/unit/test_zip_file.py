@@ -2,6 +2,7 @@ import os
 import zipfile
 
 from tempfile import NamedTemporaryFile
+from usaspending_api.download.filestreaming import zip_file
 from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
 
 
@@ -20,3 +21,42 @@ def test_append_files_to_zip_file():
                         os.path.basename(include_file_1.name),
                         os.path.basename(include_file_2.name),
                     ]
+
+
+def test_append_files_to_zip_file_in_parallel(tmp_path):
+    zip_file_path = str(tmp_path / "test.zip")
+    file_paths = []
+    for index in range(3):
+        file_path = tmp_path / f"include_file_{index}.csv"
+        file_path.write_bytes(b"a,b\r\n" + f"{index},this is a test\r\n".encode() * 10000)
+        file_paths.append(str(file_path))
+
+    append_files_to_zip_file(file_paths[:1], zip_file_path)
+    append_files_to_zip_file(file_paths[1:], zip_file_path, compression_level=9, workers=2)
+
+    with zipfile.ZipFile(zip_file_path, "r") as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [os.path.basename(file_path) for file_path in file_paths]
+        for file_path in file_paths:
+            assert zf.read(os.path.basename(file_path)) == open(file_path, "rb").read()
+
+    # Scratch files holding the compressed data are cleaned up
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(path) for path in file_paths] + ["test.zip"])
+
+
+def test_append_files_to_zip_file_in_parallel_falls_back_on_unverified_python(tmp_path, monkeypatch):
+    monkeypatch.setattr(zip_file, "DEFLATED_MEMBER_PYTHON_VERSIONS", ((2, 0), (2, 7)))
+    monkeypatch.setattr(zip_file, "_write_deflated_member", None)  # would fail if called
+    zip_file_path = str(tmp_path / "test.zip")
+    file_paths = []
+    for index in range(2):
+        file_path = tmp_path / f"include_file_{index}.csv"
+        file_path.write_bytes(f"{index},this is a test\r\n".encode() * 1000)
+        file_paths.append(str(file_path))
+
+    append_files_to_zip_file(file_paths, zip_file_path, workers=2)
+
+    with zipfile.ZipFile(zip_file_path, "r") as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [os.path.basename(file_path) for file_path in file_paths]
+        assert zf.read(os.path.basename(file_paths[1])) == open(file_paths[1], "rb").read()
@@ -293,12 +293,19 @@ def convert_award_id_to_guai(award_tuple: tuple) -> tuple:
         return tuple([row[0] for row in cursor.fetchall()])
 
 
+def queue_award_search_refresh(award_tuple: tuple) -> int:
+    """Record awards whose rows in the award search tables need to be re-derived by `matview_runner --incremental`"""
+    sql = "INSERT INTO award_search_refresh_queue (award_id, queued_at) SELECT UNNEST(%s::bigint[]), now()"
+    return execute_database_statement(sql, [list(award_tuple)])
+
+
 def update_awards(award_tuple: Optional[tuple] = None) -> int:
-    """Update Award records using transaction data"""
+    """Update Award records using transaction data. Specific awards are also queued for the award search tables."""
 
     if award_tuple:
         values = [award_tuple, award_tuple, award_tuple]
         predicate = "WHERE tn.award_id IN %s"
+        queue_award_search_refresh(award_tuple)
     else:
         values = None
         predicate = ""
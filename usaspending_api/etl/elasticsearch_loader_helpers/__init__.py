@@ -6,7 +6,9 @@ from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import (
 from usaspending_api.etl.elasticsearch_loader_helpers.extract_data import (
     count_of_records_to_process,
     extract_records,
+    extract_records_in_batches,
     obtain_extract_sql,
+    obtain_partition_boundaries,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.index_config import (
     create_award_type_aliases,
@@ -26,6 +28,7 @@ from usaspending_api.etl.elasticsearch_loader_helpers.transform_data import (
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
     chunks,
     execute_sql_statement,
+    execute_sql_statement_in_batches,
     format_log,
     gen_random_name,
     TaskSpec,
@@ -42,11 +45,14 @@ __all__ = [
     "delete_awards",
     "delete_transactions",
     "execute_sql_statement",
+    "execute_sql_statement_in_batches",
     "extract_records",
+    "extract_records_in_batches",
     "format_log",
     "gen_random_name",
     "load_data",
     "obtain_extract_sql",
+    "obtain_partition_boundaries",
     "set_final_index_config",
     "swap_aliases",
     "take_snapshot",
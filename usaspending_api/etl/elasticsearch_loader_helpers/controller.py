@@ -3,8 +3,9 @@ import logging
 from django.core.management import call_command
 from math import ceil
 from multiprocessing import Pool, Event, Value
+from statistics import mean, median
 from time import perf_counter
-from typing import Generator, List, Tuple
+from typing import Generator, List, Optional, Tuple
 
 from usaspending_api.broker.helpers.last_load_date import update_last_load_date
 from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
@@ -14,10 +15,12 @@ from usaspending_api.etl.elasticsearch_loader_helpers import (
     delete_awards,
     delete_transactions,
     extract_records,
+    extract_records_in_batches,
     format_log,
     gen_random_name,
     load_data,
     obtain_extract_sql,
+    obtain_partition_boundaries,
     set_final_index_config,
     swap_aliases,
     TaskSpec,
@@ -46,6 +49,7 @@ class Controller:
     def __init__(self, config):
         self.config = config
         self.tasks = []
+        self.partition_bounds = None
 
     def prepare_for_etl(self) -> None:
         logger.info(format_log("Assessing data to process"))
@@ -55,7 +59,11 @@ class Controller:
             self.processes = []
             return
 
-        self.config["partitions"] = self.determine_partitions()
+        if self.config["partition_strategy"] == "density":
+            self.partition_bounds = self.determine_density_partitions()
+            self.config["partitions"] = len(self.partition_bounds)
+        else:
+            self.config["partitions"] = self.determine_partitions()
         self.config["processes"] = min(self.config["processes"], self.config["partitions"])
         self.tasks = self.construct_tasks()
 
@@ -77,7 +85,9 @@ class Controller:
         _abort = Event()  # Event which when set signals an error occurred in a subprocess
         parallel_procs = self.config["processes"]
         with Pool(parallel_procs, maxtasksperchild=1, initializer=init_shared_abort, initargs=(_abort,)) as pool:
-            pool.map(extract_transform_load, self.tasks)
+            partition_doc_counts = pool.map(extract_transform_load, self.tasks)
+
+        log_partition_skew([count for count in partition_doc_counts if count is not None])
 
         msg = f"Total documents indexed: {total_doc_success.value}, total document fails: {total_doc_fail.value}"
         logger.info(format_log(msg))
@@ -111,6 +121,27 @@ class Controller:
             return 1
         return ceil(id_range_item_count / self.config["partition_size"])
 
+    def determine_density_partitions(self) -> List[Tuple[int, int]]:
+        """
+        Strategy of partitions that each hold roughly the same number of records, regardless of how sparse
+        the id-range is, by using the sampled distribution of the primary key values as partition boundaries
+        """
+        partition_count = ceil(self.record_count / self.config["partition_size"])
+        boundaries = obtain_partition_boundaries(self.config, partition_count) if partition_count > 1 else []
+        return self.get_id_ranges_from_boundaries(boundaries)
+
+    def get_id_ranges_from_boundaries(self, boundaries: List[Optional[int]]) -> List[Tuple[int, int]]:
+        """Convert the inclusive upper-bound values of each partition into contiguous ranges covering the id-range"""
+        # Many records sharing a single key value can produce repeated boundaries; drop them to avoid empty ranges
+        upper_bounds = sorted({b for b in boundaries if b is not None and self.min_id <= b < self.max_id})
+        upper_bounds.append(self.max_id)
+
+        id_ranges, lower_bound = [], self.min_id
+        for upper_bound in upper_bounds:
+            id_ranges.append((lower_bound, upper_bound))
+            lower_bound = upper_bound + 1
+        return id_ranges
+
     def construct_tasks(self) -> List[TaskSpec]:
         """Create the Task objects w/ the appropriate configuration"""
         name_gen = gen_random_name()
@@ -122,7 +153,10 @@ class Controller:
         return task_list
 
     def configure_task(self, partition_number: int, name_gen: Generator, is_null_partition: bool = False) -> TaskSpec:
-        lower_bound, upper_bound = self.get_id_range_for_partition(partition_number)
+        if is_null_partition:
+            lower_bound, upper_bound = None, None  # the null partition is not bound by the id-range
+        else:
+            lower_bound, upper_bound = self.get_id_range_for_partition(partition_number)
         sql_config = {**self.config, **{"lower_bound": lower_bound, "upper_bound": upper_bound}}
         sql_str = obtain_extract_sql(sql_config, is_null_partition)
 
@@ -130,6 +164,7 @@ class Controller:
             base_table=self.config["base_table"],
             base_table_id=self.config["base_table_id"],
             execute_sql_func=self.config["execute_sql_func"],
+            execute_sql_streaming_func=self.config["execute_sql_streaming_func"],
             index=self.config["index_name"],
             is_incremental=self.config["is_incremental_load"],
             name=next(name_gen),
@@ -137,11 +172,14 @@ class Controller:
             primary_key=self.config["primary_key"],
             field_for_es_id=self.config["field_for_es_id"],
             sql=sql_str,
+            stream_batch_size=self.config["stream_batch_size"],
             transform_func=self.config["data_transform_func"],
             view=self.config["sql_view"],
         )
 
     def get_id_range_for_partition(self, partition_number: int) -> Tuple[int, int]:
+        if self.partition_bounds:
+            return self.partition_bounds[partition_number]
         partition_size = self.config["partition_size"]
         lower_bound = self.min_id + (partition_number * partition_size)
         upper_bound = min(lower_bound + partition_size - 1, self.max_id)
@@ -158,7 +196,22 @@ class Controller:
             raise RuntimeError(f"No delete function implemented for type {self.config['data_type']}")
 
 
-def extract_transform_load(task: TaskSpec) -> None:
+def log_partition_skew(partition_doc_counts: List[int]) -> None:
+    """Report how evenly documents were spread across the processed partitions"""
+    if not partition_doc_counts:
+        return
+    average = mean(partition_doc_counts)
+    skew = max(partition_doc_counts) / average if average else 0
+    msg = (
+        f"Documents per partition: min {min(partition_doc_counts):,} | median {median(partition_doc_counts):,.0f}"
+        f" | max {max(partition_doc_counts):,} | empty partitions {partition_doc_counts.count(0):,}"
+        f" | skew (max/mean) {skew:.2f}"
+    )
+    logger.info(format_log(msg))
+
+
+def extract_transform_load(task: TaskSpec) -> Optional[int]:
+    """Process a single partition, returning the number of documents it produced (None if it did not complete)"""
     if abort.is_set():
         logger.warning(format_log(f"Skipping partition #{task.partition_number} due to previous error", name=task.name))
         return
@@ -169,16 +222,19 @@ def extract_transform_load(task: TaskSpec) -> None:
 
     client = instantiate_elasticsearch_client()
     try:
-        records = task.transform_func(task, extract_records(task))
-        if abort.is_set():
-            f"Prematurely ending partition #{task.partition_number} due to error in another process"
-            logger.warning(format_log(msg, name=task.name))
-            return
-        if len(records) > 0:
-            success, fail = load_data(task, records, client)
+        if task.stream_batch_size:
+            success, fail = _stream_transform_load(task, client)
         else:
-            logger.info(format_log("No records to index", name=task.name))
-            success, fail = 0, 0
+            records = task.transform_func(task, extract_records(task))
+            if abort.is_set():
+                f"Prematurely ending partition #{task.partition_number} due to error in another process"
+                logger.warning(format_log(msg, name=task.name))
+                return
+            if len(records) > 0:
+                success, fail = load_data(task, records, client)
+            else:
+                logger.info(format_log("No records to index", name=task.name))
+                success, fail = 0, 0
         with total_doc_success.get_lock():
             total_doc_success.value += success
         with total_doc_fail.get_lock():
@@ -193,3 +249,28 @@ def extract_transform_load(task: TaskSpec) -> None:
     else:
         msg = f"Partition #{task.partition_number} was successfully processed in {perf_counter() - start:.2f}s"
         logger.info(format_log(msg, name=task.name))
+        return success + fail
+
+
+def _stream_transform_load(task: TaskSpec, client) -> Tuple[int, int]:
+    """
+    Pass fixed-size batches of rows from a server-side cursor through the transform and into Elasticsearch,
+    so that only one batch of the partition is held in memory at a time and indexing begins with the first batch
+    """
+    success, fail, batch_count = 0, 0, 0
+    for records in extract_records_in_batches(task):
+        if abort.is_set():
+            msg = f"Prematurely ending partition #{task.partition_number} due to error in another process"
+            logger.warning(format_log(msg, name=task.name))
+            break
+        batch_count += 1
+        batch_success, batch_fail = load_data(task, task.transform_func(task, records), client)
+        success += batch_success
+        fail += batch_fail
+
+    if batch_count == 0:
+        logger.info(format_log("No records to index", name=task.name))
+    else:
+        msg = f"Streamed {batch_count:,} batches | Success: {success:,} | Fail: {fail:,}"
+        logger.info(format_log(msg, name=task.name, action="Index"))
+    return success, fail
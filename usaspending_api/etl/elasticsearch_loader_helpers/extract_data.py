@@ -1,7 +1,7 @@
 import logging
 
 from time import perf_counter
-from typing import List, Tuple
+from typing import Generator, List, Tuple
 
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec, format_log, execute_sql_statement
 
@@ -31,6 +31,14 @@ MIN_MAX_COUNT_SQL = """
     "\n", ""
 )
 
+PARTITION_BOUNDARIES_SQL = """
+    SELECT percentile_disc(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY "{primary_key}") AS boundaries
+    FROM "{sql_view}"
+    {optional_predicate}
+""".replace(
+    "\n", ""
+)
+
 
 def obtain_min_max_count_sql(config: dict) -> str:
     if "optional_predicate" not in config:
@@ -61,6 +69,23 @@ def count_of_records_to_process(config: dict) -> Tuple[int, int, int]:
     return count, min_id, max_id
 
 
+def obtain_partition_boundaries(config: dict, partition_count: int) -> List[int]:
+    """
+    Sample the actual distribution of primary key values to find the values that split the records
+    into `partition_count` groups of (roughly) equal row counts. Returns the `partition_count - 1` inner boundaries.
+    """
+    start = perf_counter()
+    fractions = ", ".join(str(i / partition_count) for i in range(1, partition_count))
+    if "optional_predicate" not in config:
+        config["optional_predicate"] = ""
+    sql_config = {**config, "fractions": fractions}
+    sql = PARTITION_BOUNDARIES_SQL.format(**sql_config).format(**sql_config)
+    boundaries = execute_sql_statement(sql, True, config["verbose"])[0]["boundaries"]
+    msg = f"Found {len(boundaries or []):,} partition boundaries, took {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, action="Extract"))
+    return boundaries or []
+
+
 def extract_records(task: TaskSpec) -> List[dict]:
     start = perf_counter()
     logger.info(format_log(f"Extracting data from source", name=task.name, action="Extract"))
@@ -74,3 +99,21 @@ def extract_records(task: TaskSpec) -> List[dict]:
     msg = f"{len(records):,} records extracted in {perf_counter() - start:.2f}s"
     logger.info(format_log(msg, name=task.name, action="Extract"))
     return records
+
+
+def extract_records_in_batches(task: TaskSpec) -> Generator[List[dict], None, None]:
+    """Stream the partition's records from the DB in batches of `task.stream_batch_size` rows"""
+    start = perf_counter()
+    logger.info(format_log(f"Streaming data from source", name=task.name, action="Extract"))
+
+    record_count = 0
+    try:
+        for batch in task.execute_sql_streaming_func(task.sql, task.stream_batch_size):
+            record_count += len(batch)
+            yield batch
+    except Exception as e:
+        logger.exception(f"Failed on partition {task.name} with '{task.sql}'")
+        raise e
+
+    msg = f"{record_count:,} records streamed in {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, name=task.name, action="Extract"))
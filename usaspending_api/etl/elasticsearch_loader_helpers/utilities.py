@@ -9,6 +9,7 @@ from elasticsearch import Elasticsearch
 from pathlib import Path
 from random import choice
 from typing import Any, Generator, List, Optional
+from uuid import uuid4
 
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 
@@ -31,6 +32,8 @@ class TaskSpec:
     is_incremental: bool
     execute_sql_func: callable = None
     transform_func: callable = None
+    stream_batch_size: int = 0
+    execute_sql_streaming_func: callable = None
 
 
 def chunks(items: List[Any], size: int) -> List[Any]:
@@ -68,6 +71,37 @@ def execute_sql_statement(cmd: str, results: bool = False, verbose: bool = False
     return rows
 
 
+def execute_sql_statement_in_batches(
+    cmd: str, batch_size: int, verbose: bool = False
+) -> Generator[List[dict], None, None]:
+    """
+    Execute SQL using a single-use psycopg2 connection and a server-side (named) cursor,
+    yielding the results as lists of at most `batch_size` dictionaries. Only one batch of rows
+    is held in memory at a time, regardless of how many rows the query returns.
+    """
+    if verbose:
+        print(cmd)
+
+    connection = psycopg2.connect(dsn=get_database_dsn_string())
+    try:
+        # Named cursors only live inside a transaction block, so autocommit must remain off
+        with connection.cursor(name=f"es_etl_{uuid4().hex}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(cmd)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if columns is None:
+                    # A named cursor's description is only populated after the first fetch
+                    columns = [col[0] for col in cursor.description]
+                yield [dict(zip(columns, row)) for row in rows]
+        connection.rollback()  # read-only, nothing to commit
+    finally:
+        connection.close()
+
+
 def db_rows_to_dict(cursor: psycopg2.extensions.cursor) -> List[dict]:
     """Return a dictionary of all row results from a database connection cursor"""
     columns = [col[0] for col in cursor.description]
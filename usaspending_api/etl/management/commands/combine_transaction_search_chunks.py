@@ -5,7 +5,7 @@ from pathlib import Path
 
 from django.db import connection, transaction
 from django.core.management.base import BaseCommand
-from usaspending_api.common.data_connectors.async_sql_query import async_run_creates
+from usaspending_api.common.data_connectors.async_sql_query import async_run_creates, async_run_dag
 from usaspending_api.common.helpers.sql_helpers import execute_sql_simple
 from usaspending_api.common.helpers.timing_helpers import ConsoleTimer as Timer
 from usaspending_api.common.matview_manager import DEFAULT_CHUNKED_MATIVEW_DIR
@@ -175,21 +175,12 @@ class Command(BaseCommand):
         loop.close()
 
     async def index_with_concurrency(self, index_definitions, index_concurrency):
-        semaphore = asyncio.Semaphore(index_concurrency)
-        tasks = []
-
-        async def create_with_sem(sql, index):
-            async with semaphore:
-                return await async_run_creates(
-                    sql,
-                    wrapper=Timer(f"Creating Index {index}"),
-                )
-
+        steps = []
         for i, sql in enumerate(index_definitions):
-            logger.info(f"Creating future for index: {i} - SQL: {sql}")
-            tasks.append(create_with_sem(sql, i))
+            logger.info(f"Adding build step for index: {i} - SQL: {sql}")
+            steps.append({"name": f"Creating Index {i}", "sql": sql, "depends_on": []})
 
-        return await asyncio.gather(*tasks)
+        return await async_run_dag(steps, index_concurrency)
 
     @transaction.atomic
     def swap_tables(self, rename_indexes, rename_constraints):
@@ -6,12 +6,14 @@ from django.core.management.base import BaseCommand
 from time import perf_counter
 
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
 from usaspending_api.common.elasticsearch.elasticsearch_sql_helpers import ensure_view_exists, drop_etl_view
 from usaspending_api.common.helpers.date_helper import datetime_command_line_argument_type
 from usaspending_api.etl.elasticsearch_loader_helpers import (
     Controller,
     execute_sql_statement,
+    execute_sql_statement_in_batches,
     format_log,
     toggle_refresh_off,
     transform_award_data,
@@ -101,6 +103,24 @@ class Command(BaseCommand):
             default=10000,
             metavar="(default: 10,000)",
         )
+        parser.add_argument(
+            "--partition-strategy",
+            type=str,
+            help="How the ID range is split into partitions. 'id-range' uses equal-width ID ranges of --partition-size "
+            "IDs. 'density' samples the distribution of IDs to build partitions of about --partition-size records each, "
+            "which avoids empty and oversized partitions when the ID space is sparse.",
+            default="id-range",
+            choices=["id-range", "density"],
+        )
+        parser.add_argument(
+            "--stream-batch-size",
+            type=int,
+            help="Stream each partition from a server-side cursor in batches of this many rows, transforming and "
+            "indexing each batch as it arrives, so worker memory is bounded by the batch size rather than the "
+            "partition size. Not supported for --load-type=covid19-faba. Disabled when 0.",
+            default=0,
+            metavar="(default: 0, disabled)",
+        )
         parser.add_argument(
             "--drop-db-view",
             action="store_true",
@@ -136,6 +156,7 @@ class Command(BaseCommand):
             raise SystemExit(1)
         else:
             loader.complete_process()
+            bump_data_version("accounts" if config["load_type"] == "covid19-faba" else "awards")
             if config["drop_db_view"]:
                 logger.info(format_log(f"Dropping SQL view '{config['sql_view']}'"))
                 drop_etl_view(config["sql_view"], True)
@@ -158,14 +179,21 @@ def parse_cli_args(options: dict, es_client) -> dict:
         "index_name",
         "load_type",
         "partition_size",
+        "partition_strategy",
         "process_deletes",
         "deletes_only",
         "processes",
         "skip_counts",
         "skip_delete_index",
+        "stream_batch_size",
     ]
     config = set_config(passthrough_values, options)
 
+    if config["stream_batch_size"] < 0:
+        raise SystemExit("Fatal error: '--stream-batch-size' cannot be negative.")
+    elif config["stream_batch_size"] and not config["supports_streaming"]:
+        raise SystemExit(f"Fatal error: '--stream-batch-size' is not supported for '{config['load_type']}' loads.")
+
     if config["create_new_index"] and not config["index_name"]:
         raise SystemExit("Fatal error: '--create-new-index' requires '--index-name'.")
     elif config["create_new_index"]:
@@ -216,6 +244,7 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "data_transform_func": transform_award_data,
             "data_type": "award",
             "execute_sql_func": execute_sql_statement,
+            "execute_sql_streaming_func": execute_sql_statement_in_batches,
             "extra_null_partition": False,
             "field_for_es_id": "award_id",
             "initial_datetime": default_datetime,
@@ -225,6 +254,7 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "query_alias_prefix": settings.ES_AWARDS_QUERY_ALIAS_PREFIX,
             "required_index_name": settings.ES_AWARDS_NAME_SUFFIX,
             "sql_view": settings.ES_AWARDS_ETL_VIEW_NAME,
+            "supports_streaming": True,
             "stored_date_key": "es_awards",
             "unique_key_field": ES_AWARDS_UNIQUE_KEY_FIELD,
             "write_alias": settings.ES_AWARDS_WRITE_ALIAS,
@@ -237,6 +267,7 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "data_transform_func": transform_transaction_data,
             "data_type": "transaction",
             "execute_sql_func": execute_sql_statement,
+            "execute_sql_streaming_func": execute_sql_statement_in_batches,
             "extra_null_partition": False,
             "field_for_es_id": "transaction_id",
             "initial_datetime": default_datetime,
@@ -246,6 +277,7 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "query_alias_prefix": settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX,
             "required_index_name": settings.ES_TRANSACTIONS_NAME_SUFFIX,
             "sql_view": settings.ES_TRANSACTIONS_ETL_VIEW_NAME,
+            "supports_streaming": True,
             "stored_date_key": "es_transactions",
             "unique_key_field": ES_TRANSACTIONS_UNIQUE_KEY_FIELD,
             "write_alias": settings.ES_TRANSACTIONS_WRITE_ALIAS,
@@ -258,6 +290,7 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "data_transform_func": transform_covid19_faba_data,
             "data_type": "covid19-faba",
             "execute_sql_func": execute_sql_statement,
+            "execute_sql_streaming_func": None,
             "extra_null_partition": True,
             "field_for_es_id": "financial_account_distinct_award_key",
             "initial_datetime": datetime.strptime(f"2020-04-01+0000", "%Y-%m-%d%z"),
@@ -267,6 +300,8 @@ def set_config(passthrough_values: list, arg_parse_options: dict) -> dict:
             "query_alias_prefix": settings.ES_COVID19_FABA_QUERY_ALIAS_PREFIX,
             "required_index_name": settings.ES_COVID19_FABA_NAME_SUFFIX,
             "sql_view": settings.ES_COVID19_FABA_ETL_VIEW_NAME,
+            # Documents are aggregated across all rows of an award, which a batch boundary could split
+            "supports_streaming": False,
             "stored_date_key": ...,
             "unique_key_field": ES_COVID19_FABA_UNIQUE_KEY_FIELD,
             "write_alias": settings.ES_COVID19_FABA_WRITE_ALIAS,
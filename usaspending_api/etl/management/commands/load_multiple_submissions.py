@@ -1,9 +1,12 @@
 import logging
+import multiprocessing
+import queue
+import time
 
 from datetime import timedelta
 from django.core.management import call_command
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.models import Max
 from django.utils.crypto import get_random_string
 from usaspending_api.common.helpers.date_helper import now, datetime_command_line_argument_type
@@ -28,7 +31,8 @@ class Command(BaseCommand):
         "machines in different environments.  Using the database as the queue sidesteps the AWS "
         "SQS 24 hour message lifespan limitation.  There is no hard cap on the number of jobs that "
         "can be run simultaneously, but certainly there is a soft cap imposed by resource "
-        "contention.  During development, 8 were run in parallel without incident."
+        "contention.  During development, 8 were run in parallel without incident.  The --workers "
+        "option does the same thing from a single run by forking that many loader processes."
     )
 
     submission_ids = None
@@ -38,7 +42,9 @@ class Command(BaseCommand):
     processor_id = None
     heartbeat_timer = None
     file_c_chunk_size = 100000
+    workers = 1
     do_not_retry = []
+    submission_timings = None
 
     def add_arguments(self, parser):
         mutually_exclusive_group = parser.add_mutually_exclusive_group(required=True)
@@ -90,6 +96,16 @@ class Command(BaseCommand):
             ),
         )
 
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.workers,
+            help=(
+                "Number of processes to load submissions with.  Each worker claims submissions from the "
+                "submission queue exactly as a separate run of this command would.  Default is 1."
+            ),
+        )
+
         parser.epilog = (
             "And to answer your next question, yes this can be run standalone.  The parallelization "
             "code is pretty minimal and should not add significant time to the overall run time of "
@@ -107,11 +123,17 @@ class Command(BaseCommand):
 
         if self.submission_ids:
             self.add_specific_submissions_to_queue()
-            processed_count = self.load_specific_submissions()
         else:
             since_datetime = self.start_datetime or self.calculate_load_submissions_since_datetime()
             self.add_submissions_since_datetime_to_queue(since_datetime)
-            processed_count = self.load_incremental_submissions()
+
+        start_time = time.perf_counter()
+        if self.workers > 1:
+            submission_timings = self.load_submissions_in_parallel()
+        else:
+            submission_timings = self.load_queued_submissions()
+        processed_count = len(submission_timings)
+        self.report_submission_timings(submission_timings, time.perf_counter() - start_time)
 
         ready, in_progress, abandoned, failed, unrecognized = dlqh.get_queue_status()
         failed_unrecognized_and_abandoned_count = len(failed) + len(unrecognized) + len(abandoned)
@@ -130,6 +152,7 @@ class Command(BaseCommand):
         self.start_datetime = options.get("start_datetime")
         self.report_queue_status_only = options.get("report_queue_status_only")
         self.file_c_chunk_size = options.get("file_c_chunk_size")
+        self.workers = max(options.get("workers") or 1, 1)
         self.processor_id = f"{now()}/{get_random_string()}"
 
         logger.info(f'processor_id = "{self.processor_id}"')
@@ -183,6 +206,69 @@ class Command(BaseCommand):
             f"added to the queue.  {count - added:,} already existed."
         )
 
+    def load_queued_submissions(self):
+        """
+        Loads submissions from the queue until there's nothing left for us.  Returns a list of
+        (submission_id, processor_id, succeeded, seconds) tuples, one per submission loaded.
+        """
+        self.submission_timings = []
+        if self.submission_ids:
+            self.load_specific_submissions()
+        else:
+            self.load_incremental_submissions()
+        return self.submission_timings
+
+    def load_submissions_in_parallel(self):
+        """
+        Forks self.workers processes that each run load_queued_submissions under their own processor_id, so
+        they coordinate through the queue locks like independent runs of this command.  Returns the combined
+        submission timings of all workers.
+        """
+        logger.info(f"Loading submissions using {self.workers:,} workers.")
+
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=self.run_worker, args=(worker_number, results), name=f"worker-{worker_number}"
+            )
+            for worker_number in range(1, self.workers + 1)
+        ]
+        for process in processes:
+            process.start()
+
+        submission_timings = []
+        reported = 0
+        while reported < len(processes):
+            try:
+                submission_timings.extend(results.get(timeout=10))
+                reported += 1
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break
+
+        for process in processes:
+            process.join()
+            if process.exitcode != 0:
+                logger.error(f"{process.name} exited with code {process.exitcode}")
+
+        return submission_timings
+
+    def run_worker(self, worker_number, results):
+        self.processor_id = f"{self.processor_id}/worker-{worker_number}"
+        logger.info(f'processor_id = "{self.processor_id}"')
+        submission_timings = []
+        try:
+            submission_timings = self.load_queued_submissions()
+        finally:
+            results.put(submission_timings)
+            connections.close_all()
+
+    def report_submission_timings(self, submission_timings, elapsed_seconds):
+        logger.info("\n".join(summarize_submission_timings(submission_timings, elapsed_seconds, self.workers)) + "\n")
+
     def load_specific_submissions(self):
         processed_count = 0
         for submission_id in self.submission_ids:
@@ -239,6 +325,7 @@ class Command(BaseCommand):
         if force_reload:
             args.append("--force-reload")
         self.start_heartbeat_timer(submission_id)
+        start_time = time.perf_counter()
         try:
             call_command("load_submission", submission_id, *args)
         except (Exception, SystemExit) as e:
@@ -246,13 +333,21 @@ class Command(BaseCommand):
             logger.exception(f"Submission {submission_id} failed to load")
             dlqh.fail_processing(submission_id, self.processor_id, e)
             self.do_not_retry.append(submission_id)
+            self.record_submission_timing(submission_id, False, start_time)
             self.report_queue_status()
             return False
         self.cancel_heartbeat_timer()
         dlqh.complete_processing(submission_id, self.processor_id)
+        self.record_submission_timing(submission_id, True, start_time)
         self.report_queue_status()
         return True
 
+    def record_submission_timing(self, submission_id, succeeded, start_time):
+        if self.submission_timings is not None:
+            self.submission_timings.append(
+                (submission_id, self.processor_id, succeeded, time.perf_counter() - start_time)
+            )
+
     @staticmethod
     def calculate_load_submissions_since_datetime():
         since = SubmissionAttributes.objects.all().aggregate(Max("published_date"))["published_date__max"]
@@ -278,3 +373,45 @@ class Command(BaseCommand):
         logger.info("Updating final_of_fy")
         populate_final_of_fy()
         logger.info(f"Finished updating final_of_fy.")
+
+
+def summarize_submission_timings(submission_timings, elapsed_seconds, workers=1):
+    """
+    Turns the (submission_id, processor_id, succeeded, seconds) tuples collected while loading into the
+    lines of a timing report.
+    """
+    succeeded = [t for t in submission_timings if t[2]]
+    failed = [t for t in submission_timings if not t[2]]
+    load_seconds = sum(t[3] for t in submission_timings)
+
+    msg = [
+        "Submission load timings:\n",
+        f"Processed {len(submission_timings):,} submissions in {timedelta(seconds=round(elapsed_seconds))} "
+        f"using {workers:,} worker{'s' if workers != 1 else ''}.",
+        f"   {len(succeeded):,} loaded successfully.",
+        f"   {len(failed):,} FAILED.",
+    ]
+    if not submission_timings:
+        return msg
+
+    slowest = max(submission_timings, key=lambda t: t[3])
+    msg.extend(
+        [
+            f"   {timedelta(seconds=round(load_seconds))} total load time, "
+            f"{load_seconds / len(submission_timings):,.1f} seconds per submission on average.",
+            f"   Slowest was submission {slowest[0]} at {slowest[3]:,.1f} seconds.",
+        ]
+    )
+    if elapsed_seconds > 0:
+        msg.append(f"   {len(submission_timings) / (elapsed_seconds / 3600):,.1f} submissions per hour.")
+
+    processors = {}
+    for submission_id, processor_id, _, seconds in submission_timings:
+        count, total = processors.get(processor_id, (0, 0.0))
+        processors[processor_id] = (count + 1, total + seconds)
+    if len(processors) > 1:
+        msg.append("")
+        for processor_id, (count, total) in sorted(processors.items()):
+            msg.append(f"   {processor_id} loaded {count:,} submissions in {timedelta(seconds=round(total))}.")
+
+    return msg
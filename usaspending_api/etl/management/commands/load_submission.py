@@ -4,6 +4,7 @@ import signal
 from datetime import datetime
 from django.core.management.base import CommandError
 from django.db import transaction
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management import load_base
 from usaspending_api.etl.submission_loader_helpers.file_a import get_file_a, load_file_a
@@ -28,6 +29,9 @@ class Command(load_base.Command):
 
     submission_id = None
     file_c_chunk_size = 100000
+    vectorized_file_c = False
+    copy_backend = False
+    copy_flush_bytes = None
     force_reload = False
     skip_final_of_fy_calculation = False
     db_cursor = None
@@ -64,6 +68,30 @@ class Command(load_base.Command):
                 "bigger should be faster... right up until you run out of memory.  Balance carefully."
             ),
         )
+        parser.add_argument(
+            "--vectorized-file-c",
+            action="store_true",
+            help=(
+                "Transform each chunk of File C records with frame-level lookups and write it with COPY rather "
+                "than mapping and saving records one at a time."
+            ),
+        )
+        parser.add_argument(
+            "--copy-backend",
+            action="store_true",
+            help=(
+                "Write File A, B, and C records to the database with COPY rather than batched INSERTs.  Rows/sec "
+                "are logged for each file."
+            ),
+        )
+        parser.add_argument(
+            "--copy-flush-bytes",
+            type=int,
+            help=(
+                "With --copy-backend, how many bytes of CSV are buffered per table before each COPY.  Defaults to "
+                "the SUBMISSION_COPY_FLUSH_BYTES setting."
+            ),
+        )
         super(Command, self).add_arguments(parser)
 
     def handle_loading(self, db_cursor, *args, **options):
@@ -71,6 +99,9 @@ class Command(load_base.Command):
         self.submission_id = options["submission_id"]
         self.force_reload = options["force_reload"]
         self.file_c_chunk_size = options["file_c_chunk_size"]
+        self.vectorized_file_c = options["vectorized_file_c"]
+        self.copy_backend = options["copy_backend"]
+        self.copy_flush_bytes = options["copy_flush_bytes"]
         self.skip_final_of_fy_calculation = options["skip_final_of_fy_calculation"]
         self.db_cursor = db_cursor
 
@@ -94,6 +125,7 @@ class Command(load_base.Command):
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
+        transaction.on_commit(lambda: bump_data_version("accounts"))
 
         logger.info(f"Getting submission {self.submission_id} from Broker...")
         submission_data = self.get_broker_submission()
@@ -115,7 +147,7 @@ class Command(load_base.Command):
         )
         logger.info("Loading File A data")
         start_time = datetime.now()
-        load_file_a(submission_attributes, appropriation_data, self.db_cursor)
+        load_file_a(submission_attributes, appropriation_data, self.db_cursor, self.copy_backend, self.copy_flush_bytes)
         logger.info(f"Finished loading File A data, took {datetime.now() - start_time}")
 
         logger.info("Getting File B data")
@@ -126,7 +158,9 @@ class Command(load_base.Command):
         )
         logger.info("Loading File B data")
         start_time = datetime.now()
-        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor)
+        load_file_b(
+            submission_attributes, prg_act_obj_cls_data, self.db_cursor, self.copy_backend, self.copy_flush_bytes
+        )
         logger.info(f"Finished loading File B data, took {datetime.now() - start_time}")
 
         logger.info("Getting File C data")
@@ -137,7 +171,14 @@ class Command(load_base.Command):
         )
         logger.info("Loading File C data")
         start_time = datetime.now()
-        load_file_c(submission_attributes, self.db_cursor, certified_award_financial)
+        load_file_c(
+            submission_attributes,
+            self.db_cursor,
+            certified_award_financial,
+            self.vectorized_file_c,
+            self.copy_backend,
+            self.copy_flush_bytes,
+        )
         logger.info(f"Finished loading File C data, took {datetime.now() - start_time}")
 
         if self.skip_final_of_fy_calculation:
@@ -1,3 +1,5 @@
+import pandas as pd
+
 from typing import Optional
 
 from usaspending_api.references.models import DisasterEmergencyFundCode
@@ -6,11 +8,15 @@ from usaspending_api.references.models import DisasterEmergencyFundCode
 DISASTER_EMERGENCY_FUND_CODES = None
 
 
-def get_disaster_emergency_fund(row: dict) -> Optional[dict]:
-    """Encapsulate fetching DEFC to utilize a 'poor man's caching' pattern"""
+def _cache_disaster_emergency_fund_codes():
     global DISASTER_EMERGENCY_FUND_CODES
     if not DISASTER_EMERGENCY_FUND_CODES:  # testing for falsy values instead of just null
         DISASTER_EMERGENCY_FUND_CODES = {defc.code: defc for defc in DisasterEmergencyFundCode.objects.all()}
+
+
+def get_disaster_emergency_fund(row: dict) -> Optional[dict]:
+    """Encapsulate fetching DEFC to utilize a 'poor man's caching' pattern"""
+    _cache_disaster_emergency_fund_codes()
     disaster_emergency_fund_code = row["disaster_emergency_fund_code"]
     if not disaster_emergency_fund_code:
         return None
@@ -20,3 +26,15 @@ def get_disaster_emergency_fund(row: dict) -> Optional[dict]:
         raise DisasterEmergencyFundCode.DoesNotExist(
             f"Unable to find disaster emergency fund code for '{disaster_emergency_fund_code}'."
         )
+
+
+def get_disaster_emergency_fund_codes(codes: pd.Series) -> pd.Series:
+    """Vectorized ``get_disaster_emergency_fund``, returning the validated codes (the DEFC primary key) or None"""
+    _cache_disaster_emergency_fund_codes()
+    codes = codes.where(codes.notna() & (codes != ""), None)
+    unknown = codes.notna() & ~codes.isin(DISASTER_EMERGENCY_FUND_CODES)
+    if unknown.any():
+        raise DisasterEmergencyFundCode.DoesNotExist(
+            f"Unable to find disaster emergency fund code for '{codes[unknown].iloc[0]}'."
+        )
+    return codes
@@ -6,7 +6,7 @@ from collections import defaultdict
 from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
 from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import (
     bulk_treasury_appropriation_account_tas_lookup,
     get_treasury_appropriation_account_tas_lookup,
@@ -23,14 +23,14 @@ def get_file_a(submission_attributes, db_cursor):
     return dictfetchall(db_cursor)
 
 
-def load_file_a(submission_attributes, appropriation_data, db_cursor):
+def load_file_a(submission_attributes, appropriation_data, db_cursor, use_copy=False, copy_flush_bytes=None):
     """ Process and load file A broker data (aka TAS balances, aka appropriation account balances). """
     reverse = re.compile("gross_outlay_amount_by_tas_cpe")
     skipped_tas = defaultdict(int)  # tracks count of rows skipped due to "missing" TAS
     bulk_treasury_appropriation_account_tas_lookup(appropriation_data, db_cursor)
 
     # Create account objects
-    save_manager = BulkCreateManager(AppropriationAccountBalances)
+    save_manager = get_bulk_create_manager(AppropriationAccountBalances, use_copy, copy_flush_bytes)
     for row in appropriation_data:
 
         # Check and see if there is an entry for this TAS
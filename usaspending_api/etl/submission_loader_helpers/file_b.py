@@ -6,7 +6,7 @@ from collections import defaultdict
 from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
 from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
 from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class
 from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
@@ -153,13 +153,13 @@ def get_file_b(submission_attributes, db_cursor):
     return data
 
 
-def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
+def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor, use_copy=False, copy_flush_bytes=None):
     """ Process and load file B broker data (aka TAS balances by program activity and object class). """
     reverse = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
     skipped_tas = defaultdict(int)  # tracks count of rows skipped due to "missing" TAS
     bulk_treasury_appropriation_account_tas_lookup(prg_act_obj_cls_data, db_cursor)
 
-    save_manager = BulkCreateManager(FinancialAccountsByProgramActivityObjectClass)
+    save_manager = get_bulk_create_manager(FinancialAccountsByProgramActivityObjectClass, use_copy, copy_flush_bytes)
     for row in prg_act_obj_cls_data:
         # Check and see if there is an entry for this TAS
         treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(row.get("account_num"))
@@ -1,24 +1,34 @@
+import io
 import logging
 import numpy as np
 import pandas as pd
 import re
 
 from collections import deque, defaultdict
-from datetime import datetime
-from django.db import connections
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.db import connection, connections
 from django.utils.functional import cached_property
 
 from usaspending_api.awards.models import FinancialAccountsByAwards
+from usaspending_api.common.long_to_terse import LONG_TO_TERSE_LABELS
 from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
-from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
-from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class_row
-from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_create_manager
+from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import (
+    get_disaster_emergency_fund,
+    get_disaster_emergency_fund_codes,
+)
+from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class_ids, get_object_class_row
+from usaspending_api.etl.submission_loader_helpers.program_activities import (
+    get_program_activity,
+    get_program_activity_ids,
+)
 from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import (
     bulk_treasury_appropriation_account_tas_lookup,
+    get_treasury_account_ids,
     get_treasury_appropriation_account_tas_lookup,
 )
 
@@ -35,7 +45,7 @@ class CertifiedAwardFinancialIterator:
         self._last_id = None
         self._current_chunk = None
 
-    def _retrieve_and_prepare_next_chunk(self):
+    def _retrieve_next_frame(self):
         sql = f"""
             select  c.*
             {CertifiedAwardFinancial.get_from_where(self.submission_attributes.submission_id)}
@@ -45,6 +55,21 @@ class CertifiedAwardFinancialIterator:
         """
 
         award_financial_frame = pd.read_sql(sql, connections["data_broker"])
+        self._last_id = (
+            award_financial_frame["certified_award_financial_id"].max() if award_financial_frame.size else None
+        )
+        return award_financial_frame
+
+    def frames(self):
+        """Yield the raw chunks as frames, for callers that transform whole chunks at a time"""
+        while True:
+            award_financial_frame = self._retrieve_next_frame()
+            if award_financial_frame.size == 0:
+                return
+            yield award_financial_frame
+
+    def _retrieve_and_prepare_next_chunk(self):
+        award_financial_frame = self._retrieve_next_frame()
 
         if award_financial_frame.size > 0:
             award_financial_frame["object_class"] = award_financial_frame.apply(get_object_class_row, axis=1)
@@ -53,11 +78,9 @@ class CertifiedAwardFinancialIterator:
             )
             award_financial_frame = award_financial_frame.replace({np.nan: None})
 
-            self._last_id = award_financial_frame["certified_award_financial_id"].max()
             self._current_chunk = deque(award_financial_frame.to_dict(orient="records"))
 
         else:
-            self._last_id = None
             self._current_chunk = None
 
     def __next__(self):
@@ -109,16 +132,24 @@ class CertifiedAwardFinancial:
     def __iter__(self):
         return CertifiedAwardFinancialIterator(self.submission_attributes, self.chunk_size)
 
+    def frames(self):
+        return CertifiedAwardFinancialIterator(self.submission_attributes, self.chunk_size).frames()
+
 
 def get_file_c(submission_attributes, db_cursor, chunk_size):
     return CertifiedAwardFinancial(submission_attributes, db_cursor, chunk_size)
 
 
-def load_file_c(submission_attributes, db_cursor, certified_award_financial):
+def load_file_c(
+    submission_attributes, db_cursor, certified_award_financial, vectorized=False, use_copy=False, copy_flush_bytes=None
+):
     """
     Process and load file C broker data.
     Note: this should run AFTER the D1 and D2 files are loaded because we try to join to those records to retrieve some
     additional information about the awarding sub-tier agency.
+
+    With vectorized=True each chunk is transformed as a whole with frame-level merges against the reference data and
+    written with COPY instead of being mapped and saved row by row.
     """
 
     if certified_award_financial.count == 0:
@@ -134,7 +165,21 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
 
     bulk_treasury_appropriation_account_tas_lookup(certified_award_financial.account_nums, db_cursor)
 
-    _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse)
+    if vectorized:
+        _save_file_c_frames(
+            certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse
+        )
+    else:
+        _save_file_c_rows(
+            certified_award_financial,
+            total_rows,
+            start_time,
+            skipped_tas,
+            submission_attributes,
+            reverse,
+            use_copy,
+            copy_flush_bytes,
+        )
 
     update_c_to_d_linkages("contract", False, submission_attributes.submission_id)
     update_c_to_d_linkages("assistance", False, submission_attributes.submission_id)
@@ -150,8 +195,17 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
         logger.info("All File C records in Broker loaded into USAspending")
 
 
-def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse):
-    save_manager = BulkCreateManager(FinancialAccountsByAwards)
+def _save_file_c_rows(
+    certified_award_financial,
+    total_rows,
+    start_time,
+    skipped_tas,
+    submission_attributes,
+    reverse,
+    use_copy=False,
+    copy_flush_bytes=None,
+):
+    save_manager = get_bulk_create_manager(FinancialAccountsByAwards, use_copy, copy_flush_bytes)
     for index, row in enumerate(certified_award_financial, 1):
         if not (index % 1000):
             logger.info(f"C File Load: Loading row {index:,} of {total_rows:,} ({datetime.now() - start_time})")
@@ -184,6 +238,96 @@ def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped
     save_manager.save_stragglers()
 
 
+def _save_file_c_frames(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse):
+    rows_processed = 0
+    for award_financial_frame in certified_award_financial.frames():
+        rows_processed += len(award_financial_frame)
+        faba_frame = transform_file_c_frame(award_financial_frame, submission_attributes, reverse, skipped_tas)
+        _copy_frame_to_table(faba_frame, FinancialAccountsByAwards._meta.db_table)
+        logger.info(f"C File Load: Loaded row {rows_processed:,} of {total_rows:,} ({datetime.now() - start_time})")
+
+
+def transform_file_c_frame(award_financial_frame, submission_attributes, reverse, skipped_tas):
+    """
+    Frame-level equivalent of the per-row mapping in _save_file_c_rows. Returns a frame keyed by
+    financial_accounts_by_awards column names, less the rows skipped for missing TAS, which are counted in skipped_tas.
+    """
+    frame = award_financial_frame
+
+    # Like the per-row path, resolve object class and program activity before upper casing the broker values
+    object_class_ids = get_object_class_ids(frame)
+    program_activity_ids = get_program_activity_ids(frame, submission_attributes)
+
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.infer_dtype(frame[column], skipna=True) == "string":
+            frame[column] = frame[column].str.upper()
+
+    treasury_account_ids, tas_rendering_labels = get_treasury_account_ids(frame["account_num"])
+    missing_tas = treasury_account_ids.isna()
+    for tas_rendering_label, count in tas_rendering_labels[missing_tas].value_counts().items():
+        skipped_tas[tas_rendering_label] += count
+
+    value_map_faba = {
+        "submission_id": submission_attributes.submission_id,
+        "reporting_period_start": submission_attributes.reporting_period_start,
+        "reporting_period_end": submission_attributes.reporting_period_end,
+        "treasury_account_id": treasury_account_ids,
+        "object_class_id": object_class_ids,
+        "program_activity_id": program_activity_ids,
+        "disaster_emergency_fund_code": get_disaster_emergency_fund_codes(frame["disaster_emergency_fund_code"]),
+        "distinct_award_key": create_distinct_award_keys(frame),
+        "data_source": "DBR",
+    }
+
+    now = datetime.now(timezone.utc)
+    faba_frame = pd.DataFrame(index=frame.index)
+    for field in FinancialAccountsByAwards._meta.concrete_fields:
+        if field.primary_key:
+            continue
+        if field.column in value_map_faba:
+            faba_frame[field.column] = value_map_faba[field.column]
+            continue
+        if field.name in ("create_date", "update_date"):
+            faba_frame[field.column] = now
+            continue
+
+        broker_field = LONG_TO_TERSE_LABELS.get(field.name, field.name)
+        if broker_field in frame:
+            column = frame[broker_field]
+        elif field.name in frame:
+            column = frame[field.name]
+        else:
+            continue
+
+        if field.name.endswith("date") and pd.api.types.infer_dtype(column, skipna=True) == "string":
+            column = pd.to_datetime(column, errors="coerce").dt.date
+        if reverse and reverse.search(field.name):
+            # Negate as Decimal like store_value does; a float column would lose cents on large amounts
+            column = column.map(lambda value: None if pd.isnull(value) else -1 * Decimal(value))
+        faba_frame[field.column] = column
+
+    return faba_frame[~missing_tas.values]
+
+
+def _copy_frame_to_table(frame, table_name):
+    """Stream a frame whose columns match the table's into the table with COPY, using the default connection"""
+    if frame.empty:
+        return
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False, na_rep="\\N")
+    buffer.seek(0)
+    columns = ", ".join(f'"{column}"' for column in frame.columns)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+
+
+def create_distinct_award_keys(frame):
+    """Vectorized create_distinct_award_key"""
+    key_parts = [frame[column].fillna("").astype(str) for column in ("piid", "parent_award_id", "fain", "uri")]
+    return (key_parts[0] + "|" + key_parts[1] + "|" + key_parts[2] + "|" + key_parts[3]).str.upper()
+
+
 def create_distinct_award_key(row):
     parent_award_id = row.get("parent_award_id") or ""
     return f"{row.get('piid') or ''}|{parent_award_id}|{row.get('fain') or ''}|{row.get('uri') or ''}".upper()
@@ -1,8 +1,11 @@
+import pandas as pd
+
 from usaspending_api.common.containers import Bunch
 from usaspending_api.references.models import ObjectClass
 
 
 OBJECT_CLASSES = None
+OBJECT_CLASS_FRAME = None
 
 
 def reset_object_class_cache():
@@ -11,8 +14,9 @@ def reset_object_class_cache():
     for tests.  So, to keep the performance of caching object classes globally but still
     allow tests to function properly, we need a way to reset the object class cache.
     """
-    global OBJECT_CLASSES
+    global OBJECT_CLASSES, OBJECT_CLASS_FRAME
     OBJECT_CLASSES = None
+    OBJECT_CLASS_FRAME = None
 
 
 def get_object_class_row(row):
@@ -78,3 +82,67 @@ def get_object_class(row_object_class, row_direct_reimbursable):
 
     row = Bunch(object_class=row_object_class, by_direct_reimbursable_fun=row_direct_reimbursable)
     return get_object_class_row(row)
+
+
+def get_object_class_ids(frame):
+    """Vectorized ``get_object_class_row`` for a whole frame of broker rows.
+
+    Args:
+        frame.object_class: object class from the broker
+        frame.by_direct_reimbursable_fun: direct/reimbursable flag from the broker
+            (used only when the object_class is 3 digits instead of 4)
+
+    Returns:
+        a Series of object class ids aligned with the frame
+    """
+    global OBJECT_CLASS_FRAME
+    if OBJECT_CLASS_FRAME is None:
+        OBJECT_CLASS_FRAME = pd.DataFrame(
+            list(ObjectClass.objects.values_list("object_class", "direct_reimbursable", "id")),
+            columns=["object_class", "direct_reimbursable", "object_class_id"],
+        ).drop_duplicates(["object_class", "direct_reimbursable"], keep="last")
+
+    object_class = frame["object_class"]
+    if pd.api.types.is_integer_dtype(object_class):
+        object_class = object_class.astype(str).str.zfill(3)
+
+    # Same DEV-4030 special case as get_object_class_row: all zeroes means "000"
+    object_class = object_class.mask(object_class.str.match(r"^0+$", na=False), "000")
+
+    ocdr = ObjectClass.DIRECT_REIMBURSABLE
+    is_four_digits = object_class.str.len() == 4
+    by_direct_reimbursable_fun = frame["by_direct_reimbursable_fun"].map(
+        ocdr.BY_DIRECT_REIMBURSABLE_FUN_MAPPING.get, na_action="ignore"
+    )
+    leading_digit_direct_reimbursable = object_class.str[0].map(ocdr.LEADING_DIGIT_MAPPING)
+    unmapped = is_four_digits & leading_digit_direct_reimbursable.isna()
+    if unmapped.any():
+        raise ObjectClass.DoesNotExist(
+            f"Unable to find direct/reimbursable flag for object_class={object_class[unmapped].iloc[0]}."
+        )
+    direct_reimbursable = leading_digit_direct_reimbursable.where(is_four_digits, by_direct_reimbursable_fun)
+    object_class = object_class.where(~is_four_digits, object_class.str[1:])
+
+    keys = pd.DataFrame(
+        {
+            "object_class": object_class.str[:2] + "." + object_class.str[2:],
+            # None and NaN both mean "no direct/reimbursable flag"; merge them on an explicit placeholder
+            "direct_reimbursable": direct_reimbursable.where(direct_reimbursable.notna(), ""),
+        }
+    )
+    reference = OBJECT_CLASS_FRAME.assign(
+        direct_reimbursable=OBJECT_CLASS_FRAME["direct_reimbursable"].where(
+            OBJECT_CLASS_FRAME["direct_reimbursable"].notna(), ""
+        )
+    )
+    object_class_ids = keys.merge(reference, how="left", on=["object_class", "direct_reimbursable"])["object_class_id"]
+
+    missing = object_class_ids.isna()
+    if missing.any():
+        first_missing = keys[missing.values].iloc[0]
+        raise ObjectClass.DoesNotExist(
+            f"Unable to find object class for object_class={first_missing['object_class']}, "
+            f"direct_reimbursable={first_missing['direct_reimbursable'] or None}."
+        )
+
+    return pd.Series(object_class_ids.values, index=frame.index).astype("Int64")
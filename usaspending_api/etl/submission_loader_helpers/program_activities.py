@@ -1,9 +1,19 @@
+import pandas as pd
+
 from django.conf import settings
 from django.db import connection
 from usaspending_api.references.models import RefProgramActivity
 
 
 PROGRAM_ACTIVITIES = {}
+PROGRAM_ACTIVITY_KEY_COLUMNS = [
+    "program_activity_code",
+    "program_activity_name",
+    "budget_year",
+    "agency_identifier",
+    "allocation_transfer_agency",
+    "main_account_code",
+]
 
 
 def update_program_activities(submission_id):
@@ -113,3 +123,33 @@ def get_program_activity(row, submission_attributes):
         row["main_account_code"],
     )
     return PROGRAM_ACTIVITIES[key]
+
+
+def get_program_activity_ids(frame, submission_attributes):
+    """Vectorized ``get_program_activity``, returning a Series of program activity ids aligned with the frame"""
+    has_code = frame["program_activity_code"].notna()
+    keys = pd.DataFrame(
+        {
+            "program_activity_code": frame["program_activity_code"],
+            "program_activity_name": frame["program_activity_name"].str.upper(),
+            "budget_year": str(submission_attributes.reporting_fiscal_year),
+            "agency_identifier": frame["agency_identifier"],
+            "allocation_transfer_agency": frame["allocation_transfer_agency"],
+            "main_account_code": frame["main_account_code"],
+        }
+    )[has_code.values]
+
+    reference = pd.DataFrame(
+        [(*key, pa.id) for key, pa in PROGRAM_ACTIVITIES.items()],
+        columns=PROGRAM_ACTIVITY_KEY_COLUMNS + ["program_activity_id"],
+    )
+    # Missing key parts have to match each other, so merge them on an explicit placeholder
+    matched = keys.fillna("").merge(reference.fillna(""), how="left", on=PROGRAM_ACTIVITY_KEY_COLUMNS)
+
+    missing = matched["program_activity_id"].isna()
+    if missing.any():
+        raise KeyError(tuple(keys[missing.values].iloc[0]))
+
+    program_activity_ids = pd.Series(pd.NA, index=frame.index, dtype="Int64")
+    program_activity_ids[has_code.values] = matched["program_activity_id"].values
+    return program_activity_ids
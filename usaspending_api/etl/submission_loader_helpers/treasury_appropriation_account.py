@@ -1,3 +1,5 @@
+import pandas as pd
+
 from usaspending_api.accounts.models import TreasuryAppropriationAccount
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 
@@ -64,3 +66,25 @@ def get_treasury_appropriation_account_tas_lookup(account_num):
     if not tas or not tas[1]:
         return None, f"TAS Account Number (tas_lookup.account_num) '{account_num}' not found in Broker"
     return tas
+
+
+def get_treasury_account_ids(account_nums: pd.Series):
+    """
+    Vectorized ``get_treasury_appropriation_account_tas_lookup``. Returns a Series of treasury account ids aligned
+    with account_nums, missing where the TAS was not found, and a Series of TAS rendering labels (or the reason the
+    TAS was not found) for the same rows.
+    """
+    reference = []
+    for account_num in account_nums.drop_duplicates():
+        treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(
+            None if pd.isna(account_num) else account_num
+        )
+        treasury_account_id = treasury_account.treasury_account_identifier if treasury_account else None
+        reference.append((account_num, treasury_account_id, tas_rendering_label))
+    reference = pd.DataFrame(reference, columns=["account_num", "treasury_account_id", "tas_rendering_label"])
+
+    matched = account_nums.to_frame("account_num").merge(reference, how="left", on="account_num")
+    return (
+        pd.Series(matched["treasury_account_id"].values, index=account_nums.index).astype("Int64"),
+        pd.Series(matched["tas_rendering_label"].values, index=account_nums.index),
+    )
@@ -194,6 +194,40 @@ def test_create_and_load_new_transaction_index(award_data_fixture, elasticsearch
     assert es_award_docs == original_db_tx_count
 
 
+def mock_execute_sql_in_batches(sql, batch_size, verbosity=None):
+    """Batched variant of ``mock_execute_sql``, standing in for the server-side cursor streaming function"""
+    records = execute_sql_to_ordered_dictionary(sql)
+    for i in range(0, len(records), batch_size):
+        yield records[i : i + batch_size]
+
+
+def test_create_and_load_new_award_index_streaming(award_data_fixture, elasticsearch_award_index, monkeypatch):
+    """Test loading a new awards index when each partition is streamed through the ETL in small batches"""
+    client = elasticsearch_award_index.client  # type: Elasticsearch
+
+    assert not client.indices.exists(elasticsearch_award_index.index_name)
+    original_db_awards_count = Award.objects.count()
+
+    elasticsearch_award_index.etl_config["create_new_index"] = True
+    elasticsearch_award_index.etl_config["stream_batch_size"] = 1
+    es_etl_config = _process_es_etl_test_config(client, elasticsearch_award_index)
+    assert es_etl_config["stream_batch_size"] == 1
+
+    monkeypatch.setattr(
+        "usaspending_api.etl.elasticsearch_loader_helpers.extract_data.execute_sql_statement", mock_execute_sql
+    )
+    es_etl_config["execute_sql_func"] = mock_execute_sql
+    es_etl_config["execute_sql_streaming_func"] = mock_execute_sql_in_batches
+    loader = Controller(es_etl_config)
+    loader.prepare_for_etl()
+    loader.dispatch_tasks()
+    set_final_index_config(client, elasticsearch_award_index.index_name)
+
+    assert client.indices.exists(elasticsearch_award_index.index_name)
+    es_award_docs = client.count(index=elasticsearch_award_index.index_name)["count"]
+    assert es_award_docs == original_db_awards_count
+
+
 def test_incremental_load_into_award_index(award_data_fixture, elasticsearch_award_index, monkeypatch):
     """Test the ``elasticsearch_loader`` django management command to incrementally load updated data into the awards ES
     index from the DB, overwriting the doc that was already there
@@ -466,4 +466,19 @@ class TestWithMultipleDatabases(TransactionTestCase):
         # Confirm that submission 3 only received a certified_date change, not a reload.
         assert SubmissionAttributes.objects.get(submission_id=3).create_date == create_date_sub_3
 
+        # Reload everything using multiple workers.  Counts should not budge.
+        submission_ids = list(SubmissionAttributes.objects.values_list("submission_id", flat=True))
+        counts = (
+            AppropriationAccountBalances.objects.count(),
+            FinancialAccountsByProgramActivityObjectClass.objects.count(),
+            FinancialAccountsByAwards.objects.count(),
+        )
+        call_command("load_multiple_submissions", "--submission-ids", *submission_ids, "--workers", 2)
+        assert SubmissionAttributes.objects.count() == len(submission_ids)
+        assert (
+            AppropriationAccountBalances.objects.count(),
+            FinancialAccountsByProgramActivityObjectClass.objects.count(),
+            FinancialAccountsByAwards.objects.count(),
+        ) == counts
+
         # Ok.  That's probably good enough for now.  Thanks for bearing with me.
@@ -4,6 +4,7 @@ import pytest
 from model_mommy import mommy
 
 from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, update_assistance_awards
+from usaspending_api.search.models import AwardSearchRefreshQueue
 
 
 @pytest.mark.django_db
@@ -191,6 +192,19 @@ def test_award_update_with_list():
     assert awards[4].total_obligation == 0
 
 
+@pytest.mark.django_db
+def test_award_update_queues_award_search_refresh():
+    """Updating specific awards queues them for `matview_runner --incremental`, a full update does not."""
+    awards = [mommy.make("awards.Award", generated_unique_award_id=f"AWARD_{i}") for i in range(3)]
+
+    update_awards((awards[0].id, awards[2].id))
+    update_awards((awards[2].id,))
+    update_awards()
+
+    queued = AwardSearchRefreshQueue.objects.values_list("award_id", flat=True)
+    assert sorted(queued) == sorted([awards[0].id, awards[2].id, awards[2].id])
+
+
 @pytest.mark.django_db
 def test_award_update_from_contract_transaction():
     """Test award updates specific to contract transactions."""
@@ -200,6 +200,37 @@ def test_get_id_range_for_partition_with_empty_partitions():
     assert _remove_seen_ids(ctrl, record_ids) == set({})
 
 
+def test_determine_density_partitions_with_sparse_range(monkeypatch):
+    """Checks that partitions built from the sampled key distribution cover the full id-range without gaps"""
+    record_ids = {1, 2, 3, 4, 5, 6, 7, 8, 1000000, 1000001, 5000000, 9999999}
+    etl_config = {"partition_size": 4}
+    ctrl = Controller(etl_config)
+    ctrl.min_id = min(record_ids)
+    ctrl.max_id = max(record_ids)
+    ctrl.record_count = len(record_ids)
+    monkeypatch.setattr(
+        "usaspending_api.etl.elasticsearch_loader_helpers.controller.obtain_partition_boundaries",
+        lambda config, partition_count: [4, 8],
+    )
+    ctrl.partition_bounds = ctrl.determine_density_partitions()
+    ctrl.config["partitions"] = len(ctrl.partition_bounds)
+    assert ctrl.partition_bounds == [(1, 4), (5, 8), (9, 9999999)]
+    assert ctrl.get_id_range_for_partition(1) == (5, 8)
+    assert _remove_seen_ids(ctrl, record_ids) == set({})
+    for partition_idx in range(ctrl.config["partitions"]):
+        lower_bound, upper_bound = ctrl.get_id_range_for_partition(partition_idx)
+        assert len([i for i in record_ids if lower_bound <= i <= upper_bound]) == 4
+
+
+def test_get_id_ranges_from_boundaries_with_repeated_boundaries():
+    """Repeated and out-of-range boundaries (e.g. many records sharing one key) should not produce empty ranges"""
+    ctrl = Controller({"partition_size": 10})
+    ctrl.min_id = 10
+    ctrl.max_id = 100
+    assert ctrl.get_id_ranges_from_boundaries([20, 20, 20, None, 100]) == [(10, 20), (21, 100)]
+    assert ctrl.get_id_ranges_from_boundaries([]) == [(10, 100)]
+
+
 def _remove_seen_ids(ctrl, id_set):
     """Iterates through each bounded id-range, and removes IDs seen"""
     partition_range = range(0, ctrl.config["partitions"])
@@ -0,0 +1,85 @@
+import csv
+import io
+
+from unittest.mock import patch
+
+from usaspending_api.etl.submission_loader_helpers import bulk_create_manager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import (
+    BulkCreateManager,
+    CopyBulkCreateManager,
+    get_bulk_create_manager,
+)
+from usaspending_api.references.models import ObjectClass
+
+
+def _object_class(object_class, name, direct_reimbursable=None):
+    return ObjectClass(
+        major_object_class="20",
+        major_object_class_name="Contractual services and supplies",
+        object_class=object_class,
+        object_class_name=name,
+        direct_reimbursable=direct_reimbursable,
+        direct_reimbursable_name="",
+    )
+
+
+def _copy_manager(**kwargs):
+    copied = []
+
+    def copy_expert(sql, buffer):
+        copied.append((sql, list(csv.reader(io.StringIO(buffer.read())))))
+
+    manager = CopyBulkCreateManager(ObjectClass, **kwargs)
+    cursor = patch.object(bulk_create_manager.connection, "cursor")
+    return manager, cursor, copy_expert, copied
+
+
+def test_copy_bulk_create_manager_writes_csv_rows():
+    manager, cursor, copy_expert, copied = _copy_manager()
+    with cursor as mock_cursor:
+        mock_cursor.return_value.__enter__.return_value.cursor.copy_expert.side_effect = copy_expert
+        manager.append(_object_class("25.1", 'Advisory, "assistance"', "D"))
+        manager.append(_object_class("25.2", "Other services"))
+        assert copied == []
+        manager.save_stragglers()
+
+    assert len(copied) == 1
+    sql, rows = copied[0]
+    assert sql.startswith('COPY "object_class" ("major_object_class", "major_object_class_name", "object_class"')
+    assert sql.endswith("FROM STDIN WITH (FORMAT csv)")
+    assert '"id"' not in sql
+    assert [row[2:6] for row in rows] == [
+        ["25.1", 'Advisory, "assistance"', "D", ""],
+        ["25.2", "Other services", "", ""],
+    ]
+    assert rows[0][6] != ""  # auto_now_add create_date is populated
+    assert manager.total_count == 2
+
+
+def test_copy_bulk_create_manager_distinguishes_null_from_empty_string():
+    manager = CopyBulkCreateManager(ObjectClass)
+    line = manager._to_csv_line(_object_class("25.1", "Advisory"))
+    # direct_reimbursable is NULL, direct_reimbursable_name is an empty string
+    assert ',"Advisory",,"",' in line
+
+
+def test_copy_bulk_create_manager_flushes_on_buffer_size():
+    manager, cursor, copy_expert, copied = _copy_manager(flush_bytes=1)
+    with cursor as mock_cursor:
+        mock_cursor.return_value.__enter__.return_value.cursor.copy_expert.side_effect = copy_expert
+        for i in range(3):
+            manager.append(_object_class(f"25.{i}", "Other services"))
+        assert len(copied) == 3
+        manager.save_stragglers()
+
+    assert len(copied) == 3
+    assert manager.total_count == 3
+    assert manager.rows_per_second() > 0
+
+
+def test_get_bulk_create_manager(settings):
+    settings.SUBMISSION_COPY_FLUSH_BYTES = 1024
+    assert isinstance(get_bulk_create_manager(ObjectClass), BulkCreateManager)
+    assert isinstance(get_bulk_create_manager(ObjectClass, use_copy=True), CopyBulkCreateManager)
+    assert get_bulk_create_manager(ObjectClass, use_copy=True).flush_bytes == 1024
+    assert get_bulk_create_manager(ObjectClass, use_copy=True, copy_flush_bytes=64).flush_bytes == 64
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+import re
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from usaspending_api.accounts.models import TreasuryAppropriationAccount
+from usaspending_api.etl.submission_loader_helpers import (
+    disaster_emergency_fund_codes,
+    file_c,
+    object_class,
+    program_activities,
+    treasury_appropriation_account,
+)
+from usaspending_api.references.models import DisasterEmergencyFundCode, ObjectClass, RefProgramActivity
+from usaspending_api.submissions.models import SubmissionAttributes
+
+REVERSE = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
+ATTNAMES = {"disaster_emergency_fund_code": "disaster_emergency_fund_id"}
+SUBMISSION = SubmissionAttributes(
+    submission_id=7,
+    reporting_fiscal_year=2020,
+    reporting_period_start=date(2020, 4, 1),
+    reporting_period_end=date(2020, 6, 30),
+)
+
+
+@pytest.fixture
+def reference_data():
+    object_classes = [
+        ObjectClass(id=1, object_class="25.1", direct_reimbursable="D"),
+        ObjectClass(id=2, object_class="25.1", direct_reimbursable="R"),
+        ObjectClass(id=3, object_class="25.1", direct_reimbursable=None),
+        ObjectClass(id=4, object_class="00.0", direct_reimbursable=None),
+    ]
+    program_activity = RefProgramActivity(id=11)
+    with patch.object(
+        object_class, "OBJECT_CLASSES", {(oc.object_class, oc.direct_reimbursable): oc for oc in object_classes}
+    ), patch.object(
+        object_class,
+        "OBJECT_CLASS_FRAME",
+        pd.DataFrame(
+            [(oc.object_class, oc.direct_reimbursable, oc.id) for oc in object_classes],
+            columns=["object_class", "direct_reimbursable", "object_class_id"],
+        ),
+    ), patch.object(
+        program_activities,
+        "PROGRAM_ACTIVITIES",
+        {("0001", "EXAMPLE ACTIVITY", "2020", "097", None, "0100"): program_activity},
+    ), patch.object(
+        disaster_emergency_fund_codes, "DISASTER_EMERGENCY_FUND_CODES", {"L": DisasterEmergencyFundCode(code="L")}
+    ), patch.object(
+        treasury_appropriation_account,
+        "TREASURY_ACCOUNT_LOOKUP",
+        {1: (TreasuryAppropriationAccount(treasury_account_identifier=21), "097-X-0100-000"), 2: (None, "097-X-0200")},
+    ):
+        yield
+
+
+def _broker_frame():
+    return pd.DataFrame(
+        {
+            "certified_award_financial_id": [1, 2, 3, 4],
+            "account_num": [1, 1, 2, 3],
+            "object_class": ["1251", "251", "0000", "251"],
+            "by_direct_reimbursable_fun": [None, "r", None, "x"],
+            "program_activity_code": ["0001", None, "0001", "0001"],
+            "program_activity_name": ["example activity", None, "Example Activity", "example activity"],
+            "agency_identifier": ["097", "097", "097", "097"],
+            "allocation_transfer_agency": [None, None, None, None],
+            "main_account_code": ["0100", "0100", "0100", "0100"],
+            "disaster_emergency_fund_code": ["l", None, "", "L"],
+            "piid": ["abc", None, "def", None],
+            "parent_award_id": [None, None, "ghi", None],
+            "fain": [None, "fain1", None, None],
+            "uri": [None, None, None, "uri1"],
+            "transaction_obligated_amou": [10.5, -3.0, np.nan, 1.0],
+            "gross_outlay_amount_by_awa_cpe": [1.0, 2.0, 3.0, np.nan],
+        }
+    )
+
+
+def _per_row_results(frame):
+    frame = frame.copy()
+    frame["object_class"] = frame.apply(object_class.get_object_class_row, axis=1)
+    frame["program_activity"] = frame.apply(
+        program_activities.get_program_activity, axis=1, submission_attributes=SUBMISSION
+    )
+    rows = frame.replace({np.nan: None}).to_dict(orient="records")
+
+    saved = []
+    skipped_tas = file_c.defaultdict(int)
+    with patch.object(file_c, "get_bulk_create_manager") as mock_manager:
+        mock_manager.return_value.append.side_effect = saved.append
+        file_c._save_file_c_rows(rows, len(rows), None, skipped_tas, SUBMISSION, REVERSE)
+    return saved, skipped_tas
+
+
+def test_transform_file_c_frame_matches_per_row_mapping(reference_data):
+    saved, per_row_skipped_tas = _per_row_results(_broker_frame())
+
+    skipped_tas = file_c.defaultdict(int)
+    faba_frame = file_c.transform_file_c_frame(_broker_frame(), SUBMISSION, REVERSE, skipped_tas)
+
+    assert skipped_tas == per_row_skipped_tas
+    assert len(faba_frame) == len(saved) == 2
+
+    compared_columns = [column for column in faba_frame.columns if column not in ("create_date", "update_date")]
+    for (_, vectorized), per_row in zip(faba_frame.iterrows(), saved):
+        for column in compared_columns:
+            expected = getattr(per_row, ATTNAMES.get(column, column))
+            actual = vectorized[column]
+            if expected is None:
+                assert pd.isna(actual), column
+            else:
+                assert actual == expected, column
+
+
+def test_transform_file_c_frame_unknown_object_class(reference_data):
+    frame = _broker_frame()
+    frame.loc[0, "object_class"] = "1999"
+    with pytest.raises(ObjectClass.DoesNotExist):
+        file_c.transform_file_c_frame(frame, SUBMISSION, REVERSE, file_c.defaultdict(int))
+
+
+def test_transform_file_c_frame_keeps_decimal_amounts(reference_data):
+    frame = _broker_frame()
+    frame["transaction_obligated_amou"] = [Decimal("123456789012345678.01"), None, None, Decimal("1.10")]
+
+    faba_frame = file_c.transform_file_c_frame(frame, SUBMISSION, REVERSE, file_c.defaultdict(int))
+
+    assert list(faba_frame["transaction_obligated_amount"]) == [Decimal("-123456789012345678.01"), None]
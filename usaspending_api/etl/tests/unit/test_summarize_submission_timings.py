@@ -0,0 +1,26 @@
+from usaspending_api.etl.management.commands.load_multiple_submissions import summarize_submission_timings
+
+
+def test_summarize_submission_timings():
+    timings = [
+        (1, "proc/worker-1", True, 30.0),
+        (2, "proc/worker-2", False, 5.0),
+        (3, "proc/worker-1", True, 90.0),
+    ]
+    msg = "\n".join(summarize_submission_timings(timings, 100.0, 2))
+
+    assert "Processed 3 submissions in 0:01:40 using 2 workers." in msg
+    assert "2 loaded successfully." in msg
+    assert "1 FAILED." in msg
+    assert "0:02:05 total load time, 41.7 seconds per submission on average." in msg
+    assert "Slowest was submission 3 at 90.0 seconds." in msg
+    assert "108.0 submissions per hour." in msg
+    assert "proc/worker-1 loaded 2 submissions in 0:02:00." in msg
+    assert "proc/worker-2 loaded 1 submissions in 0:00:05." in msg
+
+
+def test_summarize_submission_timings_nothing_loaded():
+    msg = "\n".join(summarize_submission_timings([], 0.5))
+
+    assert "Processed 0 submissions in 0:00:00 using 1 worker." in msg
+    assert "Slowest" not in msg
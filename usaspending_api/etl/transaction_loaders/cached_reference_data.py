@@ -1,28 +1,75 @@
-import psycopg2
-from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
+from collections import Counter
+from django.db import connection
+from types import MappingProxyType
 
 
-SUBTIER_AGENCY_LIST_CACHE = {}
+_EMPTY_MAPPING = MappingProxyType({})
+
+# subtier_code -> agency id, built once per process and shared by the FPDS and FABS loaders. When a subtier code
+# matches several agencies the last one returned wins, which is what the FPDS loader has always used.
+SUBTIER_AGENCY_ID_CACHE = _EMPTY_MAPPING
+
+# Same as above, but limited to subtier codes that match exactly one agency (see Agency.get_by_subtier_only), which
+# is what the FABS loader has always used.
+UNIQUE_SUBTIER_AGENCY_ID_CACHE = _EMPTY_MAPPING
+
+SUBTIER_AGENCY_CACHE_STATS = Counter()
 
 
 def _fetch_reference_data():
-    global SUBTIER_AGENCY_LIST_CACHE
-    with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
-        with connection.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
-            sql = (
-                "SELECT * FROM subtier_agency "
-                "JOIN agency "
-                "ON subtier_agency.subtier_agency_id = agency.subtier_agency_id"
-            )
-
-            cursor.execute(sql)
-            SUBTIER_AGENCY_LIST_CACHE = {result["subtier_code"]: result for result in cursor.fetchall()}
-
-
-def subtier_agency_list():
-    """Returns all rows from subtier_agency table. Does NOT refresh if called twice,
-    and does NOT make a copy that you can modify"""
-    if not SUBTIER_AGENCY_LIST_CACHE:
+    global SUBTIER_AGENCY_ID_CACHE, UNIQUE_SUBTIER_AGENCY_ID_CACHE
+    with connection.cursor() as cursor:
+        sql = (
+            "SELECT subtier_agency.subtier_code, agency.id FROM subtier_agency "
+            "JOIN agency "
+            "ON subtier_agency.subtier_agency_id = agency.subtier_agency_id "
+            "ORDER BY agency.id"
+        )
+
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+
+    agency_ids = {}
+    match_counts = Counter()
+    for subtier_code, agency_id in rows:
+        agency_ids[subtier_code] = agency_id
+        match_counts[subtier_code] += 1
+
+    SUBTIER_AGENCY_ID_CACHE = MappingProxyType(agency_ids)
+    UNIQUE_SUBTIER_AGENCY_ID_CACHE = MappingProxyType(
+        {code: agency_id for code, agency_id in agency_ids.items() if match_counts[code] == 1}
+    )
+    SUBTIER_AGENCY_CACHE_STATS["loads"] += 1
+
+
+def refresh_subtier_agency_cache():
+    """Reload the subtier agency mappings from the database, e.g. after agencies have been loaded mid-process"""
+    _fetch_reference_data()
+
+
+def invalidate_subtier_agency_cache():
+    """Drop the subtier agency mappings so that the next lookup reloads them"""
+    global SUBTIER_AGENCY_ID_CACHE, UNIQUE_SUBTIER_AGENCY_ID_CACHE
+    SUBTIER_AGENCY_ID_CACHE = _EMPTY_MAPPING
+    UNIQUE_SUBTIER_AGENCY_ID_CACHE = _EMPTY_MAPPING
+
+
+def subtier_agency_ids(unique_only=False):
+    """Returns a read-only subtier_code -> agency id mapping. Loads it on first use but does NOT refresh it after
+    that, and does NOT make a copy, so holding on to the result is cheap"""
+    if SUBTIER_AGENCY_ID_CACHE is _EMPTY_MAPPING:
         _fetch_reference_data()
 
-    return SUBTIER_AGENCY_LIST_CACHE.copy()
+    return UNIQUE_SUBTIER_AGENCY_ID_CACHE if unique_only else SUBTIER_AGENCY_ID_CACHE
+
+
+def get_subtier_agency_id(subtier_code, unique_only=False):
+    """Look up the agency id for a subtier code, counting hits and misses in SUBTIER_AGENCY_CACHE_STATS"""
+    agency_id = subtier_agency_ids(unique_only).get(subtier_code)
+    SUBTIER_AGENCY_CACHE_STATS["misses" if agency_id is None else "hits"] += 1
+    return agency_id
+
+
+def subtier_agency_cache_stats():
+    """Returns a snapshot of the hit, miss and load counters"""
+    return {key: SUBTIER_AGENCY_CACHE_STATS[key] for key in ("hits", "misses", "loads")}
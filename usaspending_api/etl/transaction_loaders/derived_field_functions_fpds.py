@@ -1,8 +1,7 @@
 from datetime import datetime, timezone
-from usaspending_api.broker.helpers.get_business_categories import get_business_categories
 from usaspending_api.common.helpers.date_helper import cast_datetime_to_utc
 from usaspending_api.common.helpers.date_helper import fy
-from usaspending_api.etl.transaction_loaders.cached_reference_data import subtier_agency_list
+from usaspending_api.etl.transaction_loaders.cached_reference_data import get_subtier_agency_id
 
 
 def calculate_fiscal_year(broker_input):
@@ -18,17 +17,13 @@ def calculate_funding_agency(broker_input):
 
 
 def _fetch_subtier_agency_id(code):
-    return subtier_agency_list().get(code, {}).get("id")
+    return get_subtier_agency_id(code)
 
 
 def current_datetime(broker_input):
     return datetime.now(timezone.utc)
 
 
-def business_categories(broker_input):
-    return get_business_categories(broker_input, "fpds")
-
-
 def created_at(broker_input):
     return cast_datetime_to_utc(broker_input["created_at"])
 
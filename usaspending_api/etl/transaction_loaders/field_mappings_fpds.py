@@ -4,7 +4,6 @@ from usaspending_api.etl.transaction_loaders.derived_field_functions_fpds import
     calculate_awarding_agency,
     calculate_funding_agency,
     current_datetime,
-    business_categories,
     created_at,
     updated_at,
 )
@@ -362,7 +361,7 @@ transaction_normalized_functions = {
     "create_date": current_datetime,  # Data loader won't add this value if it's an update
     "update_date": current_datetime,
     "action_date": lambda broker: truncate_timestamp(broker["action_date"]),
-    "business_categories": business_categories,
+    # "business_categories" is derived for the whole chunk at once in fpds_loader._transform_objects
 }
 
 # broker column name -> usaspending column name
@@ -1,8 +1,12 @@
 import logging
 from psycopg2.extras import DictCursor
 from psycopg2 import Error
-from django.db import connection
+from django.db import connection, transaction
 
+from usaspending_api.broker.helpers.get_business_categories import (
+    get_business_categories_bulk,
+    rows_to_business_category_columns,
+)
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
     transaction_normalized_nonboolean_columns,
@@ -15,6 +19,11 @@ from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
 )
 from usaspending_api.etl.transaction_loaders.data_load_helpers import capitalize_if_string, false_if_null
 from usaspending_api.etl.transaction_loaders.generic_loaders import (
+    bulk_insert_awards,
+    bulk_insert_transaction_fpds,
+    bulk_insert_transaction_normalized,
+    bulk_update_transaction_fpds,
+    bulk_update_transaction_normalized,
     update_transaction_fpds,
     update_transaction_normalized,
     insert_transaction_normalized,
@@ -84,11 +93,15 @@ def delete_stale_fpds(detached_award_procurement_ids):
         return awards_touched
 
 
-def load_fpds_transactions(chunk):
+def load_fpds_transactions(chunk, bulk=False):
     """
     Run transaction load for the provided ids. This will create any new rows in other tables to support the transaction
     data, but does NOT update "secondary" award values like total obligations or C -> D linkages.
 
+    When bulk is True, awards and transactions for the whole chunk are looked up and written with a handful of
+    set-based statements instead of several round trips per transaction. If the set-based load fails, the chunk
+    is reloaded one transaction at a time so that the failing records can be identified.
+
     returns ids for each award touched
     """
     with Timer() as timer:
@@ -98,7 +111,14 @@ def load_fpds_transactions(chunk):
             if broker_transactions:
                 load_objects = _transform_objects(broker_transactions)
 
-                retval = _load_transactions(load_objects)
+                if bulk:
+                    try:
+                        retval = _load_transactions_in_bulk(load_objects)
+                    except Error as e:
+                        logger.warning(f"Bulk load failed, reloading batch one transaction at a time.\nDetails: {e}")
+                        retval = _load_transactions(_transform_objects(broker_transactions))
+                else:
+                    retval = _load_transactions(load_objects)
     logger.info("batch completed in {}".format(timer.as_string(timer.elapsed)))
     return retval
 
@@ -136,7 +156,12 @@ def _create_load_object(broker_object, non_boolean_column_map, boolean_column_ma
 def _transform_objects(broker_objects):
     retval = []
 
-    for broker_object in broker_objects:
+    broker_objects = list(broker_objects)
+    business_categories = get_business_categories_bulk(
+        rows_to_business_category_columns(broker_objects, "fpds"), "fpds"
+    )
+
+    for broker_object, categories in zip(broker_objects, business_categories):
         connected_objects = {
             # award. NOT used if a matching award is found later
             "award": _create_load_object(broker_object, award_nonboolean_columns, None, award_functions),
@@ -150,6 +175,7 @@ def _transform_objects(broker_objects):
                 transaction_fpds_functions,
             ),
         }
+        connected_objects["transaction_normalized"]["business_categories"] = categories
         retval.append(connected_objects)
 
     return retval
@@ -168,7 +194,7 @@ def _load_transactions(load_objects):
                 award_id = _matching_award(cursor, load_object)
                 if not award_id:
                     # If there is no award, we need to create one
-                    award_id = insert_award(cursor, load_object)
+                    award_id = _insert_award_if_still_missing(cursor, load_object)
 
                 load_object["transaction_normalized"]["award_id"] = award_id
                 ids_of_awards_created_or_updated.add(award_id)
@@ -196,8 +222,122 @@ def _load_transactions(load_objects):
     return list(ids_of_awards_created_or_updated)
 
 
+def _load_transactions_in_bulk(load_objects):
+    """returns ids for each award touched"""
+    if any(load_object["transaction_fpds"]["unique_award_key"] is None for load_object in load_objects):
+        # Without a key to match on, every such transaction creates its own award; leave that to the per-row load
+        return _load_transactions(load_objects)
+
+    # The per-row load keeps the last version of a transaction that appears more than once in a chunk
+    load_objects = list(
+        {
+            load_object["transaction_fpds"]["detached_award_proc_unique"]: load_object for load_object in load_objects
+        }.values()
+    )
+
+    with transaction.atomic():
+        with connection.connection.cursor(cursor_factory=DictCursor) as cursor:
+            # AWARD GET OR CREATE
+            award_ids = _matching_awards(cursor, {lo["transaction_fpds"]["unique_award_key"] for lo in load_objects})
+            # Like the per-row load, a new award is created from the first of its transactions in the chunk
+            new_awards = {}
+            for load_object in load_objects:
+                unique_award_key = load_object["transaction_fpds"]["unique_award_key"]
+                if unique_award_key not in award_ids:
+                    new_awards.setdefault(unique_award_key, load_object)
+            if new_awards:
+                # Another process may be creating some of the same awards; once it commits they will be found
+                _lock_unique_award_keys(cursor, new_awards)
+                award_ids.update(_matching_awards(cursor, new_awards))
+                new_awards = {key: lo for key, lo in new_awards.items() if key not in award_ids}
+            if new_awards:
+                award_ids.update(bulk_insert_awards(cursor, list(new_awards.values())))
+
+            for load_object in load_objects:
+                load_object["transaction_normalized"]["award_id"] = award_ids[
+                    load_object["transaction_fpds"]["unique_award_key"]
+                ]
+
+            # TRANSACTION UPSERT
+            transaction_ids = _lookup_existing_transactions(
+                cursor, [lo["transaction_fpds"]["detached_award_proc_unique"] for lo in load_objects]
+            )
+            objects_to_update, objects_to_insert = [], []
+            for load_object in load_objects:
+                transaction_id = transaction_ids.get(load_object["transaction_fpds"]["detached_award_proc_unique"])
+                if transaction_id:
+                    load_object["transaction_normalized"]["id"] = transaction_id
+                    load_object["transaction_fpds"]["transaction_id"] = transaction_id
+                    objects_to_update.append(load_object)
+                else:
+                    objects_to_insert.append(load_object)
+
+            if objects_to_update:
+                bulk_update_transaction_fpds(cursor, objects_to_update)
+                bulk_update_transaction_normalized(cursor, objects_to_update)
+                logger.debug(f"updated {len(objects_to_update):,} fpds transactions")
+
+            if objects_to_insert:
+                # transaction_normalized and transaction_fpds should be one-to-one
+                new_transaction_ids = bulk_insert_transaction_normalized(cursor, objects_to_insert)
+                for load_object in objects_to_insert:
+                    load_object["transaction_fpds"]["transaction_id"] = new_transaction_ids[
+                        load_object["transaction_normalized"]["transaction_unique_id"]
+                    ]
+                bulk_insert_transaction_fpds(cursor, objects_to_insert)
+                logger.debug(f"created {len(objects_to_insert):,} fpds transactions")
+
+    return list(set(award_ids[lo["transaction_fpds"]["unique_award_key"]] for lo in load_objects))
+
+
+def _matching_awards(cursor, unique_award_keys):
+    """Find the awards, if any, for a set of unique_award_keys. Returns a map of unique_award_key to award id"""
+    cursor.execute(
+        "select generated_unique_award_id, id from awards where generated_unique_award_id = any(%s)",
+        (list(unique_award_keys),),
+    )
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def _lock_unique_award_keys(cursor, unique_award_keys):
+    """
+    awards.generated_unique_award_id is not unique, so loads running in parallel (--processes) must serialize creating
+    awards or two chunks with transactions of the same new award would each create it.  Takes a transaction-level
+    advisory lock per unique_award_key, in sorted order so that two chunks cannot deadlock.
+    """
+    cursor.execute(
+        "select pg_advisory_xact_lock(hashtext(k)) from (select k from unnest(%s::text[]) k order by k) sorted_keys",
+        (list(unique_award_keys),),
+    )
+
+
+def _insert_award_if_still_missing(cursor, load_object):
+    """
+    Create the award for this transaction unless a parallel load created it since it was looked up.  The per-row load
+    runs in autocommit, so this holds a session-level advisory lock on the unique_award_key around the insert.
+    """
+    unique_award_key = load_object["transaction_fpds"]["unique_award_key"]
+    if unique_award_key is None:
+        return insert_award(cursor, load_object)
+    cursor.execute("select pg_advisory_lock(hashtext(%s))", (unique_award_key,))
+    try:
+        return _matching_award(cursor, load_object) or insert_award(cursor, load_object)
+    finally:
+        cursor.execute("select pg_advisory_unlock(hashtext(%s))", (unique_award_key,))
+
+
+def _lookup_existing_transactions(cursor, detached_award_proc_uniques):
+    """find existing fpds transactions, if any. Returns a map of detached_award_proc_unique to transaction id"""
+    cursor.execute(
+        "select detached_award_proc_unique, transaction_id from transaction_fpds "
+        "where detached_award_proc_unique = any(%s)",
+        (list(detached_award_proc_uniques),),
+    )
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
 def _matching_award(cursor, load_object):
-    """ Try to find an award for this transaction to belong to by unique_award_key"""
+    """Try to find an award for this transaction to belong to by unique_award_key"""
     find_matching_award_sql = "select id from awards where generated_unique_award_id = '{}'".format(
         load_object["transaction_fpds"]["unique_award_key"]
     )
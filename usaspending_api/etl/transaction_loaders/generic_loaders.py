@@ -1,4 +1,7 @@
-from usaspending_api.etl.transaction_loaders.data_load_helpers import format_insert_or_update_column_sql
+from usaspending_api.etl.transaction_loaders.data_load_helpers import (
+    format_bulk_insert_list_column_sql,
+    format_insert_or_update_column_sql,
+)
 
 
 def insert_award(cursor, load_object):
@@ -39,3 +42,66 @@ def insert_transaction_fpds(cursor, load_object):
     cursor.execute(transaction_fpds_sql)
     created_transaction_fpds = cursor.fetchall()
     return created_transaction_fpds
+
+
+def bulk_insert_awards(cursor, load_objects):
+    """Insert one award per load object, returning a map of generated_unique_award_id to the new award id"""
+    columns, values = format_bulk_insert_list_column_sql(cursor, load_objects, "award")
+    insert_awards_sql = "INSERT INTO awards {} VALUES {} RETURNING generated_unique_award_id, id".format(
+        columns, values
+    )
+    cursor.execute(insert_awards_sql)
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def bulk_insert_transaction_normalized(cursor, load_objects):
+    """Insert the transactions, returning a map of transaction_unique_id to the new transaction_normalized id"""
+    columns, values = format_bulk_insert_list_column_sql(cursor, load_objects, "transaction_normalized")
+    transaction_normalized_sql = "INSERT INTO transaction_normalized {} VALUES {} RETURNING transaction_unique_id, id"
+    cursor.execute(transaction_normalized_sql.format(columns, values))
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def bulk_insert_transaction_fpds(cursor, load_objects):
+    columns, values = format_bulk_insert_list_column_sql(cursor, load_objects, "transaction_fpds")
+    transaction_fpds_sql = "INSERT INTO transaction_fpds {} VALUES {} RETURNING transaction_id".format(columns, values)
+    cursor.execute(transaction_fpds_sql)
+    return cursor.fetchall()
+
+
+def bulk_update_transaction_normalized(cursor, load_objects):
+    """Expects each transaction_normalized load object to contain the "id" of the row to update"""
+    _bulk_update_from_staging_table(cursor, load_objects, "transaction_normalized", "transaction_normalized", "id")
+
+
+def bulk_update_transaction_fpds(cursor, load_objects):
+    _bulk_update_from_staging_table(
+        cursor, load_objects, "transaction_fpds", "transaction_fpds", "detached_award_proc_unique"
+    )
+
+
+def _bulk_update_from_staging_table(cursor, load_objects, type, table, key_column):
+    """
+    Insert the new values into a temporary staging table that mirrors the column types of the destination table,
+    then update every matching destination row in a single statement
+    """
+    keys = list(load_objects[0][type].keys())
+    staging_table = "temp_fpds_loader_{}_updates".format(table)
+    columns, values = format_bulk_insert_list_column_sql(cursor, load_objects, type)
+    update_pairs = ",".join(
+        ' "{key}"=s."{key}"'.format(key=key) for key in keys if key not in ["create_date", "created_at", key_column]
+    )
+
+    cursor.execute("DROP TABLE IF EXISTS {}".format(staging_table))
+    cursor.execute(
+        "CREATE TEMPORARY TABLE {} AS SELECT {} FROM {} LIMIT 0".format(
+            staging_table, ",".join('"{}"'.format(key) for key in keys), table
+        )
+    )
+    cursor.execute("INSERT INTO {} {} VALUES {}".format(staging_table, columns, values))
+    cursor.execute(
+        'UPDATE {table} AS t SET {pairs} FROM {staging_table} AS s WHERE t."{key}" = s."{key}"'.format(
+            table=table, pairs=update_pairs, staging_table=staging_table, key=key_column
+        )
+    )
+    cursor.execute("DROP TABLE {}".format(staging_table))
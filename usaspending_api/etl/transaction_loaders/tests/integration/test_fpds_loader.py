@@ -114,3 +114,33 @@ def test_load_source_procurement_by_ids():
     assert transactions_by_id[101].fiscal_year == 2010
     assert transactions_by_id[201].fiscal_year == 2010
     assert transactions_by_id[301].fiscal_year == 2011
+
+
+@pytest.mark.django_db
+def test_load_source_procurement_by_ids_in_bulk():
+    """The set-based load should produce the same records as the per-row load, both when inserting and updating"""
+    source_procurement_id_list = [101, 201, 301]
+    _assemble_source_procurement_records(source_procurement_id_list)
+
+    call_command("load_fpds_transactions", "--bulk", "--ids", *source_procurement_id_list)
+    # Loading the same records again exercises the update path
+    call_command("load_fpds_transactions", "--bulk", "--ids", *source_procurement_id_list)
+
+    usaspending_transactions = TransactionFPDS.objects.all()
+    assert len(usaspending_transactions) == 3
+    assert {_.detached_award_procurement_id for _ in usaspending_transactions} == {101, 201, 301}
+    assert {_.transaction.transaction_unique_id for _ in usaspending_transactions} == {"101", "201", "301"}
+
+    usaspending_awards = Award.objects.all()
+    assert len(usaspending_awards) == 1
+    new_award = usaspending_awards[0]
+    assert {_.transaction.award_id for _ in usaspending_transactions} == {new_award.id}
+    assert new_award.transaction_unique_id == "101"
+    assert new_award.latest_transaction.transaction_unique_id == "301"
+    assert new_award.earliest_transaction.transaction_unique_id == "101"
+
+    transactions_by_id = {
+        transaction.detached_award_procurement_id: transaction.transaction for transaction in usaspending_transactions
+    }
+    assert transactions_by_id[101].fiscal_year == 2010
+    assert transactions_by_id[301].fiscal_year == 2011
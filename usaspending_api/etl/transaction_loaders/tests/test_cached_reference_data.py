@@ -0,0 +1,47 @@
+import pytest
+
+from unittest.mock import MagicMock, patch
+
+from usaspending_api.etl.transaction_loaders import cached_reference_data
+
+
+@pytest.fixture
+def mock_subtier_agencies():
+    """Stand in for the subtier_agency/agency join: subtier "0100" maps to two agencies, "0200" to one"""
+    cached_reference_data.invalidate_subtier_agency_cache()
+    cached_reference_data.SUBTIER_AGENCY_CACHE_STATS.clear()
+    mock_connection = MagicMock()
+    cursor = mock_connection.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("0100", 1), ("0100", 2), ("0200", 3)]
+    with patch.object(cached_reference_data, "connection", mock_connection):
+        yield cursor
+    cached_reference_data.invalidate_subtier_agency_cache()
+
+
+def test_subtier_agency_lookups(mock_subtier_agencies):
+    assert cached_reference_data.get_subtier_agency_id("0100") == 2
+    assert cached_reference_data.get_subtier_agency_id("0200") == 3
+    assert cached_reference_data.get_subtier_agency_id("0100", unique_only=True) is None
+    assert cached_reference_data.get_subtier_agency_id("0200", unique_only=True) == 3
+    assert cached_reference_data.get_subtier_agency_id("9999") is None
+
+    # The mapping is loaded once, shared rather than copied, and read-only
+    assert mock_subtier_agencies.execute.call_count == 1
+    assert cached_reference_data.subtier_agency_ids() is cached_reference_data.subtier_agency_ids()
+    with pytest.raises(TypeError):
+        cached_reference_data.subtier_agency_ids()["0300"] = 4
+
+    assert cached_reference_data.subtier_agency_cache_stats() == {"hits": 3, "misses": 2, "loads": 1}
+
+
+def test_subtier_agency_cache_refresh_and_invalidate(mock_subtier_agencies):
+    assert cached_reference_data.get_subtier_agency_id("0300") is None
+
+    mock_subtier_agencies.fetchall.return_value = [("0300", 4)]
+    cached_reference_data.refresh_subtier_agency_cache()
+    assert cached_reference_data.get_subtier_agency_id("0300") == 4
+
+    mock_subtier_agencies.fetchall.return_value = []
+    cached_reference_data.invalidate_subtier_agency_cache()
+    assert cached_reference_data.get_subtier_agency_id("0300") is None
+    assert cached_reference_data.subtier_agency_cache_stats()["loads"] == 3
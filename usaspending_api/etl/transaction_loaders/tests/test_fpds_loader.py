@@ -250,3 +250,133 @@ def test_load_transactions(mock__fetch_subtier_agency_id, mock_connection):
 
     load_objects = _transform_objects([mega_key_list])
     _load_transactions(load_objects)
+
+
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.transaction")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.connection")
+@patch("usaspending_api.etl.transaction_loaders.derived_field_functions_fpds._fetch_subtier_agency_id", return_value=1)
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._extract_broker_objects")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._matching_awards")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_awards")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._lookup_existing_transactions")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_update_transaction_normalized")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_update_transaction_fpds")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_transaction_normalized")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_transaction_fpds")
+def test_load_ids_dummy_id_bulk(
+    mock_bulk_insert_transaction_fpds,
+    mock_bulk_insert_transaction_normalized,
+    mock_bulk_update_transaction_fpds,
+    mock_bulk_update_transaction_normalized,
+    mock__lookup_existing_transactions,
+    mock_bulk_insert_awards,
+    mock__matching_awards,
+    mock__extract_broker_objects,
+    mock___fetch_subtier_agency_id,
+    mock_connection,
+    mock_transaction,
+):
+    """
+    End-to-end unit test of the set-based load, where one of three transactions and one of two awards already exist
+    """
+    mock__extract_broker_objects.side_effect = _stub___extract_broker_objects
+    # Two of the transactions belong to the same (new) award
+    award_keys = {"101": "AWARD_1", "201": "AWARD_2", "301": "AWARD_2"}
+
+    def _stub_transform_objects(broker_objects):
+        load_objects = _transform_objects(broker_objects)
+        for load_object in load_objects:
+            award_key = award_keys[load_object["transaction_fpds"]["detached_award_proc_unique"]]
+            load_object["transaction_fpds"]["unique_award_key"] = award_key
+            load_object["award"]["generated_unique_award_id"] = award_key
+        return load_objects
+
+    mock__matching_awards.return_value = {"AWARD_1": 11}
+    mock_bulk_insert_awards.return_value = {"AWARD_2": 12}
+    mock__lookup_existing_transactions.return_value = {"101": 1001}
+    mock_bulk_insert_transaction_normalized.return_value = {"201": 2001, "301": 3001}
+
+    with patch("usaspending_api.etl.transaction_loaders.fpds_loader._transform_objects", _stub_transform_objects):
+        award_ids = fpds_loader.load_fpds_transactions([101, 201, 301], bulk=True)
+
+    assert sorted(award_ids) == [11, 12]
+
+    # One statement per step for the whole chunk, with only one award created for the two transactions sharing it
+    assert mock_bulk_insert_awards.call_count == 1
+    assert len(mock_bulk_insert_awards.call_args[0][1]) == 1
+    assert mock_bulk_update_transaction_fpds.call_count == 1
+    assert mock_bulk_update_transaction_normalized.call_count == 1
+
+    updated = mock_bulk_update_transaction_normalized.call_args[0][1]
+    assert [lo["transaction_normalized"]["id"] for lo in updated] == [1001]
+    assert [lo["transaction_fpds"]["transaction_id"] for lo in updated] == [1001]
+    assert updated[0]["transaction_normalized"]["award_id"] == 11
+
+    inserted = mock_bulk_insert_transaction_fpds.call_args[0][1]
+    assert [lo["transaction_fpds"]["transaction_id"] for lo in inserted] == [2001, 3001]
+    assert all(lo["transaction_normalized"]["award_id"] == 12 for lo in inserted)
+
+
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.transaction")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.connection")
+@patch("usaspending_api.etl.transaction_loaders.derived_field_functions_fpds._fetch_subtier_agency_id", return_value=1)
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._extract_broker_objects")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._matching_awards")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_awards")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._lookup_existing_transactions", return_value={})
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_transaction_normalized")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.bulk_insert_transaction_fpds")
+def test_load_ids_bulk_award_created_by_parallel_load(
+    mock_bulk_insert_transaction_fpds,
+    mock_bulk_insert_transaction_normalized,
+    mock__lookup_existing_transactions,
+    mock_bulk_insert_awards,
+    mock__matching_awards,
+    mock__extract_broker_objects,
+    mock___fetch_subtier_agency_id,
+    mock_connection,
+    mock_transaction,
+):
+    """
+    A new award is looked up again under an advisory lock on its key, since another process may have created it
+    """
+    mock__extract_broker_objects.side_effect = _stub___extract_broker_objects
+
+    def _stub_transform_objects(broker_objects):
+        load_objects = _transform_objects(broker_objects)
+        for load_object in load_objects:
+            load_object["transaction_fpds"]["unique_award_key"] = "AWARD_1"
+        return load_objects
+
+    # Missing when the chunk is first looked up, then found once the lock on its key is held
+    mock__matching_awards.side_effect = [{}, {"AWARD_1": 11}]
+    mock_bulk_insert_transaction_normalized.return_value = {"101": 1001, "201": 2001, "301": 3001}
+
+    with patch("usaspending_api.etl.transaction_loaders.fpds_loader._transform_objects", _stub_transform_objects):
+        award_ids = fpds_loader.load_fpds_transactions([101, 201, 301], bulk=True)
+
+    assert award_ids == [11]
+    mock_bulk_insert_awards.assert_not_called()
+    cursor = mock_connection.connection.cursor.return_value.__enter__.return_value
+    assert any("pg_advisory_xact_lock" in call[0][0] for call in cursor.execute.call_args_list)
+
+
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._matching_award")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.insert_award")
+def test_insert_award_if_still_missing(mock_insert_award, mock__matching_award):
+    cursor = MagicMock()
+    load_object = {"transaction_fpds": {"unique_award_key": "AWARD_1"}}
+
+    mock__matching_award.return_value = 11
+    assert fpds_loader._insert_award_if_still_missing(cursor, load_object) == 11
+    mock_insert_award.assert_not_called()
+
+    mock__matching_award.return_value = None
+    mock_insert_award.return_value = 12
+    assert fpds_loader._insert_award_if_still_missing(cursor, load_object) == 12
+
+    statements = [call[0][0] for call in cursor.execute.call_args_list]
+    assert [statement.split("(")[0] for statement in statements] == [
+        "select pg_advisory_lock",
+        "select pg_advisory_unlock",
+    ] * 2
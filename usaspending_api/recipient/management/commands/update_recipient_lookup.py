@@ -1,30 +1,76 @@
 import logging
 
+from datetime import datetime, timezone
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 from pathlib import Path
+from usaspending_api.broker.helpers.last_load_date import get_last_load_date, update_last_load_date
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.etl import mixins
 from usaspending_api.common.helpers.timing_helpers import ScriptTimer as Timer
 
 
 logger = logging.getLogger("script")
 
+# Protects against transactions that were still in flight when the previous run started.
+LOOKBACK_MINUTES = 15
+
 
 class Command(mixins.ETLMixin, BaseCommand):
 
     help = "Update recipient_lookup in USAspending."
 
     full_reload = False
+    incremental = False
 
     etl_logger_function = logger.info
     etl_timer = Timer
     etl_dml_sql_directory = Path(__file__).resolve().parent.parent / "sql" / "recipient_lookup"
+    etl_incremental_dml_sql_directory = Path(__file__).resolve().parent.parent / "sql" / "recipient_lookup_incremental"
+    etl_restock_recipient_profile_sql_file = (
+        Path(__file__).resolve().parent.parent / "sql" / "restock_recipient_profile.sql"
+    )
+    etl_restock_sql_files = [
+        etl_restock_recipient_profile_sql_file,
+        Path(__file__).resolve().parent.parent / "sql" / "restock_summary_award_recipient.sql",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Only rebuild the recipient_lookup, recipient_profile, and summary_award_recipient rows of "
+                "recipients whose transactions, awards, or SAM records have been touched since the last "
+                "incremental run.  If there is no record of a previous run, all three are fully rebuilt instead.  "
+                "Recipients whose transactions were all deleted are left for the next full rebuild."
+            ),
+        )
 
     def handle(self, *args, **options):
+        self.incremental = options["incremental"]
+        start_time = datetime.now(timezone.utc)
+
+        since = None
+        if self.incremental:
+            since = get_last_load_date("recipient_lookup", lookback_minutes=LOOKBACK_MINUTES)
+            if since is None:
+                logger.info(
+                    "Falling back to a full rebuild of recipient_lookup, recipient_profile, and summary_award_recipient"
+                )
+
         with Timer("SQL Files"):
             try:
                 with transaction.atomic():
-                    self._perform_load()
+                    if since is not None:
+                        self._perform_incremental_load(since)
+                    else:
+                        self._perform_load()
+                        if self.incremental:
+                            self._perform_restock()
+                    if self.incremental:
+                        update_last_load_date("recipient_lookup", start_time)
+                    transaction.on_commit(lambda: bump_data_version("awards"))
                     t = Timer("Commit transaction")
                     t.log_starting_message()
                 t.log_success_message()
@@ -36,3 +82,40 @@ class Command(mixins.ETLMixin, BaseCommand):
         """Loop through each SQL file in order (000... to 1XX...) and execute"""
         for sqlfile in sorted(list(self.etl_dml_sql_directory.glob("*.sql"))):
             self._execute_etl_dml_sql_directory_file(sqlfile)
+
+    def _perform_restock(self):
+        """Fully rebuild recipient_profile and summary_award_recipient from the freshly loaded recipient_lookup"""
+        for sqlfile in self.etl_restock_sql_files:
+            self._execute_dml_sql_file(sqlfile)
+
+    def _restock_recipient_profile_incrementally(self):
+        """
+        Runs restock_recipient_profile.sql for the recipients 110_recipient_profile_hashes collected.  The script
+        restocks every recipient when there are none, so it is skipped then.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)")
+            if not cursor.fetchone()[0]:
+                logger.info("No recipient_profile rows to restock")
+                cursor.execute("DROP TABLE temporary_restock_recipient_profile_hashes")
+                return
+        self._execute_dml_sql_file(self.etl_restock_recipient_profile_sql_file)
+
+    def _perform_incremental_load(self, since):
+        """
+        Same steps as _perform_load, except that the files in etl_incremental_dml_sql_directory replace the ones
+        with the same name and add the recipient_profile and summary_award_recipient steps.  The incremental files
+        are templates that receive the cutoff date as {since}.  recipient_profile is restocked with the same script as
+        a full restock, limited to the recipients that 110_recipient_profile_hashes collects.
+        """
+        logger.info(f"Refreshing recipients touched since {since}")
+        sqlfiles = {sqlfile.name: sqlfile for sqlfile in self.etl_dml_sql_directory.glob("*.sql")}
+        sqlfiles.update({sqlfile.name: sqlfile for sqlfile in self.etl_incremental_dml_sql_directory.glob("*.sql")})
+        sqlfiles["115_restock_recipient_profile.sql"] = self.etl_restock_recipient_profile_sql_file
+        for _, sqlfile in sorted(sqlfiles.items()):
+            if sqlfile == self.etl_restock_recipient_profile_sql_file:
+                self._restock_recipient_profile_incrementally()
+            elif sqlfile.parent == self.etl_incremental_dml_sql_directory:
+                self._execute_dml_sql(sqlfile.read_text().format(since=since), sqlfile.stem)
+            else:
+                self._execute_etl_dml_sql_directory_file(sqlfile)
@@ -0,0 +1,135 @@
+DO $$ BEGIN RAISE NOTICE '100 Loading touched recipients into recipient_lookup'; END $$;
+
+-- Steps 010 through 090 add SAM recipients regardless of whether they were touched, so narrow things down first.
+DELETE FROM public.temporary_restock_recipient_lookup tem
+WHERE NOT EXISTS (
+  SELECT FROM public.temporary_changed_recipient_hashes ch WHERE ch.recipient_hash = tem.recipient_hash
+);
+
+DO $$ BEGIN RAISE NOTICE 'Removing touched recipients that no longer exist from recipient_lookup'; END $$;
+DELETE FROM public.recipient_lookup rl
+USING public.temporary_changed_recipient_hashes ch
+WHERE
+  rl.recipient_hash = ch.recipient_hash
+  AND NOT EXISTS (
+    SELECT FROM public.temporary_restock_recipient_lookup tem WHERE tem.recipient_hash = rl.recipient_hash
+  );
+
+DO $$ BEGIN RAISE NOTICE 'Updating records in recipient_lookup'; END $$;
+UPDATE public.recipient_lookup rl SET
+    address_line_1              = tem.address_line_1,
+    address_line_2              = tem.address_line_2,
+    business_types_codes        = tem.business_types_codes,
+    city                        = tem.city,
+    congressional_district      = tem.congressional_district,
+    country_code                = tem.country_code,
+    duns                        = tem.duns,
+    legal_business_name         = tem.legal_business_name,
+    parent_duns                 = tem.parent_duns,
+    parent_legal_business_name  = tem.parent_legal_business_name,
+    recipient_hash              = tem.recipient_hash,
+    source                      = tem.source,
+    state                       = tem.state,
+    update_date                 = now(),
+    zip4                        = tem.zip4,
+    zip5                        = tem.zip5
+  FROM public.temporary_restock_recipient_lookup tem
+  WHERE
+    rl.recipient_hash = tem.recipient_hash
+    AND (
+       rl.address_line_1              IS DISTINCT FROM tem.address_line_1
+    OR rl.address_line_2              IS DISTINCT FROM tem.address_line_2
+    OR rl.business_types_codes        IS DISTINCT FROM tem.business_types_codes
+    OR rl.city                        IS DISTINCT FROM tem.city
+    OR rl.congressional_district      IS DISTINCT FROM tem.congressional_district
+    OR rl.country_code                IS DISTINCT FROM tem.country_code
+    OR rl.duns                        IS DISTINCT FROM tem.duns
+    OR rl.legal_business_name         IS DISTINCT FROM tem.legal_business_name
+    OR rl.parent_duns                 IS DISTINCT FROM tem.parent_duns
+    OR rl.parent_legal_business_name  IS DISTINCT FROM tem.parent_legal_business_name
+    OR rl.recipient_hash              IS DISTINCT FROM tem.recipient_hash
+    OR rl.source                      IS DISTINCT FROM tem.source
+    OR rl.state                       IS DISTINCT FROM tem.state
+    OR rl.zip4                        IS DISTINCT FROM tem.zip4
+    OR rl.zip5                        IS DISTINCT FROM tem.zip5
+  );
+
+DO $$ BEGIN RAISE NOTICE 'Inserting new records into recipient_lookup'; END $$;
+INSERT INTO public.recipient_lookup (
+  recipient_hash,
+  legal_business_name,
+  duns,
+  address_line_1,
+  address_line_2,
+  city,
+  state,
+  zip5,
+  zip4,
+  country_code,
+  congressional_district,
+  business_types_codes,
+  source,
+  parent_duns,
+  parent_legal_business_name,
+  alternate_names,
+  update_date
+)
+SELECT
+  recipient_hash,
+  legal_business_name,
+  duns,
+  address_line_1,
+  address_line_2,
+  city,
+  state,
+  zip5,
+  zip4,
+  country_code,
+  congressional_district,
+  business_types_codes,
+  source,
+  parent_duns,
+  parent_legal_business_name,
+  '{{}}',
+  now()
+FROM public.temporary_restock_recipient_lookup
+ON CONFLICT(recipient_hash) DO NOTHING;
+
+DO $$ BEGIN RAISE NOTICE 'Populating alternate_names in recipient_lookup'; END $$;
+WITH alternate_names AS (
+  WITH alt_names AS (
+    SELECT
+      recipient_hash,
+      array_agg(DISTINCT awardee_or_recipient_legal) as all_names
+    FROM temporary_transaction_recipients_view
+    WHERE COALESCE(awardee_or_recipient_legal, '') != ''
+    GROUP BY recipient_hash
+  ), alt_parent_names AS (
+    SELECT
+      parent_recipient_hash AS recipient_hash,
+      array_agg(DISTINCT ultimate_parent_legal_enti) as all_names
+    FROM temporary_transaction_recipients_view
+    WHERE COALESCE(ultimate_parent_legal_enti, '') != ''
+    GROUP BY parent_recipient_hash
+  )
+  SELECT
+    COALESCE(an.recipient_hash, apn.recipient_hash) as recipient_hash,
+    (
+      SELECT array_agg(merged_recipient_names)
+      FROM (
+        SELECT DISTINCT unnest(an.all_names || apn.all_names) as merged_recipient_names
+      ) as merged_arrays
+    ) as all_names
+  FROM alt_names an
+  FULL OUTER JOIN alt_parent_names apn ON an.recipient_hash = apn.recipient_hash
+)
+UPDATE public.recipient_lookup rl SET
+  alternate_names = array_remove(an.all_names, rl.legal_business_name)
+FROM alternate_names an, public.temporary_changed_recipient_hashes ch
+WHERE
+      rl.recipient_hash = an.recipient_hash
+  AND rl.recipient_hash = ch.recipient_hash
+  AND rl.alternate_names IS DISTINCT FROM array_remove(an.all_names, rl.legal_business_name);
+
+DROP TABLE public.temporary_restock_recipient_lookup;
+DROP MATERIALIZED VIEW IF EXISTS public.temporary_transaction_recipients_view;
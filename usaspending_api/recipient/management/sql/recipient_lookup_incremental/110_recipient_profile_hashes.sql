@@ -0,0 +1,40 @@
+DO $$ BEGIN RAISE NOTICE '110 Collecting recipients whose recipient_profile needs restocking'; END $$;
+
+-- restock_recipient_profile.sql only restocks the recipients listed here.  Besides the touched recipients, the
+-- last_12_months totals of every recipient (or parent) with a transaction that has aged out of the 12 month window
+-- since the previous run are out of date too.
+DROP TABLE IF EXISTS temporary_restock_recipient_profile_hashes;
+
+CREATE TEMPORARY TABLE temporary_restock_recipient_profile_hashes AS (
+  WITH aged_out_transactions AS (
+    SELECT
+      MD5(UPPER(
+        CASE
+          WHEN COALESCE(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu) IS NOT NULL THEN CONCAT('duns-', COALESCE(fpds.awardee_or_recipient_uniqu, fabs.awardee_or_recipient_uniqu))
+          ELSE CONCAT('name-', COALESCE(fpds.awardee_or_recipient_legal, fabs.awardee_or_recipient_legal)) END
+      ))::uuid AS recipient_hash,
+      MD5(UPPER(
+        CASE
+          WHEN COALESCE(fpds.ultimate_parent_unique_ide, fabs.ultimate_parent_unique_ide) IS NOT NULL THEN CONCAT('duns-', COALESCE(fpds.ultimate_parent_unique_ide, fabs.ultimate_parent_unique_ide))
+          ELSE CONCAT('name-', COALESCE(fpds.ultimate_parent_legal_enti, fabs.ultimate_parent_legal_enti)) END
+      ))::uuid AS parent_recipient_hash
+    FROM
+      transaction_normalized AS tn
+    LEFT OUTER JOIN transaction_fpds AS fpds ON
+      (tn.id = fpds.transaction_id)
+    LEFT OUTER JOIN transaction_fabs AS fabs ON
+      (tn.id = fabs.transaction_id)
+    WHERE
+      tn.action_date >= '{since}'::TIMESTAMP WITH TIME ZONE - INTERVAL '1 year'
+      AND tn.action_date < now() - INTERVAL '1 year'
+  )
+  SELECT recipient_hash FROM public.temporary_changed_recipient_hashes
+  UNION
+  SELECT recipient_hash FROM aged_out_transactions
+  UNION
+  SELECT parent_recipient_hash FROM aged_out_transactions
+);
+
+ALTER TABLE temporary_restock_recipient_profile_hashes ADD PRIMARY KEY (recipient_hash);
+
+ANALYZE temporary_restock_recipient_profile_hashes;
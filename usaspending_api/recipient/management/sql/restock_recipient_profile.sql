@@ -8,9 +8,15 @@ DROP TABLE IF EXISTS public.temporary_restock_recipient_profile;
 DROP INDEX IF EXISTS public.idx_recipients_in_transactions_view;
 DROP INDEX IF EXISTS public.idx_recipient_profile_uniq_new;
 
+-- Restocks every recipient when the temporary_restock_recipient_profile_hashes temporary table is empty, which it
+-- always is when this script is run on its own.  update_recipient_lookup --incremental creates and fills it beforehand
+-- to only restock those recipients, from the transactions that can affect them.
+CREATE TEMPORARY TABLE IF NOT EXISTS temporary_restock_recipient_profile_hashes (recipient_hash UUID PRIMARY KEY);
+
 DO $$ BEGIN RAISE NOTICE 'Step 1: Creating temp materialized view'; END $$;
 
 CREATE MATERIALIZED VIEW public.temporary_recipients_from_transactions_view AS (
+  SELECT * FROM (
   SELECT
     MD5(UPPER(
       CASE
@@ -43,6 +49,16 @@ CREATE MATERIALIZED VIEW public.temporary_recipients_from_transactions_view AS (
   WHERE
     tn.action_date >= '2007-10-01'
     AND tn.type IS NOT NULL
+  ) AS recipients_from_transactions
+  WHERE
+    NOT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)
+    OR recipient_hash IN (SELECT recipient_hash FROM temporary_restock_recipient_profile_hashes)
+    OR parent_recipient_unique_id IN (
+      SELECT rl.duns
+      FROM public.recipient_lookup AS rl
+      INNER JOIN temporary_restock_recipient_profile_hashes AS rh ON rl.recipient_hash = rh.recipient_hash
+      WHERE rl.duns IS NOT NULL
+    )
 );
 
 CREATE INDEX idx_recipients_in_transactions_view ON public.temporary_recipients_from_transactions_view USING BTREE(recipient_hash, recipient_level);
@@ -83,6 +99,9 @@ INSERT INTO public.temporary_restock_recipient_profile (
     legal_business_name AS recipient_name
   FROM
     public.recipient_lookup
+  WHERE
+    NOT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)
+    OR recipient_hash IN (SELECT recipient_hash FROM temporary_restock_recipient_profile_hashes)
 UNION ALL
   SELECT
     'C' as recipient_level,
@@ -91,6 +110,9 @@ UNION ALL
     legal_business_name AS recipient_name
   FROM
     public.recipient_lookup
+  WHERE
+    NOT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)
+    OR recipient_hash IN (SELECT recipient_hash FROM temporary_restock_recipient_profile_hashes)
 UNION ALL
   SELECT
     'R' as recipient_level,
@@ -98,7 +120,10 @@ UNION ALL
     duns AS recipient_unique_id,
     legal_business_name AS recipient_name
   FROM
-    public.recipient_lookup;
+    public.recipient_lookup
+  WHERE
+    NOT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)
+    OR recipient_hash IN (SELECT recipient_hash FROM temporary_restock_recipient_profile_hashes);
 
 
 CREATE UNIQUE INDEX idx_recipient_profile_uniq_new ON public.temporary_restock_recipient_profile USING BTREE(recipient_hash, recipient_level);
@@ -334,7 +359,11 @@ DELETE FROM public.temporary_restock_recipient_profile WHERE unused = true;
 DO $$ BEGIN RAISE NOTICE 'Step 10: updating destination table'; END $$;
 
 DELETE FROM public.recipient_profile rp
-WHERE NOT EXISTS (
+WHERE (
+    NOT EXISTS (SELECT FROM temporary_restock_recipient_profile_hashes)
+    OR rp.recipient_hash IN (SELECT recipient_hash FROM temporary_restock_recipient_profile_hashes)
+  )
+  AND NOT EXISTS (
     SELECT FROM public.temporary_restock_recipient_profile temp_p
     WHERE rp.recipient_hash = temp_p.recipient_hash
       AND rp.recipient_level = temp_p.recipient_level
@@ -389,5 +418,6 @@ INSERT INTO public.recipient_profile (
 
 DROP TABLE public.temporary_restock_recipient_profile;
 DROP MATERIALIZED VIEW public.temporary_recipients_from_transactions_view;
+DROP TABLE temporary_restock_recipient_profile_hashes;
 
 SELECT now() AS script_completed_at;
@@ -11,7 +11,7 @@ from model_mommy import mommy
 # Imports from your apps
 from usaspending_api.common.helpers.fiscal_year_helpers import generate_fiscal_year
 from usaspending_api.recipient.models import RecipientProfile
-from usaspending_api.recipient.v2.views.list_recipients import get_recipients
+from usaspending_api.recipient.v2.views.list_recipients import ListRecipients, RecipientCount, get_recipients
 
 # Getting relative dates as the 'latest'/default argument returns results relative to when it gets called
 TODAY = datetime.datetime.now()
@@ -193,3 +193,22 @@ def test_award_type_filter():
     assert results[0]["recipient_level"] == "C"
     assert float(results[0]["amount"]) == float(99.99)
     assert results[0]["id"] == "5770e860-0f7b-69f1-182f-4d6966ebaa62-C"
+
+
+@pytest.mark.django_db
+def test_recipient_count_from_cache(client, enable_response_cache):
+    enable_response_cache(ListRecipients.post, RecipientCount.post)
+    mommy.make(
+        RecipientProfile,
+        recipient_level="A",
+        recipient_hash="00077a9a-5a70-8919-fd19-330762af6b84",
+        recipient_unique_id="000000123",
+        recipient_name="WILSON AND ASSOC",
+        last_12_months=-29470313.00,
+    )
+
+    # The second page is a different list request but the same count request, so its count comes from the cache
+    for page in (1, 2):
+        resp = client.post(list_recipients_endpoint(), {"page": page, "limit": 1}, content_type="application/json")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["page_metadata"]["total"] == 1
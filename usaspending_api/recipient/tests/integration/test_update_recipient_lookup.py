@@ -0,0 +1,88 @@
+import hashlib
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from django.core.management import call_command
+from model_mommy import mommy
+from uuid import UUID
+
+from usaspending_api.awards.models import TransactionNormalized
+from usaspending_api.broker import lookups
+from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.recipient.models import RecipientLookup, RecipientProfile
+
+
+def _duns_hash(duns):
+    return UUID(hashlib.md5(f"duns-{duns}".upper().encode("utf-8")).hexdigest())
+
+
+LAST_LOAD_DATE = datetime.now(timezone.utc) - timedelta(days=1)
+
+
+@pytest.fixture
+def incremental_recipient_data(db):
+    mommy.make(
+        "broker.ExternalDataType",
+        external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT["recipient_lookup"],
+        name="recipient_lookup",
+    )
+    mommy.make(
+        "broker.ExternalDataLoadDate",
+        external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT["recipient_lookup"],
+        last_load_date=LAST_LOAD_DATE,
+    )
+
+    # Not backed by any transactions, so a full rebuild would remove it but an incremental one leaves it alone
+    mommy.make(
+        "recipient.RecipientLookup",
+        recipient_hash=_duns_hash("000000001"),
+        duns="000000001",
+        legal_business_name="UNTOUCHED RECIPIENT",
+    )
+
+    transaction = mommy.make("awards.TransactionNormalized", action_date=datetime.now().date(), type="A", is_fpds=True)
+    mommy.make(
+        "awards.TransactionFPDS",
+        transaction=transaction,
+        awardee_or_recipient_uniqu="000000002",
+        awardee_or_recipient_legal="Touched Recipient",
+    )
+
+
+def test_incremental_recipient_lookup(incremental_recipient_data):
+    call_command("update_recipient_lookup", "--incremental")
+
+    touched = RecipientLookup.objects.get(duns="000000002")
+    assert touched.recipient_hash == _duns_hash("000000002")
+    assert touched.legal_business_name == "TOUCHED RECIPIENT"
+    assert RecipientLookup.objects.get(duns="000000001").legal_business_name == "UNTOUCHED RECIPIENT"
+
+    assert RecipientProfile.objects.filter(recipient_hash=_duns_hash("000000002"), recipient_level="R").exists()
+    assert not RecipientProfile.objects.filter(recipient_hash=_duns_hash("000000001")).exists()
+
+    last_load_date = ExternalDataLoadDate.objects.get(
+        external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT["recipient_lookup"]
+    ).last_load_date
+    assert last_load_date > LAST_LOAD_DATE
+
+
+def test_incremental_recipient_lookup_restocks_aged_out_recipients(incremental_recipient_data):
+    aged_out_hash = _duns_hash("000000003")
+    mommy.make(
+        "recipient.RecipientLookup", recipient_hash=aged_out_hash, duns="000000003", legal_business_name="AGED OUT"
+    )
+    mommy.make("recipient.RecipientProfile", recipient_hash=aged_out_hash, recipient_level="R", last_12_months=100)
+    # Inside the 12 month window when the previous run happened, but not anymore
+    transaction = mommy.make(
+        "awards.TransactionNormalized",
+        action_date=(LAST_LOAD_DATE - timedelta(days=365)).date() + timedelta(days=1),
+        type="A",
+        is_fpds=True,
+    )
+    mommy.make("awards.TransactionFPDS", transaction=transaction, awardee_or_recipient_uniqu="000000003")
+    TransactionNormalized.objects.filter(pk=transaction.pk).update(update_date=LAST_LOAD_DATE - timedelta(days=1))
+
+    call_command("update_recipient_lookup", "--incremental")
+
+    assert not RecipientProfile.objects.filter(recipient_hash=aged_out_hash, last_12_months=100).exists()
+    assert RecipientLookup.objects.get(duns="000000003").legal_business_name == "AGED OUT"
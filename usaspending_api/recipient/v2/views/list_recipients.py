@@ -5,7 +5,7 @@ from django.db.models import F, Q
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.cache_decorator import cache_response, get_response_data
 from usaspending_api.common.helpers.generic_helper import get_pagination_metadata
 from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
@@ -107,7 +107,7 @@ class ListRecipients(APIView):
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/recipient/duns.md"
 
     def request_count(self, filters={}):
-        response = RecipientCount.as_view()(request=self.request._request).data
+        response = get_response_data(RecipientCount.as_view()(request=self.request._request))
         return response["count"]
 
     @cache_response()
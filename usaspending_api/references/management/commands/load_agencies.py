@@ -7,6 +7,7 @@ from django.db import transaction
 from pathlib import Path
 from psycopg2.extras import execute_values
 from psycopg2.sql import SQL
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.csv_helpers import read_csv_file_as_list_of_dictionaries
 from usaspending_api.common.etl import ETLQueryFile, ETLTable, mixins
 from usaspending_api.common.helpers.sql_helpers import get_connection, execute_sql
@@ -100,6 +101,7 @@ class Command(mixins.ETLMixin, BaseCommand):
                     t = Timer("Commit agency transaction")
                     t.log_starting_message()
                 t.log_success_message()
+                bump_data_version("references")
             except Exception:
                 logger.error("ALL CHANGES ROLLED BACK DUE TO EXCEPTION")
                 raise
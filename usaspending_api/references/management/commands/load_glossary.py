@@ -3,8 +3,10 @@ from io import BytesIO
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from openpyxl import load_workbook
 
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.references.models import Definition
 
@@ -66,4 +68,5 @@ def load_glossary(path, append):
                 setattr(definition, field_name, row[i].value)
         definition.save()
         row_count += 1
+    transaction.on_commit(lambda: bump_data_version("references"))
     logger.info("{} definitions loaded from {}".format(row_count, path))
@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from openpyxl import load_workbook
 
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.references.models import NAICS
 
 
@@ -91,3 +92,5 @@ def load_naics(path, append):
 
         naics_year = p_year.search(path).group()
         populate_naics_fields(ws, naics_year, path)
+
+    transaction.on_commit(lambda: bump_data_version("references"))
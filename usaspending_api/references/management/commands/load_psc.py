@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.references.models import PSC
 import os
 import logging
@@ -58,6 +60,7 @@ def load_psc(fullpath, update):
         if update:
             update_lengths()
             logger.log(20, "Updated PSC codes.")
+        transaction.on_commit(lambda: bump_data_version("references"))
     except IOError:
         logger.error("Could not open file {}".format(fullpath))
 
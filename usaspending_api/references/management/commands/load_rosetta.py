@@ -9,6 +9,7 @@ from openpyxl.utils import get_column_letter
 from pathlib import Path
 from time import perf_counter
 
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.references.models import Rosetta
 
@@ -121,3 +122,4 @@ def load_xlsx_data_to_model(rosetta_object: dict):
 
     rosetta = Rosetta(document_name="api_response", document=json_doc)
     rosetta.save()
+    transaction.on_commit(lambda: bump_data_version("references"))
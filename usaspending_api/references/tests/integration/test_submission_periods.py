@@ -0,0 +1,27 @@
+import pytest
+
+from model_mommy import mommy
+from rest_framework import status
+
+from usaspending_api.references.v2.views.submission_periods import CachedSubmissionPeriodsViewSet
+from usaspending_api.submissions.models import DABSSubmissionWindowSchedule
+
+
+@pytest.mark.django_db
+def test_submission_periods_from_cache(client, enable_response_cache):
+    enable_response_cache(CachedSubmissionPeriodsViewSet.get)
+    mommy.make(
+        DABSSubmissionWindowSchedule,
+        id=1,
+        submission_fiscal_year=2020,
+        submission_fiscal_quarter=1,
+        submission_fiscal_month=3,
+        is_quarter=True,
+        submission_reveal_date="2020-01-01 00:00:00Z",
+    )
+
+    responses = [client.get("/api/v2/references/submission_periods/?use_cache=true") for _ in range(2)]
+
+    assert [resp.status_code for resp in responses] == [status.HTTP_200_OK, status.HTTP_200_OK]
+    assert responses[0].json() == responses[1].json()
+    assert [period["submission_fiscal_month"] for period in responses[1].json()["available_periods"]] == [3]
@@ -1,7 +1,13 @@
 import pytest
+import random
 
 from django.db import connection
-from usaspending_api.broker.helpers.get_business_categories import get_business_categories
+from usaspending_api.broker.helpers.get_business_categories import (
+    business_category_source_columns,
+    get_business_categories,
+    get_business_categories_bulk,
+    rows_to_business_category_columns,
+)
 from usaspending_api.common.helpers.business_categories_helper import get_business_category_display_names
 
 
@@ -40,6 +46,42 @@ def test_update_business_type_categories_faads_format():
     assert "category_business" in business_categories
 
 
+def _fpds_business_category_corpus(row_count):
+    """Rows of FPDS flag combinations, mostly sparse like real data, including every flag and code on its own"""
+    rng = random.Random(2318)
+    boolean_columns = [
+        c
+        for c in business_category_source_columns("fpds")
+        if c not in ("contracting_officers_deter", "domestic_or_foreign_entity")
+    ]
+    rows = [{column: "true"} for column in boolean_columns]
+    rows += [{"contracting_officers_deter": code} for code in ("S", "O", "", None)]
+    rows += [{"domestic_or_foreign_entity": code} for code in ("A", "C", "D", "", None)]
+    for _ in range(row_count):
+        row = {column: rng.choice(["true", "false", "t", "f", None]) for column in rng.sample(boolean_columns, 5)}
+        row["contracting_officers_deter"] = rng.choice(["S", "O", None])
+        row["domestic_or_foreign_entity"] = rng.choice(["A", "C", "D", None])
+        rows.append(row)
+    return rows
+
+
+def test_get_business_categories_bulk_parity():
+    fabs_rows = [
+        {"business_types": code}
+        for code in list("ABCDEFGHIJKLMNOPQRSTUVX") + ["00", "01", "02", "04", "05", "06", "11", "12", "20", "21"]
+    ]
+    fabs_rows += [{"business_types": code} for code in ("22", "23", "25", "", None)] + [{}]
+    fpds_rows = _fpds_business_category_corpus(2000)
+
+    for data_type, rows in (("fabs", fabs_rows), ("fpds", fpds_rows)):
+        expected = [get_business_categories(row, data_type) for row in rows]
+        assert get_business_categories_bulk(rows_to_business_category_columns(rows, data_type), data_type) == expected
+
+    assert get_business_categories_bulk({}, "fpds") == []
+    with pytest.raises(ValueError):
+        get_business_categories_bulk({"business_types": ["A"]}, "bogus")
+
+
 @pytest.mark.django_db
 def test_dev_2318_business_category_changes():
     """
@@ -14,6 +14,7 @@ class NAICSViewSet(APIView):
     """Return a list of NAICS or a filtered list of NAICS"""
 
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/references/naics.md"
+    cache_data_domains = ("references",)
     naics_queryset = NAICS.objects.annotate(text_len=Length("code"))
 
     def get_six_digit_naics_count(self, code: str) -> int:
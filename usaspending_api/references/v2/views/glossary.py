@@ -22,8 +22,9 @@ class GlossaryViewSet(APIView):
     """
 
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/references/glossary.md"
+    cache_data_domains = ("references",)
 
-    @cache_response()
+    @cache_response(local=True)
     def get(self, request: Request) -> Response:
         """
         Accepts only pagination-related query parameters
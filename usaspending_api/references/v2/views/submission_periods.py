@@ -3,7 +3,7 @@ import datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from usaspending_api.common.cache_decorator import cache_response
+from usaspending_api.common.cache_decorator import cache_response, get_response_data
 from usaspending_api.common.validator.tinyshield import TinyShield
 from usaspending_api.submissions.models import DABSSubmissionWindowSchedule
 
@@ -37,7 +37,7 @@ class SubmissionPeriodsViewSet(APIView):
         validated_payload = TinyShield(models).block(request.GET)
 
         if validated_payload["use_cache"]:
-            formatted_results = CachedSubmissionPeriodsViewSet.as_view()(request=request._request).data
+            formatted_results = get_response_data(CachedSubmissionPeriodsViewSet.as_view()(request=request._request))
         else:
             formatted_results = self.get_closed_submission_windows()
 
@@ -49,7 +49,9 @@ class CachedSubmissionPeriodsViewSet(APIView):
     This ViewSet is only used internally to provided a cached version of the SubmissionPeriodsViewSet
     """
 
-    @cache_response()
+    cache_data_domains = ("accounts",)
+
+    @cache_response(local=True)
     def get(self, request):
         formatted_results = SubmissionPeriodsViewSet.get_closed_submission_windows()
         return Response(formatted_results)
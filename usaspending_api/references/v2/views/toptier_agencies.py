@@ -20,8 +20,9 @@ class ToptierAgenciesViewSet(APIView):
     """
 
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/references/toptier_agencies.md"
+    cache_data_domains = ("references", "accounts")
 
-    @cache_response()
+    @cache_response(local=True)
     def get(self, request, format=None):
         sortable_columns = [
             "agency_id",
@@ -1,31 +1,80 @@
+import logging
+import psycopg2
 import random
+import re
+import threading
+import time
 
+from django.conf import settings
 from django.db import DEFAULT_DB_ALIAS
+from usaspending_api.common.helpers.sql_helpers import build_dsn_string
 from usaspending_api.references.models import FilterHash
 from usaspending_api.download.models.download_job import DownloadJob
 
+logger = logging.getLogger("console")
+
+REPLICA_ALIAS_REGEX = re.compile(r"db_r\d+")
+
+# Replication lag is only meaningful while the replica still has WAL to replay; an idle primary would otherwise make
+# an up to date replica look as stale as the time since the last write.  Having replayed everything it received says
+# nothing once the WAL receiver has stopped streaming though, so lag is NULL then.  Also counts the queries running.
+REPLICA_HEALTH_SQL = """
+    SELECT
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver)
+                OR EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status <> 'streaming')
+            THEN NULL
+            WHEN pg_last_wal_receive_lsn() IS DISTINCT FROM pg_last_wal_replay_lsn()
+            THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+            ELSE 0
+        END,
+        (SELECT COUNT(*) FROM pg_stat_activity WHERE state = 'active')
+"""
+
 
 class ReadReplicaRouter:
     """
     The USAspending API is *mostly* a readonly application.  This router is used to balance loads
     between multiple databases defined by the environment variables in settings.py, and handle
     the models that are *not* readonly appropriately.  Also prevents model access/migrations to Broker.
+
+    Reads go to the read replicas (every db_r* connection in settings.DATABASES) whenever one is healthy.
+    Each replica is probed at most every REPLICA_HEALTH_CHECK_SECONDS for its round trip latency, replication
+    lag, and number of active queries, and traffic is weighted toward the replicas that look the least busy.
+    A replica that cannot be reached or lags by more than REPLICA_MAX_LAG_SECONDS is skipped until a later
+    probe finds it healthy again; the writable database only serves reads when no replica is healthy.
     """
 
     writable_database = DEFAULT_DB_ALIAS
-    read_replicas = ["db_r1"]
+    read_replicas = None
 
     def __init__(self):
+        if self.read_replicas is None:
+            self.read_replicas = sorted(
+                (alias for alias in settings.DATABASES if REPLICA_ALIAS_REGEX.fullmatch(alias)),
+                key=lambda alias: int(alias[4:]),
+            )
         self.usaspending_databases = [self.writable_database] + self.read_replicas
+        self.replica_health = {
+            alias: {"healthy": True, "latency": None, "lag": 0, "active": 0} for alias in self.read_replicas
+        }
+        self._last_health_check = None
+        self._health_check_lock = threading.Lock()
 
     def db_for_read(self, model, **hints):
         """
         FilterHash and DownloadJob are writable tables so always read from source (default) to
-        mitigate replication lag.  Otherwise, choose a connection randomly.
+        mitigate replication lag.  Otherwise, choose a healthy replica weighted by its load.
         """
-        if model in [FilterHash, DownloadJob]:
+        if model in [FilterHash, DownloadJob] or not self.read_replicas:
             return self.writable_database
-        return random.choice(self.usaspending_databases)
+        self.check_replica_health()
+        weights = {alias: self.replica_weight(alias) for alias in self.read_replicas}
+        healthy_replicas = [alias for alias, weight in weights.items() if weight > 0]
+        if not healthy_replicas:
+            return self.writable_database
+        return random.choices(healthy_replicas, weights=[weights[alias] for alias in healthy_replicas])[0]
 
     def db_for_write(self, model, **hints):
         return self.writable_database
@@ -38,6 +87,81 @@ class ReadReplicaRouter:
         """ Migrations should only run in USAspending against the writable database. """
         return db == self.writable_database
 
+    def replica_weight(self, alias):
+        """
+        Share of reads a replica should receive relative to the others.  Zero for a replica that should not be used.
+        Latency is in seconds and smoothed across probes, so a replica answering in 2ms gets roughly five times the
+        traffic of one answering in 10ms, reduced further by its active queries and how close it is to the lag limit.
+        """
+        health = self.replica_health[alias]
+        if not health["healthy"] or health["lag"] > settings.REPLICA_MAX_LAG_SECONDS:
+            return 0
+        if health["latency"] is None:
+            return 1
+        lag_factor = 1 - health["lag"] / (settings.REPLICA_MAX_LAG_SECONDS + 1)
+        return lag_factor / ((health["latency"] + 0.001) * (1 + health["active"]))
+
+    def check_replica_health(self, force=False):
+        """
+        Probes every replica when the last probe is older than REPLICA_HEALTH_CHECK_SECONDS.  Only one thread probes
+        at a time; the others keep routing with the previous results rather than waiting.
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_health_check is not None
+            and now - self._last_health_check < settings.REPLICA_HEALTH_CHECK_SECONDS
+        ):
+            return
+        if not self._health_check_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_health_check = now
+            for alias in self.read_replicas:
+                self.probe_replica(alias)
+        finally:
+            self._health_check_lock.release()
+
+    def probe_replica(self, alias):
+        """
+        Probes over a connection of its own with short timeouts, since the probe runs on the thread of the request
+        that happened to trigger it and a replica that hangs must not hold that request up for long.
+        """
+        health = self.replica_health[alias]
+        timeout = settings.REPLICA_HEALTH_TIMEOUT_SECONDS
+        try:
+            connection = psycopg2.connect(
+                build_dsn_string(settings.DATABASES[alias]),
+                connect_timeout=timeout,
+                options=f"-c statement_timeout={timeout * 1000}",
+            )
+            try:
+                with connection.cursor() as cursor:
+                    start = time.perf_counter()
+                    cursor.execute(REPLICA_HEALTH_SQL)
+                    lag, active = cursor.fetchone()
+                    latency = time.perf_counter() - start
+            finally:
+                connection.close()
+        except Exception as e:
+            if health["healthy"]:
+                logger.warning(f"Read replica '{alias}' failed its health check and will not be used: {e}")
+            health["healthy"] = False
+            return
+        if lag is None:
+            if health["healthy"]:
+                logger.warning(f"Read replica '{alias}' is not receiving WAL from the primary and will not be used")
+            health["healthy"] = False
+            return
+        if not health["healthy"]:
+            logger.info(f"Read replica '{alias}' passed its health check and will be used again")
+        health["healthy"] = True
+        # Smooth latency so that a single slow probe does not swing the weights
+        health["latency"] = latency if health["latency"] is None else 0.7 * health["latency"] + 0.3 * latency
+        health["lag"] = float(lag)
+        # The probe is one of the active queries
+        health["active"] = max(0, (active or 0) - 1)
+
 
 class DefaultOnlyRouter(ReadReplicaRouter):
     """ For when only the default connection is used.  Prevents model access/migrations to Broker. """
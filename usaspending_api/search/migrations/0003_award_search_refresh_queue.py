@@ -0,0 +1,24 @@
+# Generated by Django 2.2.19 on 2021-03-22 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_auto_20210121_2235'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AwardSearchRefreshQueue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('award_id', models.BigIntegerField()),
+                ('queued_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'award_search_refresh_queue',
+            },
+        ),
+    ]
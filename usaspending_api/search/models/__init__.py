@@ -1,3 +1,4 @@
+from usaspending_api.search.models.award_search_refresh_queue import AwardSearchRefreshQueue
 from usaspending_api.search.models.mv_agency_autocomplete import AgencyAutocompleteMatview
 from usaspending_api.search.models.mv_contract_award_search import ContractAwardSearchMatview
 from usaspending_api.search.models.mv_directpayment_award_search import DirectPaymentAwardSearchMatview
@@ -15,6 +16,7 @@ from usaspending_api.search.models.vw_award_search import AwardSearchView
 
 __all__ = [
     "AgencyAutocompleteMatview",
+    "AwardSearchRefreshQueue",
     "AwardSearchView",
     "ContractAwardSearchMatview",
     "DirectPaymentAwardSearchMatview",
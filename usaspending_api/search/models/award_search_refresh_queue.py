@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class AwardSearchRefreshQueue(models.Model):
+    """
+    Awards touched by the transaction loaders since the award search tables were last refreshed. Rows are added by
+    etl.award_helpers.update_awards and consumed by `matview_runner --incremental`, which re-derives only the queued
+    awards in the award search tables. award_id is not a foreign key since deleted awards are queued as well.
+    """
+
+    award_id = models.BigIntegerField()
+    queued_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "award_search_refresh_queue"
@@ -1332,6 +1332,42 @@ def test_search_after(client, monkeypatch, spending_by_award_test_data, elastics
     assert resp.json().get("results") == expected_result, "Award Type Code filter does not match expected result"
 
 
+@pytest.mark.django_db
+def test_search_after_walks_all_pages(client, monkeypatch, spending_by_award_test_data, elasticsearch_award_index):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_award_index)
+
+    request = {
+        "filters": {"award_type_codes": ["A", "B", "C", "D"]},
+        "fields": ["Award ID"],
+        "page": 1,
+        "limit": 1,
+        "sort": "Award ID",
+        "order": "asc",
+        "subawards": False,
+    }
+    award_ids = []
+    while True:
+        resp = client.post(
+            "/api/v2/search/spending_by_award", content_type="application/json", data=json.dumps(request)
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        award_ids.extend(result["Award ID"] for result in resp.json()["results"])
+        page_metadata = resp.json()["page_metadata"]
+        if not page_metadata["hasNext"]:
+            break
+        request["last_record_unique_id"] = page_metadata["last_record_unique_id"]
+        request["last_record_sort_value"] = page_metadata["last_record_sort_value"]
+
+    assert award_ids == ["abc111", "abc222", "abc333"]
+    assert page_metadata["last_record_unique_id"] is None
+    assert page_metadata["last_record_sort_value"] is None
+
+    # both halves of the cursor are required
+    del request["last_record_unique_id"]
+    resp = client.post("/api/v2/search/spending_by_award", content_type="application/json", data=json.dumps(request))
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.django_db
 def test_no_0_covid_amounts(client, monkeypatch, spending_by_award_test_data, elasticsearch_award_index):
     setup_elasticsearch_test(monkeypatch, elasticsearch_award_index)
@@ -1359,3 +1395,33 @@ def test_no_0_covid_amounts(client, monkeypatch, spending_by_award_test_data, el
     assert resp.status_code == status.HTTP_200_OK
     assert len(resp.json().get("results")) == 1
     assert resp.json().get("results") == expected_result, "DEFC filter does not match expected result"
+
+
+@pytest.mark.django_db
+def test_last_page_within_max_result_window(
+    client, monkeypatch, settings, spending_by_award_test_data, elasticsearch_award_index
+):
+    setup_elasticsearch_test(monkeypatch, elasticsearch_award_index)
+    settings.ES_AWARDS_MAX_RESULT_WINDOW = 2
+
+    request = {
+        "filters": {"award_type_codes": ["A", "B", "C", "D"]},
+        "fields": ["Award ID"],
+        "page": 2,
+        "limit": 1,
+        "sort": "Award ID",
+        "order": "asc",
+        "subawards": False,
+    }
+    # The page ends at the window, so there is no room to request the extra hit that would show a next page
+    resp = client.post("/api/v2/search/spending_by_award", content_type="application/json", data=json.dumps(request))
+    assert resp.status_code == status.HTTP_200_OK
+    assert [result["Award ID"] for result in resp.json()["results"]] == ["abc222"]
+    assert resp.json()["page_metadata"]["hasNext"] is True
+
+    request["last_record_unique_id"] = resp.json()["page_metadata"]["last_record_unique_id"]
+    request["last_record_sort_value"] = resp.json()["page_metadata"]["last_record_sort_value"]
+    request["page"] = 3
+    resp = client.post("/api/v2/search/spending_by_award", content_type="application/json", data=json.dumps(request))
+    assert [result["Award ID"] for result in resp.json()["results"]] == ["abc333"]
+    assert resp.json()["page_metadata"]["hasNext"] is False
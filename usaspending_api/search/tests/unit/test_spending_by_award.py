@@ -3,7 +3,11 @@ import pytest
 from usaspending_api.awards.v2.lookups.lookups import contract_subaward_mapping
 from usaspending_api.common.helpers.api_helper import raise_if_award_types_not_valid_subset, raise_if_sort_key_not_valid
 from usaspending_api.common.helpers.generic_helper import get_time_period_message
-from usaspending_api.search.v2.views.spending_by_award import SpendingByAwardVisualizationViewSet, GLOBAL_MAP
+from usaspending_api.search.v2.views.spending_by_award import (
+    SpendingByAwardVisualizationViewSet,
+    GLOBAL_MAP,
+    parse_search_after_value,
+)
 from usaspending_api.common.exceptions import UnprocessableEntityException, InvalidParameterException
 
 
@@ -140,3 +144,16 @@ def test_populate_response():
 
     expected_dictionary["results"] = []
     assert view.populate_response(results=[], has_next=True) == expected_dictionary
+
+
+def test_parse_search_after_value():
+    # dates are sorted as epoch milliseconds and must go back to Elasticsearch as numbers
+    assert parse_search_after_value("1577836800000") == 1577836800000
+    assert parse_search_after_value("-9223372036854775808") == -9223372036854775808
+    assert parse_search_after_value("5000.0") == 5000.0
+    assert isinstance(parse_search_after_value("5000.0"), float)
+
+    # anything that does not round trip exactly stays text
+    assert parse_search_after_value("abc111") == "abc111"
+    assert parse_search_after_value("007") == "007"
+    assert parse_search_after_value("1e5") == "1e5"
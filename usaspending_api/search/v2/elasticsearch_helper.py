@@ -10,6 +10,7 @@ from usaspending_api.awards.v2.lookups.elasticsearch_lookups import (
     INDEX_ALIASES_TO_AWARD_TYPES,
 )
 from usaspending_api.common.data_classes import Pagination
+from usaspending_api.common.elasticsearch.partitioned_scan import get_num_partitions, partitioned_terms_scan
 from usaspending_api.common.elasticsearch.search_wrappers import TransactionSearch, AwardSearch, AccountSearch
 from usaspending_api.common.query_with_filters import QueryWithFilters
 from usaspending_api.search.v2.es_sanitization import es_minimal_sanitize
@@ -97,35 +98,16 @@ def get_download_ids(keyword, field, size=10000):
 
     Note: this only works for fields in ES of integer type.
     """
-    n_iter = DOWNLOAD_QUERY_SIZE // size
-
     results = get_total_results(keyword)
     if results is None:
         logger.error("Error retrieving total results. Max number of attempts reached")
         return
     total = sum(results[category]["doc_count"] for category in INDEX_ALIASES_TO_AWARD_TYPES.keys())
-    required_iter = (total // size) + 1
-    n_iter = min(max(1, required_iter), n_iter)
-    for i in range(n_iter):
-        filter_query = QueryWithFilters.generate_transactions_elasticsearch_query(
-            {"keyword_search": [es_minimal_sanitize(keyword)]}
-        )
-        search = TransactionSearch().filter(filter_query)
-        group_by_agg_key_values = {
-            "field": field,
-            "include": {"partition": i, "num_partitions": n_iter},
-            "size": size,
-            "shard_size": size,
-        }
-        aggs = A("terms", **group_by_agg_key_values)
-        search.aggs.bucket("results", aggs)
-        response = search.handle_execute()
-        if response is None:
-            raise Exception("Breaking generator, unable to reach cluster")
-        results = []
-        for result in response["aggregations"]["results"]["buckets"]:
-            results.append(result["key"])
-        yield results
+    filter_query = QueryWithFilters.generate_transactions_elasticsearch_query(
+        {"keyword_search": [es_minimal_sanitize(keyword)]}
+    )
+    search = TransactionSearch().filter(filter_query)
+    yield from partitioned_terms_scan(search, field, get_num_partitions(total, size, DOWNLOAD_QUERY_SIZE), size)
 
 
 def get_sum_and_count_aggregation_results(keyword):
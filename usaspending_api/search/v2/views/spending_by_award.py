@@ -75,6 +75,22 @@ GLOBAL_MAP = {
 }
 
 
+def parse_search_after_value(value):
+    """
+    Cursor sort values travel as text, but Elasticsearch returns numbers for numeric and date sorts (dates as epoch
+    milliseconds, which fields mapped as "yyyy-MM-dd" can not parse back from text). Restore a number whenever the
+    text is exactly how that number is written, and leave everything else (e.g. keyword sorts) as text.
+    """
+    for number_type in (int, float):
+        try:
+            number = number_type(value)
+        except ValueError:
+            continue
+        if str(number) == value:
+            return number
+    return value
+
+
 @api_transformations(api_version=settings.API_VERSION, function_list=API_TRANSFORM_FUNCTIONS)
 class SpendingByAwardVisualizationViewSet(APIView):
     """
@@ -290,35 +306,33 @@ class SpendingByAwardVisualizationViewSet(APIView):
             sorts = [{field: self.pagination["sort_order"]} for field in sort_field]
         record_num = (self.pagination["page"] - 1) * self.pagination["limit"]
         # random page jumping was removed due to performance concerns
-        if (self.last_record_sort_value is None and self.last_record_unique_id is not None) or (
-            self.last_record_sort_value is not None and self.last_record_unique_id is None
-        ):
-            # malformed request
-            raise Exception(
+        if (self.last_record_sort_value is None) != (self.last_record_unique_id is None):
+            raise UnprocessableEntityException(
                 "Using search_after functionality in Elasticsearch requires both"
                 " last_record_sort_value and last_record_unique_id."
             )
-        if record_num >= settings.ES_AWARDS_MAX_RESULT_WINDOW and (
-            self.last_record_unique_id is None and self.last_record_sort_value is None
-        ):
+        if record_num >= settings.ES_AWARDS_MAX_RESULT_WINDOW and self.last_record_unique_id is None:
             raise UnprocessableEntityException(
                 f"Page #{self.pagination['page']} with limit {self.pagination['limit']} is over the maximum result"
                 f" limit {settings.ES_AWARDS_MAX_RESULT_WINDOW}. Please provide the 'last_record_sort_value' and"
                 " 'last_record_unique_id' to paginate sequentially."
             )
-        # Search_after values are provided in the API request - use search after
-        if self.last_record_sort_value is not None and self.last_record_unique_id is not None:
-            search = (
-                AwardSearch()
-                .filter(filter_query)
-                .sort(*sorts)
-                .extra(search_after=[self.last_record_sort_value, self.last_record_unique_id])[
-                    : self.pagination["limit"] + 1
-                ]  # add extra result to check for next page
-            )
-        # no values, within result window, use regular elasticsearch
+
+        # One extra result tells whether there is a next page, so the total number of hits is never counted
+        search = AwardSearch().filter(filter_query).sort(*sorts).extra(track_total_hits=False)
+        self.next_page_from_total_hits = False
+        if self.last_record_unique_id is not None:
+            # Search_after values are provided in the API request, so this page costs the same as the first one
+            search_after = [parse_search_after_value(self.last_record_sort_value), self.last_record_unique_id]
+            search = search.extra(search_after=search_after)[: self.pagination["limit"] + 1]
         else:
-            search = AwardSearch().filter(filter_query).sort(*sorts)[record_num : record_num + self.pagination["limit"]]
+            # Hits past the index's max_result_window can not be requested, so on the last page within it the hits
+            # are counted (only as far as one past the page) to tell whether there is a next page instead
+            size = min(self.pagination["limit"] + 1, settings.ES_AWARDS_MAX_RESULT_WINDOW - record_num)
+            if size <= self.pagination["limit"]:
+                self.next_page_from_total_hits = True
+                search = search.extra(track_total_hits=record_num + size + 1)
+            search = search[record_num : record_num + size]
 
         response = search.handle_execute()
 
@@ -337,7 +351,8 @@ class SpendingByAwardVisualizationViewSet(APIView):
 
     def construct_es_response_for_prime_awards(self, response) -> dict:
         results = []
-        for res in response:
+        page_hits = response[: self.pagination["limit"]]
+        for res in page_hits:
             hit = res.to_dict()
             row = {k: hit[v] for k, v in self.constants["internal_id_fields"].items()}
 
@@ -398,28 +413,22 @@ class SpendingByAwardVisualizationViewSet(APIView):
 
         last_record_unique_id = None
         last_record_sort_value = None
-        offset = 1
-        if self.last_record_unique_id is not None:
-            has_next = len(results) > self.pagination["limit"]
-            offset = 2
+        if self.next_page_from_total_hits:
+            record_num = (self.pagination["page"] - 1) * self.pagination["limit"]
+            has_next = response.hits.total.value > record_num + len(page_hits)
         else:
-            has_next = (
-                response.hits.total.value - (self.pagination["page"] - 1) * self.pagination["limit"]
-                > self.pagination["limit"]
-            )
-
-        if len(response) > 0 and has_next:
-            last_record_unique_id = response[len(response) - offset].meta.sort[1]
-            last_record_sort_value = response[len(response) - offset].meta.sort[0]
+            has_next = len(response) > self.pagination["limit"]
+        if has_next:
+            last_record_sort_value, last_record_unique_id = page_hits[-1].meta.sort
 
         return {
             "limit": self.pagination["limit"],
-            "results": results[: self.pagination["limit"]],
+            "results": results,
             "page_metadata": {
                 "page": self.pagination["page"],
                 "hasNext": has_next,
                 "last_record_unique_id": last_record_unique_id,
-                "last_record_sort_value": str(last_record_sort_value),
+                "last_record_sort_value": None if last_record_sort_value is None else str(last_record_sort_value),
             },
             "messages": [
                 get_generic_filters_message(
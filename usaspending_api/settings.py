@@ -5,6 +5,7 @@ For the full list of settings and their values: https://docs.djangoproject.com/e
 
 import dj_database_url
 import os
+import re
 import ddtrace
 
 from django.db import DEFAULT_DB_ALIAS
@@ -24,6 +25,11 @@ DOWNLOAD_TIMEOUT_MIN_LIMIT = 10
 # Default timeout for SQL statements in Django
 DEFAULT_DB_TIMEOUT_IN_SECONDS = int(os.environ.get("DEFAULT_DB_TIMEOUT_IN_SECONDS", 0))
 DOWNLOAD_DB_TIMEOUT_IN_HOURS = 4
+# Export all sources of a download at the same time, zipping each partition as soon as psql has produced it
+DOWNLOAD_PIPELINED_EXPORT = os.environ.get("DOWNLOAD_PIPELINED_EXPORT", "").lower() in ["true", "1", "yes"]
+# zlib level (-1 is zlib's default) and number of processes used to compress the files added to download zips
+DOWNLOAD_ZIP_COMPRESSION_LEVEL = int(os.environ.get("DOWNLOAD_ZIP_COMPRESSION_LEVEL", -1))
+DOWNLOAD_ZIP_WORKERS = int(os.environ.get("DOWNLOAD_ZIP_WORKERS", 1))
 CONNECTION_MAX_SECONDS = 10
 
 API_MAX_DATE = "2024-09-30"  # End of FY2024
@@ -63,6 +69,11 @@ BULK_DOWNLOAD_LOCAL_PATH = str(REPO_DIR / "bulk_downloads") + "/"
 
 BULK_DOWNLOAD_S3_BUCKET_NAME = ""
 BULK_DOWNLOAD_S3_REDIRECT_DIR = "generated_downloads"
+# Upload download zips to S3 while they are being generated instead of once they are complete
+BULK_DOWNLOAD_S3_STREAMING_UPLOAD = os.environ.get("DOWNLOAD_STREAMING_UPLOAD", "").lower() in ["true", "1", "yes"]
+BULK_DOWNLOAD_S3_STREAMING_PART_SIZE = 64 * 1024 * 1024
+# Optional S3-compatible endpoint (e.g. MinIO) for the streaming upload; defaults to AWS
+BULK_DOWNLOAD_S3_ENDPOINT_URL = os.environ.get("BULK_DOWNLOAD_S3_ENDPOINT_URL") or None
 BULK_DOWNLOAD_SQS_QUEUE_NAME = ""
 MONTHLY_DOWNLOAD_S3_BUCKET_NAME = ""
 MONTHLY_DOWNLOAD_S3_REDIRECT_DIR = "award_data_archive"
@@ -135,6 +146,12 @@ ES_TRANSACTIONS_NAME_SUFFIX = "transactions"
 ES_TRANSACTIONS_QUERY_ALIAS_PREFIX = "transaction-query"
 ES_TRANSACTIONS_WRITE_ALIAS = "transaction-load-alias"
 ES_TIMEOUT = 90
+# Number of terms aggregation partitions requested at the same time when collecting the IDs matched by a download
+ES_DOWNLOAD_PARTITION_CONCURRENCY = int(os.environ.get("ES_DOWNLOAD_PARTITION_CONCURRENCY", 4))
+# How a download collects its matching IDs: "terms" (partitioned terms aggregations) or "sliced_scroll" (sliced
+# scrolls, which skip the aggregation since download IDs are unique per document; slices should not exceed shards)
+ES_DOWNLOAD_ID_SCAN = os.environ.get("ES_DOWNLOAD_ID_SCAN", "terms")
+ES_DOWNLOAD_SCROLL_SLICES = int(os.environ.get("ES_DOWNLOAD_SCROLL_SLICES", 5))
 ES_REPOSITORY = ""
 ES_ROUTING_FIELD = "recipient_agg_key"
 
@@ -275,14 +292,15 @@ def _configure_database_connection(environment_variable):
 # (which is "DATABASE_URL" by default). Generally speaking, DB_SOURCE is used to support server
 # environments that support the API/website and docker-compose local setup whereas DATABASE_URL
 # is used for development and operational environments (Jenkins primarily). If DB_SOURCE is provided,
-# then DB_R1 (read replica) must also be provided.
+# then DB_R1 (read replica) must also be provided, along with any number of further replicas as DB_R2, DB_R3, etc.
 if os.environ.get("DB_SOURCE"):
     if not os.environ.get("DB_R1"):
         raise EnvironmentError("DB_SOURCE environment variable defined without DB_R1")
-    DATABASES = {
-        DEFAULT_DB_ALIAS: _configure_database_connection("DB_SOURCE"),
-        "db_r1": _configure_database_connection("DB_R1"),
-    }
+    DATABASES = {DEFAULT_DB_ALIAS: _configure_database_connection("DB_SOURCE")}
+    for replica_environment_variable in sorted(
+        (variable for variable in os.environ if re.fullmatch(r"DB_R\d+", variable)), key=lambda v: int(v[4:])
+    ):
+        DATABASES[replica_environment_variable.lower()] = _configure_database_connection(replica_environment_variable)
     DATABASE_ROUTERS = ["usaspending_api.routers.replicas.ReadReplicaRouter"]
 elif os.environ.get(dj_database_url.DEFAULT_ENV):
     DATABASES = {DEFAULT_DB_ALIAS: _configure_database_connection(dj_database_url.DEFAULT_ENV)}
@@ -292,6 +310,12 @@ else:
         "Either {} or DB_SOURCE/DB_R1 environment variable must be defined".format(dj_database_url.DEFAULT_ENV)
     )
 
+# How often ReadReplicaRouter probes the read replicas, how long a probe may take to connect and run, and how far
+# behind a replica may fall before it stops receiving reads
+REPLICA_HEALTH_CHECK_SECONDS = int(os.environ.get("REPLICA_HEALTH_CHECK_SECONDS", 15))
+REPLICA_HEALTH_TIMEOUT_SECONDS = int(os.environ.get("REPLICA_HEALTH_TIMEOUT_SECONDS", 2))
+REPLICA_MAX_LAG_SECONDS = int(os.environ.get("REPLICA_MAX_LAG_SECONDS", 300))
+
 DOWNLOAD_DATABASE_URL = os.environ.get("DOWNLOAD_DATABASE_URL")
 
 # import a second database connection for ETL, connecting to the data broker
@@ -301,6 +325,9 @@ if os.environ.get("DATA_BROKER_DATABASE_URL"):
 
 DATA_BROKER_DBLINK_NAME = "broker_server"
 
+# How many bytes of CSV load_submission --copy-backend buffers per table before each COPY
+SUBMISSION_COPY_FLUSH_BYTES = int(os.environ.get("SUBMISSION_COPY_FLUSH_BYTES", 16 * 1024 * 1024))
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -430,6 +457,18 @@ CACHE_ENVIRONMENTS = {
 # Set the usaspending-cache to whatever our environment cache dictates
 CACHES["usaspending-cache"] = CACHE_ENVIRONMENTS[CACHE_ENVIRONMENT]
 
+# Per-process LRU in front of the usaspending-cache for views that opt in with cache_response(local=True). Entries
+# live for at most LOCAL_RESPONSE_CACHE_TIMEOUT seconds and only compressed payloads up to the byte limit are kept.
+LOCAL_RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("LOCAL_RESPONSE_CACHE_MAX_ENTRIES", 256))
+LOCAL_RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get("LOCAL_RESPONSE_CACHE_MAX_ENTRY_BYTES", 256 * 1024))
+LOCAL_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("LOCAL_RESPONSE_CACHE_TIMEOUT", 60))
+# How long identical requests wait for the one computing a response that missed the cache, and how long its lock in
+# the usaspending-cache is held at most
+SINGLE_FLIGHT_WAIT_SECONDS = int(os.environ.get("SINGLE_FLIGHT_WAIT_SECONDS", 15))
+SINGLE_FLIGHT_LOCK_TIMEOUT = int(os.environ.get("SINGLE_FLIGHT_LOCK_TIMEOUT", 60))
+# How often cache key construction re-reads the data version tokens that loaders bump (see common/cache.py)
+DATA_VERSION_CHECK_SECONDS = int(os.environ.get("DATA_VERSION_CHECK_SECONDS", 5))
+
 # DRF extensions
 REST_FRAMEWORK_EXTENSIONS = {
     # Not caching errors, these are logged to exceptions.log
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.submissions.models import DABSSubmissionWindowSchedule
 
 logger = logging.getLogger("script")
@@ -23,6 +24,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
 
         logger.info("Reveals existing DABS Submission Window Schedules")
+        transaction.on_commit(lambda: bump_data_version("accounts"))
         existing_schedules = DABSSubmissionWindowSchedule.objects.all()
 
         now = datetime.now(tz=timezone.utc)
@@ -6,6 +6,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from usaspending_api.submissions.models import SubmissionAttributes
+from usaspending_api.common.cache import bump_data_version
 from usaspending_api.awards.models import FinancialAccountsByAwards, Award
 
 logger = logging.getLogger("script")
@@ -22,6 +23,7 @@ class Command(BaseCommand):
     @transaction.atomic
     def handle(self, *args, **options):
         logger.info("Starting rm_submissions management command")
+        transaction.on_commit(lambda: bump_data_version("accounts", "awards"))
 
         def signal_handler(signal, frame):
             transaction.set_rollback(True)